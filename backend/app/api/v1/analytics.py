@@ -22,6 +22,7 @@ from app.core.constants import (
 )
 from app.core.security import get_current_admin
 from app.db.connection import get_read_db
+from app.services.cache_service import cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
@@ -35,6 +36,11 @@ MONGO_TO_STRING = "$toString"
 MONGO_COND = "$cond"
 TIME_RANGE_DESC = "Time range"
 
+# The overview runs ~10 counts/aggregations; admins see it at most this stale
+# (plus CACHE_STALE_TTL while it is refreshed in the background).
+OVERVIEW_CACHE_TTL = 60
+OVERVIEW_TIME_RANGES = ("7days", "30days", "90days", "1year")
+
 
 def get_date_range(time_range: str) -> Tuple[datetime, datetime]:
     """Calculate start and end dates based on time range"""
@@ -62,6 +68,98 @@ def calculate_growth(current: float, previous: float) -> float:
     return round(((current - previous) / previous) * 100, 1)
 
 
+async def _compute_overview(db: AsyncIOMotorDatabase, time_range: str) -> Dict[str, Any]:
+    """Run the overview counts and aggregations (cached by the endpoint)."""
+    start_date, end_date = get_date_range(time_range)
+
+    # Calculate previous period for comparison
+    period_duration = end_date - start_date
+    prev_start = start_date - period_duration
+    prev_end = start_date
+
+    # Current period metrics
+    total_users = await db.users.count_documents({})
+    total_acharyas = await db.users.count_documents(
+        {"role": "acharya", "status": "active"}
+    )
+    total_bookings = await db.bookings.count_documents({})
+
+    new_users_current = await db.users.count_documents(
+        {"created_at": {"$gte": start_date, "$lte": end_date}}
+    )
+    new_bookings_current = await db.bookings.count_documents(
+        {"created_at": {"$gte": start_date, "$lte": end_date}}
+    )
+
+    # Revenue for current period
+    revenue_pipeline = [
+        {
+            MONGO_MATCH: {
+                "status": "completed",
+                "completed_at": {"$gte": start_date, "$lte": end_date},
+            }
+        },
+        {MONGO_GROUP: {"_id": None, "total": {MONGO_SUM: FIELD_TOTAL_AMOUNT}}},
+    ]
+    revenue_result = await db.bookings.aggregate(revenue_pipeline).to_list(1)
+    revenue_current = revenue_result[0]["total"] if revenue_result else 0
+
+    # Previous period metrics for growth calculation
+    new_users_prev = await db.users.count_documents(
+        {"created_at": {"$gte": prev_start, "$lte": prev_end}}
+    )
+    new_bookings_prev = await db.bookings.count_documents(
+        {"created_at": {"$gte": prev_start, "$lte": prev_end}}
+    )
+
+    revenue_prev_pipeline = [
+        {
+            MONGO_MATCH: {
+                "status": "completed",
+                "completed_at": {"$gte": prev_start, "$lte": prev_end},
+            }
+        },
+        {MONGO_GROUP: {"_id": None, "total": {MONGO_SUM: FIELD_TOTAL_AMOUNT}}},
+    ]
+    revenue_prev_result = await db.bookings.aggregate(
+        revenue_prev_pipeline
+    ).to_list(1)
+    revenue_prev = revenue_prev_result[0]["total"] if revenue_prev_result else 0
+
+    # Active users (users with activity in current period)
+    active_users = await db.users.count_documents(
+        {"last_login": {"$gte": start_date}}
+    )
+
+    # Pending verifications
+    pending_verifications = await db.users.count_documents(
+        {"role": "acharya", "status": "pending"}
+    )
+
+    # Average rating
+    rating_pipeline = [
+        {MONGO_MATCH: {"ratings.average": {"$gt": 0}}},
+        {MONGO_GROUP: {"_id": None, "avg": {"$avg": "$ratings.average"}}},
+    ]
+    rating_result = await db.acharya_profiles.aggregate(rating_pipeline).to_list(1)
+    avg_rating = rating_result[0]["avg"] if rating_result else 4.5
+
+    return {
+        "totalUsers": total_users,
+        "totalAcharyas": total_acharyas,
+        "totalBookings": total_bookings,
+        "totalRevenue": revenue_current,
+        "activeUsers": active_users,
+        "pendingVerifications": pending_verifications,
+        "averageRating": round(avg_rating, 1),
+        "revenueGrowth": calculate_growth(revenue_current, revenue_prev),
+        "userGrowth": calculate_growth(new_users_current, new_users_prev),
+        "bookingGrowth": calculate_growth(
+            new_bookings_current, new_bookings_prev
+        ),
+    }
+
+
 @router.get(
     "/overview",
     response_model=StandardResponse,
@@ -76,97 +174,14 @@ async def get_analytics_overview(
 ):
     """Get comprehensive analytics overview"""
     try:
-        start_date, end_date = get_date_range(time_range)
-
-        # Calculate previous period for comparison
-        period_duration = end_date - start_date
-        prev_start = start_date - period_duration
-        prev_end = start_date
-
-        # Current period metrics
-        total_users = await db.users.count_documents({})
-        total_acharyas = await db.users.count_documents(
-            {"role": "acharya", "status": "active"}
-        )
-        total_bookings = await db.bookings.count_documents({})
-
-        new_users_current = await db.users.count_documents(
-            {"created_at": {"$gte": start_date, "$lte": end_date}}
-        )
-        new_bookings_current = await db.bookings.count_documents(
-            {"created_at": {"$gte": start_date, "$lte": end_date}}
-        )
-
-        # Revenue for current period
-        revenue_pipeline = [
-            {
-                MONGO_MATCH: {
-                    "status": "completed",
-                    "completed_at": {"$gte": start_date, "$lte": end_date},
-                }
-            },
-            {MONGO_GROUP: {"_id": None, "total": {MONGO_SUM: FIELD_TOTAL_AMOUNT}}},
-        ]
-        revenue_result = await db.bookings.aggregate(revenue_pipeline).to_list(1)
-        revenue_current = revenue_result[0]["total"] if revenue_result else 0
-
-        # Previous period metrics for growth calculation
-        new_users_prev = await db.users.count_documents(
-            {"created_at": {"$gte": prev_start, "$lte": prev_end}}
-        )
-        new_bookings_prev = await db.bookings.count_documents(
-            {"created_at": {"$gte": prev_start, "$lte": prev_end}}
-        )
-
-        revenue_prev_pipeline = [
-            {
-                MONGO_MATCH: {
-                    "status": "completed",
-                    "completed_at": {"$gte": prev_start, "$lte": prev_end},
-                }
-            },
-            {MONGO_GROUP: {"_id": None, "total": {MONGO_SUM: FIELD_TOTAL_AMOUNT}}},
-        ]
-        revenue_prev_result = await db.bookings.aggregate(
-            revenue_prev_pipeline
-        ).to_list(1)
-        revenue_prev = revenue_prev_result[0]["total"] if revenue_prev_result else 0
-
-        # Active users (users with activity in current period)
-        active_users = await db.users.count_documents(
-            {"last_login": {"$gte": start_date}}
-        )
-
-        # Pending verifications
-        pending_verifications = await db.users.count_documents(
-            {"role": "acharya", "status": "pending"}
-        )
-
-        # Average rating
-        rating_pipeline = [
-            {MONGO_MATCH: {"ratings.average": {"$gt": 0}}},
-            {MONGO_GROUP: {"_id": None, "avg": {"$avg": "$ratings.average"}}},
-        ]
-        rating_result = await db.acharya_profiles.aggregate(rating_pipeline).to_list(1)
-        avg_rating = rating_result[0]["avg"] if rating_result else 4.5
-
-        return StandardResponse(
-            success=True,
-            data={
-                "totalUsers": total_users,
-                "totalAcharyas": total_acharyas,
-                "totalBookings": total_bookings,
-                "totalRevenue": revenue_current,
-                "activeUsers": active_users,
-                "pendingVerifications": pending_verifications,
-                "averageRating": round(avg_rating, 1),
-                "revenueGrowth": calculate_growth(revenue_current, revenue_prev),
-                "userGrowth": calculate_growth(new_users_current, new_users_prev),
-                "bookingGrowth": calculate_growth(
-                    new_bookings_current, new_bookings_prev
-                ),
-            },
+        if time_range not in OVERVIEW_TIME_RANGES:
+            time_range = "30days"  # get_date_range's default; keeps cache keys bounded
+        data = await cache.get_or_compute(
+            f"analytics:overview:{time_range}",
+            lambda: _compute_overview(db, time_range),
+            expire=OVERVIEW_CACHE_TTL,
         )
+        return StandardResponse(success=True, data=data)
 
     except Exception as e:
         logger.error(f"Analytics overview error: {e}", exc_info=True)
@@ -1273,6 +1273,17 @@ async def get_conversations(
         end_idx = start_idx + limit
         paginated_conversations = result_conversations[start_idx:end_idx]
 
+        # Cluster-wide presence for the whole page in one Redis round-trip
+        other_ids = [
+            c["other_user"]["id"] for c in paginated_conversations
+            if c.get("other_user") and c["other_user"].get("id")
+        ]
+        if other_ids:
+            online = await manager.are_users_online(other_ids)
+            for c in paginated_conversations:
+                if c.get("other_user") and c["other_user"].get("id"):
+                    c["other_user"]["is_online"] = online.get(c["other_user"]["id"], False)
+
         return StandardResponse(
             success=True,
             data={
@@ -2,9 +2,9 @@
 Panchanga API Endpoints
 Hindu calendar information - Tithi, Nakshatra, Muhurat, Festivals
 """
-import calendar as cal_module
+import asyncio
 from fastapi import APIRouter, Depends, Query, status
-from typing import Annotated, Dict, Any, List
+from typing import Annotated, Dict, Any
 import logging
 from datetime import date, datetime, timedelta
 from pydantic import BaseModel, Field
@@ -12,7 +12,8 @@ from pydantic import BaseModel, Field
 from app.schemas.requests import StandardResponse
 from app.core.security import get_current_user, get_current_admin
 from app.core.exceptions import InvalidInputError, ResourceNotFoundError
-from app.services.panchanga_service import panchanga_service
+from app.services.panchanga_cache import panchanga_cache
+from app.services.panchanga_executor import panchanga_executor
 from app.services.async_job_service import async_job_service
 from app.db.connection import get_db
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -163,7 +164,7 @@ async def get_today_panchanga(
             current_user, latitude, longitude, panchanga_type
         )
         today = date.today()
-        panchanga = panchanga_service.get_daily_panchanga(
+        panchanga = await panchanga_cache.get_daily_panchanga(
             today, eff_lat, eff_lon, eff_type
         )
 
@@ -199,7 +200,7 @@ async def get_panchanga_for_date(
             current_user, latitude, longitude, panchanga_type
         )
         target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        panchanga = panchanga_service.get_daily_panchanga(
+        panchanga = await panchanga_cache.get_daily_panchanga(
             target_date, eff_lat, eff_lon, eff_type
         )
 
@@ -236,8 +237,8 @@ async def get_muhurat_timings(
     try:
         eff_lat, eff_lon, _ = _effective_params(current_user, latitude, longitude)
         target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        muhurats = panchanga_service.get_auspicious_muhurat(target_date, eff_lat, eff_lon)
-        rahu_kalam = panchanga_service.calculate_rahu_kalam(target_date, eff_lat, eff_lon)
+        muhurats = await panchanga_executor.get_auspicious_muhurat(target_date, eff_lat, eff_lon)
+        rahu_kalam = await panchanga_executor.calculate_rahu_kalam(target_date, eff_lat, eff_lon)
 
         return {
             "success": True,
@@ -266,7 +267,7 @@ async def get_upcoming_festivals(
 ):
     """Get upcoming festivals"""
     try:
-        festivals = panchanga_service.get_upcoming_festivals(count)
+        festivals = await panchanga_executor.get_upcoming_festivals(count)
 
         return {
             "success": True,
@@ -290,7 +291,7 @@ async def get_ekadashi_dates(
 ):
     """Get Ekadashi dates for a year"""
     try:
-        ekadashis = panchanga_service.get_ekadashi_dates(year)
+        ekadashis = await panchanga_executor.get_ekadashi_dates(year)
 
         return {
             "success": True,
@@ -322,7 +323,7 @@ async def check_auspicious_date(
     try:
         eff_lat, eff_lon, _ = _effective_params(current_user, latitude, longitude)
         target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        result = panchanga_service.is_auspicious_for(target_date, activity, eff_lat, eff_lon)
+        result = await panchanga_executor.is_auspicious_for(target_date, activity, eff_lat, eff_lon)
 
         return {
             "success": True,
@@ -357,7 +358,7 @@ async def get_tithi(
     try:
         eff_lat, eff_lon, _ = _effective_params(current_user, latitude, longitude)
         target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        tithi = panchanga_service.calculate_tithi(target_date, eff_lat, eff_lon)
+        tithi = await panchanga_executor.calculate_tithi(target_date, eff_lat, eff_lon)
 
         return {
             "success": True,
@@ -382,7 +383,7 @@ async def get_nakshatra(
     """Get Nakshatra for a date"""
     try:
         target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        nakshatra = panchanga_service.calculate_nakshatra(target_date)
+        nakshatra = await panchanga_executor.calculate_nakshatra(target_date)
 
         return {
             "success": True,
@@ -421,40 +422,9 @@ async def get_monthly_panchanga(
         eff_lat, eff_lon, eff_type = _effective_params(
             current_user, latitude, longitude, panchanga_type
         )
-        days_in_month = cal_module.monthrange(year, month)[1]
-        results: List[Dict[str, Any]] = []
-        for day in range(1, days_in_month + 1):
-            d = date(year, month, day)
-            pan = panchanga_service.get_daily_panchanga(d, eff_lat, eff_lon, eff_type)
-            # Return a lightweight summary (full data would be too large for 31 days)
-            results.append({
-                "date": d.isoformat(),
-                "day_of_week": pan["day_of_week"],
-                "day_of_week_sa": pan.get("day_of_week_sa", ""),
-                "tithi": {
-                    "number": pan["tithi"]["number"],
-                    "name": pan["tithi"]["name"],
-                    "name_sa": pan["tithi"]["name_sa"],
-                    "paksha": pan["tithi"]["paksha"],
-                    "end_time": pan.get("tithi_end_time"),
-                },
-                "nakshatra": {
-                    "number": pan["nakshatra"]["number"],
-                    "name": pan["nakshatra"]["name"],
-                    "name_sa": pan["nakshatra"]["name_sa"],
-                    "end_time": pan.get("nakshatra_end_time"),
-                },
-                "yoga": {"name": pan["yoga"]["name"], "name_sa": pan["yoga"]["name_sa"]},
-                "sunrise": pan["sunrise"],
-                "sunset": pan["sunset"],
-                "month_name": pan.get("month_name", ""),
-                "panchanga_type": pan.get("panchanga_type", eff_type),
-                "festivals": pan.get("festivals", []),
-                "is_ekadashi": pan["tithi"].get("is_ekadashi", False),
-                "is_full_moon": pan["tithi"].get("is_full_moon", False),
-                "is_new_moon": pan["tithi"].get("is_new_moon", False),
-                "rahu_kalam": pan.get("rahu_kalam", {}),
-            })
+        results = await panchanga_executor.get_month_calendar(
+            year, month, eff_lat, eff_lon, eff_type
+        )
 
         return {
             "success": True,
@@ -489,9 +459,11 @@ async def get_yearly_summary(
             return {"success": False, "message": "Invalid year", "data": None}
         # Compute era info for mid-year reference
         mid_year = date(year, 7, 1)
-        pan_mid = panchanga_service.get_daily_panchanga(mid_year)
-        ekadashis = panchanga_service.get_ekadashi_dates(year)
-        upcoming = panchanga_service.get_upcoming_festivals(50)
+        pan_mid, ekadashis, upcoming = await asyncio.gather(
+            panchanga_cache.get_daily_panchanga(mid_year, _DEFAULT_LAT, _DEFAULT_LON),
+            panchanga_executor.get_ekadashi_dates(year),
+            panchanga_executor.get_upcoming_festivals(50),
+        )
         year_festivals = [f for f in upcoming if f["date"].startswith(str(year))]
         return {
             "success": True,
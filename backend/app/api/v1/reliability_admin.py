@@ -4,12 +4,14 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field
+from redis.asyncio import Redis
 
 from app.core.security import get_current_admin
 from app.db.connection import get_db
+from app.db.redis import get_redis
 from app.schemas.requests import StandardResponse
 from app.services.command_bus_service import CommandBusService
 from app.services.kill_switch_service import KillSwitchService
@@ -43,10 +45,16 @@ async def get_kill_switches(
 @router.put("/kill-switches", response_model=StandardResponse)
 async def update_kill_switches(
     body: KillSwitchUpdateRequest,
+    request: Request,
     current_user: Annotated[Dict[str, Any], Depends(get_current_admin)],
     db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    redis: Annotated[Optional[Redis], Depends(get_redis)] = None,
 ):
-    service = KillSwitchService(db)
+    # Update through the pod's own service so its snapshot changes at once and
+    # the notification goes out on the startup Redis client.
+    service = getattr(request.app.state, "kill_switch_service", None)
+    if service is None:
+        service = KillSwitchService(db, redis)
     updates = {k: v for k, v in body.model_dump().items() if v is not None}
     updated = await service.set_controls(updates, actor_id=current_user["id"])
     return StandardResponse(success=True, data=updated, message="Kill switches updated")
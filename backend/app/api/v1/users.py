@@ -5,7 +5,7 @@ SonarQube: S5122 - Input validation with Pydantic
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Annotated, Dict, Any, Optional
+from typing import Annotated, Dict, Any, Iterable, Optional
 import logging
 from datetime import datetime, timezone
 from bson import ObjectId
@@ -118,10 +118,25 @@ NO_FIELDS_TO_UPDATE = "No fields to update"
 RATINGS_AVERAGE = "ratings.average"
 MATCH_OP = "$match"
 
+# Cache generation folded into every Acharya search page key; bumping it
+# retires all pages at once.  Each page is also tagged with the
+# acharya:{user_id} of every Acharya it lists.
+ACHARYA_SEARCH_GENERATION = "search:acharyas"
+# Profile fields that can change which Acharyas a search matches.
+ACHARYA_SEARCH_FIELDS = frozenset({"name", "location", "specializations", "languages"})
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
+async def _invalidate_acharya_search_cache(user_id: str, updated_fields: Iterable[str]) -> None:
+    """Drop cached search pages listing this Acharya; all pages if the edit
+    can change what a search matches."""
+    await cache.invalidate_tags(cache.acharya_cache_key(user_id))
+    if ACHARYA_SEARCH_FIELDS.intersection(updated_fields):
+        await cache.bump_generation(ACHARYA_SEARCH_GENERATION)
+
+
 @router.post(
     "/grihasta/onboarding",
     response_model=StandardResponse,
@@ -558,6 +573,7 @@ async def update_profile(
         if not update_fields:
             raise InvalidInputError(message=NO_FIELDS_TO_UPDATE, field="body")
 
+        requested_fields = set(update_fields)
         now = datetime.now(timezone.utc)
         update_fields = await _apply_user_level_profile_updates(
             db,
@@ -567,6 +583,8 @@ async def update_profile(
         )
 
         if not update_fields:
+            if role == UserRole.ACHARYA.value:
+                await _invalidate_acharya_search_cache(user_id, requested_fields)
             return StandardResponse(success=True, message="Profile updated successfully")
 
         # Resolve timezone when caller approves the location
@@ -593,6 +611,8 @@ async def update_profile(
             )
 
         logger.info(f"Profile updated for user {user_id}")
+        if role == UserRole.ACHARYA.value:
+            await _invalidate_acharya_search_cache(user_id, requested_fields)
 
         return StandardResponse(success=True, message="Profile updated successfully")
 
@@ -885,6 +905,7 @@ async def update_acharya_profile(
         if not update_fields:
             raise InvalidInputError(message=NO_FIELDS_TO_UPDATE, field="body")
 
+        requested_fields = set(update_fields)
         now = datetime.now(timezone.utc)
         update_fields = await _apply_user_level_profile_updates(
             db,
@@ -894,6 +915,7 @@ async def update_acharya_profile(
         )
 
         if not update_fields:
+            await _invalidate_acharya_search_cache(user_id, requested_fields)
             return StandardResponse(
                 success=True, message="Acharya profile updated successfully"
             )
@@ -915,6 +937,7 @@ async def update_acharya_profile(
             )
 
         logger.info(f"Acharya profile updated for user {user_id}")
+        await _invalidate_acharya_search_cache(user_id, requested_fields)
 
         return StandardResponse(
             success=True, message="Acharya profile updated successfully"
@@ -1133,7 +1156,8 @@ async def search_acharyas(
     """
     try:
         # Try Cache First
-        cache_key = params.get_cache_key()
+        generation = await cache.generation(ACHARYA_SEARCH_GENERATION)
+        cache_key = f"{params.get_cache_key()}:g{generation}"
         cached_result = await cache.get(cache_key)
         if cached_result:
             return cached_result
@@ -1168,7 +1192,13 @@ async def search_acharyas(
             response = await _search_with_mongodb(db, params)
 
         # Cache Result
-        await cache.set(cache_key, response.model_dump(), expire=300)
+        result = response.model_dump()
+        tags = [
+            cache.acharya_cache_key(acharya["user_id"])
+            for acharya in (result.get("data") or {}).get("acharyas", [])
+            if isinstance(acharya, dict) and acharya.get("user_id")
+        ]
+        await cache.set(cache_key, result, expire=300, tags=tags)
         return response
 
     except Exception as e:
@@ -92,6 +92,11 @@ class BaseAppSettings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60   # 1 hour (production-safe default)
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Verified access-token claims cached per pod (entries end at token exp).
+    AUTH_TOKEN_CACHE_SIZE: int = 10_000
+    # How long (s) a pod trusts a "not blacklisted" answer; revocations are
+    # also pushed over pub/sub, so this only bounds a missed notification.
+    AUTH_REVOCATION_CACHE_TTL: float = 5.0
 
     # ── CORS ──────────────────────────────────────────────────────────────
     ALLOWED_ORIGINS: Union[List[str], str] = [
@@ -159,6 +164,82 @@ class BaseAppSettings(BaseSettings):
     # ── Cache – Redis ─────────────────────────────────────────────────────
     REDIS_URL: Optional[str] = None
     CACHE_TTL: int = 300
+    # In-process L1 in front of Redis (get_or_compute(use_l1_cache=True)):
+    # LRU bounded by entries and serialized bytes, split across shards; a
+    # background sweep drops expired entries, and writes/deletes are broadcast
+    # on Redis pub/sub so every instance evicts its copy.
+    CACHE_L1_MAX_ENTRIES: int = 10000
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_L1_SHARDS: int = 16
+    CACHE_L1_SWEEP_INTERVAL: float = 30.0
+    # Tags: most keys tracked per tag set (the soonest-expiring are deleted
+    # beyond this), and how long L1 may serve a generation counter.
+    CACHE_TAG_MAX_MEMBERS: int = 1000
+    CACHE_GENERATION_L1_TTL: int = 5
+    # get_or_compute: seconds a value may be served stale while one background
+    # refresh runs, XFetch early-refresh aggressiveness (0 disables), and the
+    # Redis lock TTL that elects the instance doing the computation.
+    CACHE_STALE_TTL: int = 60
+    CACHE_XFETCH_BETA: float = 1.0
+    CACHE_LOCK_TTL: int = 10
+    # Value encoding (app.utils.cache_codec): "msgpack" keeps datetime/ObjectId
+    # types, "json" stringifies them; bodies this large or larger are compressed.
+    CACHE_CODEC: str = "msgpack"
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+
+    # ── Panchanga ─────────────────────────────────────────────────────────
+    # Max (date, location) ephemeris snapshots kept in-process per worker.
+    PANCHANGA_EPHEMERIS_CACHE_SIZE: int = 2048
+    # Directory for persisted yearly Tithi/Nakshatra/Yoga/Karana transition
+    # tables (.npz).  Unset → tables are rebuilt per process on first use.
+    PANCHANGA_TRANSITION_CACHE_DIR: Optional[str] = None
+    # Whole-year tables are built for the current year ± this many years and
+    # at most MAX_YEARS are kept in memory; other years are solved per lookup.
+    PANCHANGA_TRANSITION_YEARS_AROUND: int = 1
+    PANCHANGA_TRANSITION_MAX_YEARS: int = 4
+    # Process-pool size for Panchanga API calculations (0 → default thread pool).
+    PANCHANGA_EXECUTOR_WORKERS: int = 2
+    # Yearly precompute worker: jobs run concurrently and days per bulk_write.
+    PANCHANGA_PRECOMPUTE_CONCURRENCY: int = 4
+    PANCHANGA_PRECOMPUTE_CHUNK_DAYS: int = 31
+    # Daily Panchanga cache: location elements are shared per geohash cell
+    # (precision 5 ≈ 4.9 km × 4.9 km); in-process LRU in front of Redis.
+    PANCHANGA_GEOHASH_PRECISION: int = 5
+    PANCHANGA_LOCAL_CACHE_SIZE: int = 4096
+    PANCHANGA_LOCAL_CACHE_TTL: int = 3600
+    PANCHANGA_CACHE_TTL: int = 7 * 24 * 3600
+    # Precomputed timezone grid ("lat_min,lat_max,lon_min,lon_max", degrees).
+    # Points outside it, and cells crossed by a zone border, use TimezoneFinder.
+    # Set PANCHANGA_TZ_GRID_PATH (.npy) to persist and mmap the grid.
+    PANCHANGA_TZ_GRID_BOUNDS: str = "5,38,60,98"
+    PANCHANGA_TZ_GRID_STEP: float = 0.05
+    PANCHANGA_TZ_GRID_PATH: Optional[str] = None
+
+    # ── WebSocket fan-out ─────────────────────────────────────────────────
+    # "user": one Redis channel per connected user (SUBSCRIBE on connect).
+    # "pod":  one channel per instance; a ws:presence hash (user → pod) routes
+    #         messages and is written in batches every WS_PRESENCE_FLUSH_INTERVAL s.
+    WS_PUBSUB_MODE: str = "user"
+    WS_POD_ID: Optional[str] = None  # Unset → "<hostname>-<pid>-<random>"
+    WS_PRESENCE_FLUSH_INTERVAL: float = 0.25
+    # Cluster presence: every pod re-stamps its users in ws:presence:seen each
+    # heartbeat; users not stamped within WS_PRESENCE_TTL s count as offline.
+    WS_PRESENCE_HEARTBEAT_INTERVAL: float = 30.0
+    WS_PRESENCE_TTL: int = 90
+    WS_PRESENCE_CACHE_TTL: float = 2.0  # Local cache of remote lookups
+    WS_PRESENCE_CACHE_SIZE: int = 10000
+    # Per-connection outbound queue.  Overflow policy: "drop_oldest",
+    # "drop_newest" or "disconnect"; drop_oldest only sheds droppable events and
+    # disconnects when none are queued.  A socket whose send stalls, or whose
+    # queue stays full, for WS_SLOW_CONSUMER_TIMEOUT seconds is disconnected.
+    WS_SEND_QUEUE_SIZE: int = 256
+    WS_SEND_OVERFLOW_POLICY: str = "drop_oldest"
+    WS_SLOW_CONSUMER_TIMEOUT: float = 10.0
+    # Broadcast / room fan-out: concurrent inline sends per batch.
+    WS_BROADCAST_CHUNK_SIZE: int = 500
+    # Offline stream per user: approximate max length and replay page size.
+    WS_OFFLINE_QUEUE_MAX_LEN: int = 1000
+    WS_OFFLINE_REPLAY_PAGE_SIZE: int = 100
 
     # ── Google OAuth ──────────────────────────────────────────────────────
     GOOGLE_CLIENT_ID: Optional[str] = None
@@ -196,6 +277,13 @@ class BaseAppSettings(BaseSettings):
     # ── Rate Limiting ─────────────────────────────────────────────────────
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_AUTH_PER_MINUTE: int = 10
+    # "gcra" stores one timestamp per key; "sliding_window" one ZSET member per request.
+    RATE_LIMIT_ALGORITHM: str = "gcra"
+    # Keys held by the in-process fallback used while Redis is unavailable.
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 100_000
+    # Kill-switch controls are cached per pod and reloaded on change
+    # notifications; this poll interval (s) bounds staleness if one is missed.
+    KILL_SWITCH_POLL_INTERVAL: float = 5.0
 
     # ── Logging ───────────────────────────────────────────────────────────
     LOG_LEVEL: str = "INFO"
@@ -4,7 +4,7 @@ All concrete service implementations must satisfy these contracts.
 SonarQube: S1192 - No duplicated strings
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 
 
 # ---------------------------------------------------------------------------
@@ -147,9 +147,15 @@ class ICacheService(ABC):
         """Retrieve value by key. Returns None on miss."""
 
     @abstractmethod
-    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        expire: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
         """
-        Store value with optional TTL in seconds.
+        Store value with optional TTL in seconds, registered under *tags*.
         Returns True on success.
         """
 
@@ -165,6 +171,10 @@ class ICacheService(ABC):
     async def clear_pattern(self, pattern: str) -> int:
         """Delete all keys matching a glob pattern. Returns count deleted."""
 
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key stored under any of the given tags. Returns count deleted."""
+
     @abstractmethod
     async def get_or_compute(
         self,
@@ -173,10 +183,13 @@ class ICacheService(ABC):
         expire: Optional[int] = None,
         use_l1_cache: bool = False,
         l1_expire: int = 5,
+        tags: Optional[Iterable[str]] = None,
+        stale_ttl: Optional[int] = None,
     ) -> Any:
         """
         Cache-aside pattern with thundering herd protection.
-        Fetches from cache or calls compute_func and caches result.
+        Fetches from cache or calls compute_func and caches result; may serve
+        a stale value for *stale_ttl* seconds while it is refreshed.
         """
 
 
@@ -14,8 +14,11 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
+from app.core.rate_limit_config import get_lease_fraction
 from app.core.security import SecurityManager
 from app.core.tracing import resolve_trace_context
 from app.services.kill_switch_service import DEFAULT_CONTROLS
@@ -60,7 +63,10 @@ except Exception:  # pragma: no cover
 
 
 def _extract_user_id_from_bearer(request: Request) -> Optional[str]:
-    """Best-effort extraction of user_id from bearer token for rate-limit bucketing."""
+    """
+    Best-effort extraction of user_id from bearer token for rate-limit bucketing.
+    The verified claims are left on request.state for get_current_user.
+    """
     authorization = request.headers.get("authorization", "")
     if not authorization.startswith("Bearer "):
         return None
@@ -68,7 +74,9 @@ def _extract_user_id_from_bearer(request: Request) -> Optional[str]:
     if not token:
         return None
     try:
-        payload = SecurityManager.verify_token(token)
+        payload = SecurityManager.verify_token_cached(token)
+        request.state.auth_token = token
+        request.state.token_claims = payload
         sub = payload.get("sub")
         return str(sub) if sub else None
     except Exception:
@@ -134,20 +142,17 @@ def _resolve_schema_version(request: Request) -> str:
     return normalized
 
 
-async def _resolve_kill_switch_controls(request: Request) -> dict:
-    """Resolve global controls with safe defaults and graceful failure handling."""
+def _resolve_kill_switch_controls(request: Request) -> dict:
+    """Return the pod's in-memory kill-switch snapshot (read-only, no I/O)."""
     service = getattr(request.app.state, "kill_switch_service", None)
     if service is None:
-        return dict(DEFAULT_CONTROLS)
-    try:
-        controls = dict(DEFAULT_CONTROLS)
-        controls.update(await service.get_controls())
-        return controls
-    except Exception:
-        return dict(DEFAULT_CONTROLS)
+        return DEFAULT_CONTROLS
+    return service.current_controls()
 
 
-async def _enforce_rate_limit(request: Request, user_id: Optional[str]) -> None:
+async def _enforce_rate_limit(
+    request: Request, user_id: Optional[str], controls: dict
+) -> None:
     """Apply composite distributed rate limiting for incoming request."""
     if not settings.ENABLE_RATE_LIMITING:
         return
@@ -155,7 +160,6 @@ async def _enforce_rate_limit(request: Request, user_id: Optional[str]) -> None:
     client_ip = request.client.host if request.client else "unknown-ip"
     device_fp = _device_fingerprint(request)
     path = request.url.path
-    controls = await _resolve_kill_switch_controls(request)
     limit = (
         settings.RATE_LIMIT_AUTH_PER_MINUTE
         if path.startswith("/api/v1/auth")
@@ -197,7 +201,12 @@ async def _enforce_rate_limit(request: Request, user_id: Optional[str]) -> None:
         f"m:{request.method}:p:{path}"
     )
 
-    allowed = await rate_limiter.check_rate_limit(bucket_key, limit=limit, window=60)
+    allowed = await rate_limiter.check_rate_limit(
+        bucket_key,
+        limit=limit,
+        window=60,
+        lease_fraction=get_lease_fraction(request.method, path),
+    )
     if allowed:
         return
 
@@ -313,7 +322,7 @@ def _build_kill_switch_response(
 
 
 def _attach_success_response_headers(
-    response,
+    headers: MutableHeaders,
     request_id: str,
     correlation_id: str,
     schema_version: str,
@@ -322,19 +331,19 @@ def _attach_success_response_headers(
     trace_context,
 ) -> None:
     """Attach canonical success response headers for observability and controls."""
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-Correlation-ID"] = correlation_id
-    response.headers["X-Process-Time"] = str(process_time)
-    response.headers["X-API-Schema-Version"] = schema_version
-    response.headers["X-Cache-Hint"] = _cache_hint_for_request(request)
+    headers["X-Request-ID"] = request_id
+    headers["X-Correlation-ID"] = correlation_id
+    headers["X-Process-Time"] = str(process_time)
+    headers["X-API-Schema-Version"] = schema_version
+    headers["X-Cache-Hint"] = _cache_hint_for_request(request)
     if get_query_budget() is not None:
-        response.headers["X-DB-Query-Budget"] = str(get_query_budget())
-        response.headers["X-DB-Query-Count"] = str(get_query_count())
-    response.headers["traceparent"] = trace_context.traceparent
+        headers["X-DB-Query-Budget"] = str(get_query_budget())
+        headers["X-DB-Query-Count"] = str(get_query_count())
+    headers["traceparent"] = trace_context.traceparent
     if trace_context.tracestate:
-        response.headers["tracestate"] = trace_context.tracestate
+        headers["tracestate"] = trace_context.tracestate
     # Fix for Firebase Auth cross-origin popup
-    response.headers["Cross-Origin-Opener-Policy"] = "same-origin-allow-popups"
+    headers["Cross-Origin-Opener-Policy"] = "same-origin-allow-popups"
 
 
 def _enforce_route_kill_switches(
@@ -429,14 +438,27 @@ def register_middleware(app: FastAPI) -> None:
         max_age=86400,          # Cache preflight for 24 hours
     )
 
-    # 5. Request ID + timing (innermost — runs for every request)
-    @app.middleware("http")
-    async def add_request_id_and_timing(request: Request, call_next):
-        """
-        Attach a unique request ID and measure end-to-end latency.
-        Fixes Firebase Auth COOP header as well.
-        SonarQube: Proper logging and monitoring
-        """
+    # 5. Request ID + timing
+    app.add_middleware(RequestContextMiddleware)
+
+
+class RequestContextMiddleware:
+    """
+    Attach a unique request ID and measure end-to-end latency.
+    Also applies rate limiting and route kill switches before the app runs.
+    Fixes Firebase Auth COOP header as well.
+    SonarQube: Proper logging and monitoring
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
         incoming_correlation_id = request.headers.get("X-Correlation-ID")
         correlation_id = incoming_correlation_id or str(uuid.uuid4())
         trace_context = resolve_trace_context(
@@ -447,13 +469,15 @@ def register_middleware(app: FastAPI) -> None:
         try:
             schema_version = _resolve_schema_version(request)
         except HTTPException as exc:
-            return _build_schema_error_response(
+            response = _build_schema_error_response(
                 request_id,
                 correlation_id,
                 request,
                 exc,
                 trace_context,
             )
+            await response(scope, receive, send)
+            return
         request.state.request_id = request_id
         request.state.correlation_id = correlation_id
         request.state.schema_version = schema_version
@@ -470,9 +494,9 @@ def register_middleware(app: FastAPI) -> None:
         user_id = _extract_user_id_from_bearer(request)
         request.state.user_id = user_id
         set_user_id(user_id or "")
-        await _enforce_rate_limit(request, user_id)
+        controls = _resolve_kill_switch_controls(request)
+        await _enforce_rate_limit(request, user_id, controls)
 
-        controls = await _resolve_kill_switch_controls(request)
         kill_switch_response = _enforce_route_kill_switches(
             request,
             controls,
@@ -482,36 +506,43 @@ def register_middleware(app: FastAPI) -> None:
             trace_context,
         )
         if kill_switch_response is not None:
-            return kill_switch_response
+            await kill_switch_response(scope, receive, send)
+            return
 
         start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
 
-        _attach_success_response_headers(
-            response,
-            request_id,
-            correlation_id,
-            schema_version,
-            process_time,
-            request,
-            trace_context,
-        )
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] != "http.response.start":
+                await send(message)
+                return
+            process_time = time.time() - start_time
+            _attach_success_response_headers(
+                MutableHeaders(scope=message),
+                request_id,
+                correlation_id,
+                schema_version,
+                process_time,
+                request,
+                trace_context,
+            )
+            await send(message)
 
-        _record_api_metrics(request, response.status_code, process_time)
+            _record_api_metrics(request, message["status"], process_time)
 
-        logger.info(
-            "Request: %s %s — Status: %s — Duration: %.3fs — Request-ID: %s",
-            request.method,
-            request.url.path,
-            response.status_code,
-            process_time,
-            request_id,
-        )
-        set_correlation_id("")
-        set_trace_id("")
-        set_span_id("")
-        set_user_id("")
-        clear_query_budget()
+            logger.info(
+                "Request: %s %s — Status: %s — Duration: %.3fs — Request-ID: %s",
+                request.method,
+                request.url.path,
+                message["status"],
+                process_time,
+                request_id,
+            )
 
-        return response
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            set_correlation_id("")
+            set_trace_id("")
+            set_span_id("")
+            set_user_id("")
+            clear_query_budget()
@@ -58,6 +58,22 @@ BURST_LIMITS: Dict[str, int] = {
     "/api/v1/upload": 5,
 }
 
+# ---------------------------------------------------------------------------
+# Leased limits — GET/HEAD route groups that may spend rate-limit tokens
+# locally. Each pod leases this fraction of the limit from Redis per bucket and
+# refills in the background, so most requests skip the Redis round-trip.
+# Routes not listed here (auth, payments, every write) are checked exactly
+# against Redis on each request. Requires RATE_LIMIT_ALGORITHM="gcra".
+LEASED_LIMITS: Dict[str, float] = {
+    "/api/v1/panchanga": 0.1,
+    "/api/v1/services": 0.1,
+    "/api/v1/users/acharyas": 0.1,
+    "/api/v1/reviews": 0.1,
+    "/api/v1/content": 0.1,
+}
+
+_LEASABLE_METHODS = frozenset({"GET", "HEAD"})
+
 # ---------------------------------------------------------------------------
 # Helper functions (Open-Closed: callers extend via config, not code)
 
@@ -93,3 +109,17 @@ def get_burst_limit(path: str) -> Optional[int]:
             return burst
 
     return None
+
+
+def get_lease_fraction(method: str, path: str) -> Optional[float]:
+    """
+    Return the lease fraction for a request, or None if it must be checked
+    exactly. Longest matching prefix wins.
+    """
+    if method not in _LEASABLE_METHODS:
+        return None
+    matched_prefix = ""
+    for prefix in LEASED_LIMITS:
+        if path.startswith(prefix) and len(prefix) > len(matched_prefix):
+            matched_prefix = prefix
+    return LEASED_LIMITS[matched_prefix] if matched_prefix else None
@@ -34,11 +34,12 @@ bcrypt.hashpw = _patched_hashpw
 # ---------------------------------------------
 
 from passlib.context import CryptContext
-from fastapi import HTTPException, Security, Depends
+from fastapi import HTTPException, Request, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from redis.asyncio import Redis
 
 from app.core.config import settings
+from app.core.token_cache import revoked_tokens, verified_tokens
 from app.db.redis import get_redis
 
 
@@ -205,6 +206,18 @@ class SecurityManager:
                 headers={"WWW-Authenticate": "Bearer"},
             ) from e
 
+    @staticmethod
+    def verify_token_cached(token: str) -> Dict[str, Any]:
+        """
+        verify_token, memoised per pod until the token's exp.
+        Only a successful verification is cached, so bad tokens still get a 401.
+        """
+        payload = verified_tokens.get(token)
+        if payload is None:
+            payload = SecurityManager.verify_token(token)
+            verified_tokens.put(token, payload)
+        return payload
+
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash password using bcrypt - SonarQube compliant (delegates to get_password_hash)"""
@@ -220,12 +233,14 @@ class SecurityManager:
 
 
 async def get_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Security(security),
     redis: Optional[Redis] = Depends(get_redis),
 ) -> Dict[str, Any]:
     """
     Dependency to get current authenticated user.
     Checks token blacklist (populated by logout) when Redis is available.
+    Reuses the claims RequestContextMiddleware already verified for this request.
     SonarQube: Validates token on every request
     """
     if not credentials:
@@ -240,7 +255,10 @@ async def get_current_user(
     if fake_auth_user is not None:
         return fake_auth_user
 
-    payload = SecurityManager.verify_token(token)
+    if getattr(request.state, "auth_token", None) == token:
+        payload = request.state.token_claims
+    else:
+        payload = SecurityManager.verify_token_cached(token)
 
     # Validate token type
     if payload.get("type") != "access":
@@ -254,8 +272,7 @@ async def get_current_user(
     jti = payload.get("jti")
     if jti and redis is not None:
         try:
-            is_blacklisted = await redis.exists(f"blacklist:{jti}") == 1
-            if is_blacklisted:
+            if await revoked_tokens.is_revoked(redis, jti):
                 raise HTTPException(
                     status_code=401,
                     detail="Token has been revoked. Please log in again.",
@@ -7,11 +7,13 @@ import asyncio
 import logging
 
 from app.core.config import settings
+from app.core.token_cache import revoked_tokens
 from app.db.connection import DatabaseManager
 from app.db.redis import close_pool as close_redis_pool
 from app.middleware.rate_limit import rate_limiter
 from app.services.cache_service import cache
 from app.services.websocket_manager import manager
+from app.services.panchanga_executor import panchanga_executor
 from app.services.search_service import search_service
 from app.services.query_optimizer import QueryOptimizer
 from app.services.audit_service import AuditService
@@ -93,6 +95,23 @@ async def _initialize_services_collection() -> None:
         logger.warning(f"Services initialization failed: {e}")
 
 
+async def _warm_panchanga() -> None:
+    """
+    Load the timezone grid and the Panchanga transition tables around this
+    year off the event loop, so no user request pays their initialisation cost.
+    """
+    from app.services.panchanga_transitions import EPHEM_AVAILABLE, transition_store  # noqa: PLC0415
+    from app.services.timezone_grid import timezone_resolver  # noqa: PLC0415
+
+    try:
+        await asyncio.to_thread(timezone_resolver.warm_up)
+        if EPHEM_AVAILABLE:
+            await asyncio.to_thread(transition_store.warm_up)
+            logger.info("Panchanga transition tables ready")
+    except Exception as e:
+        logger.warning(f"Panchanga warm-up failed: {e}")
+
+
 async def startup(app) -> None:
     """
     Execute all startup tasks in order.
@@ -109,15 +128,19 @@ async def startup(app) -> None:
 
     await _create_db_indexes()
     await _initialize_services_collection()
+    await _warm_panchanga()
+    panchanga_executor.start()
 
     # Advanced rate limiter (requires Redis client reference)
     redis_client = getattr(rate_limiter, "redis_client", None)
     app.state.rate_limiter = AdvancedRateLimiter(redis_client)
+    await revoked_tokens.start(redis_client)
 
     # Audit service (requires live DB)
     if DatabaseManager.db is not None:
         app.state.audit_service = AuditService(DatabaseManager.db)
-        app.state.kill_switch_service = KillSwitchService(DatabaseManager.db)
+        app.state.kill_switch_service = KillSwitchService(DatabaseManager.db, redis_client)
+        await app.state.kill_switch_service.start()
         app.state.risk_policy_engine = RiskPolicyEngine()
     else:
         app.state.audit_service = None
@@ -167,6 +190,12 @@ async def shutdown(app) -> None:  # noqa: ARG001 - app reserved for future use
                 logger.warning("%s shutdown error: %s", task_name, e)
             logger.info("%s cancelled", task_name)
 
+    kill_switch_service = getattr(app.state, "kill_switch_service", None)
+    if kill_switch_service is not None:
+        await kill_switch_service.stop()
+    await revoked_tokens.stop()
+
+    panchanga_executor.shutdown()
     await DatabaseManager.close_database_connection()
     await rate_limiter.close()
     await cache.disconnect()
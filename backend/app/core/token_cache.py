@@ -0,0 +1,161 @@
+"""
+Per-pod caches for bearer-token authentication.
+
+``verified_tokens`` keeps the claims of access tokens that already passed
+signature verification, keyed by the SHA-256 of the token and dropped at the
+token's ``exp``, so each token is verified once per pod rather than on every
+request.
+
+``revoked_tokens`` fronts the Redis blacklist (``blacklist:<jti>``).  A jti
+found absent is remembered for ``AUTH_REVOCATION_CACHE_TTL`` seconds; logout
+publishes the jti on ``TOKEN_REVOKED_CHANNEL`` and every pod marks it revoked
+as soon as the notification arrives.  The TTL bounds how long a pod can miss
+a revocation if a notification is lost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REVOKED_CHANNEL = "auth:revoked"
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified claims, each entry valid until the token's ``exp``."""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or settings.AUTH_TOKEN_CACHE_SIZE
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return  # no expiry to bound the entry by; always re-verify
+        key = _token_key(token)
+        self._entries[key] = (float(exp), claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class RevocationCache:
+    """Local view of the token blacklist, kept current via pub/sub."""
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        self.ttl = settings.AUTH_REVOCATION_CACHE_TTL if ttl is None else ttl
+        self.max_size = max_size or settings.AUTH_TOKEN_CACHE_SIZE
+        # jti -> monotonic time until which the answer is trusted
+        self._revoked: "OrderedDict[str, float]" = OrderedDict()
+        self._not_revoked: "OrderedDict[str, float]" = OrderedDict()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    async def is_revoked(self, redis: Redis, jti: str) -> bool:
+        """Return True if ``jti`` is blacklisted; Redis errors propagate."""
+        now = time.monotonic()
+        until = self._revoked.get(jti)
+        if until is not None:
+            if now < until:
+                return True
+            del self._revoked[jti]
+        until = self._not_revoked.get(jti)
+        if until is not None:
+            if now < until:
+                return False
+            del self._not_revoked[jti]
+
+        revoked = await redis.exists(f"blacklist:{jti}") == 1
+        if revoked:
+            # The blacklist key outlives the token, so the token's own
+            # lifetime is a safe bound for remembering the revocation.
+            self._remember(self._revoked, jti, now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        elif self.ttl > 0:
+            self._remember(self._not_revoked, jti, now + self.ttl)
+        return revoked
+
+    def mark_revoked(self, jti: str, expires_in_seconds: float) -> None:
+        self._not_revoked.pop(jti, None)
+        self._remember(self._revoked, jti, time.monotonic() + expires_in_seconds)
+
+    def clear(self) -> None:
+        self._revoked.clear()
+        self._not_revoked.clear()
+
+    def _remember(self, entries: "OrderedDict[str, float]", jti: str, until: float) -> None:
+        entries[jti] = until
+        entries.move_to_end(jti)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    async def start(self, redis_client: Optional[Redis]) -> None:
+        """Subscribe to revocation notifications in the background."""
+        if redis_client is not None and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(redis_client))
+
+    async def stop(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch(self, redis_client: Redis) -> None:
+        while True:
+            try:
+                await self._listen(redis_client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token revocation subscription lost, retrying: {e}")
+            # Anything published while we were disconnected was missed.
+            self._not_revoked.clear()
+            await asyncio.sleep(max(self.ttl, 1.0))
+
+    async def _listen(self, redis_client: Redis) -> None:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(TOKEN_REVOKED_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                jti = message["data"]
+                if isinstance(jti, bytes):
+                    jti = jti.decode()
+                self.mark_revoked(jti, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        finally:
+            await pubsub.close()
+
+
+verified_tokens = VerifiedTokenCache()
+revoked_tokens = RevocationCache()
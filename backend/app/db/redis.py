@@ -64,7 +64,15 @@ async def close_pool() -> None:
 
 async def blacklist_token(redis: Redis, jti: str, expires_in_seconds: int) -> None:
     """Add a JWT ID to the token blacklist with automatic expiry."""
+    from app.core.token_cache import TOKEN_REVOKED_CHANNEL, revoked_tokens  # noqa: PLC0415
+
     await redis.setex(f"blacklist:{jti}", expires_in_seconds, "1")
+    revoked_tokens.mark_revoked(jti, expires_in_seconds)
+    try:
+        await redis.publish(TOKEN_REVOKED_CHANNEL, jti)
+    except Exception as e:
+        # Other pods still pick it up once their cached answer expires.
+        logger.warning(f"Token revocation notification failed: {e}")
 
 
 async def is_token_blacklisted(redis: Redis, jti: str) -> bool:
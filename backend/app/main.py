@@ -493,6 +493,7 @@ async def websocket_endpoint(
     user_id: str,
     ticket: Optional[str] = None,
     token: Optional[str] = None,
+    last_offline_id: Optional[str] = None,
 ):
     """
     WebSocket endpoint for real-time features:
@@ -504,6 +505,7 @@ async def websocket_endpoint(
 
     Preferred auth: 'ticket' query parameter (one-time, Redis-backed, 60 s TTL).
     Legacy fallback:  'token' query parameter (JWT) — accepted only in non-production.
+    Reconnecting clients pass 'last_offline_id' (last acked offline_id) to resume replay.
     """
     # SECURITY: Validate origin header (CORS for WebSocket)
     origin = websocket.headers.get("origin")
@@ -544,7 +546,7 @@ async def websocket_endpoint(
         await websocket.close(code=1008, reason="Authentication required")
         return
 
-    await manager.connect(authenticated_user_id, websocket)
+    await manager.connect(authenticated_user_id, websocket, last_offline_id)
     logger.info(f"WebSocket connected: user {authenticated_user_id} from origin {origin}")
 
     try:
@@ -4,8 +4,10 @@ Implements sliding window rate limiting with Redis
 """
 from fastapi import Request, HTTPException, status
 from redis.asyncio import Redis
+import math
 import time
 import logging
+import uuid
 from typing import Dict, Tuple, Optional
 from functools import wraps
 
@@ -20,6 +22,46 @@ from app.core.rate_limit_config import (
 
 logger = logging.getLogger(__name__)
 
+# Burst limits apply to this trailing window (seconds).
+BURST_WINDOW = 5
+
+# Lua script for the whole sliding-window check in one round-trip.
+# Timestamps are in milliseconds so requests within one second stay distinct.
+# KEYS[1] = the rate-limit key
+# ARGV[1] = now
+# ARGV[2] = window
+# ARGV[3] = limit
+# ARGV[4] = burst limit (0 disables the burst check)
+# ARGV[5] = burst window
+# ARGV[6] = unique member id
+# Returns {allowed, remaining, reset, burst_exceeded}
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local burst = tonumber(ARGV[4])
+local burst_window = tonumber(ARGV[5])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if burst > 0 then
+    local recent = redis.call('ZCOUNT', KEYS[1], now - burst_window, '+inf')
+    if recent >= burst then
+        return {0, 0, now + burst_window, 1}
+    end
+end
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    local reset = now + window
+    if oldest[2] then
+        reset = tonumber(oldest[2]) + window
+    end
+    return {0, 0, reset, 0}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[6])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, limit - count - 1, now + window, 0}
+"""
+
 
 class AdvancedRateLimiter:
     """
@@ -30,6 +72,8 @@ class AdvancedRateLimiter:
 
     def __init__(self, redis_client: Redis):
         self.redis = redis_client
+        # EVALSHA, re-loading the script if Redis has flushed its script cache
+        self._script = redis_client.register_script(_SLIDING_WINDOW_LUA) if redis_client else None
 
         # Loaded from rate_limit_config — not hardcoded here (OCP)
         self.endpoint_limits: Dict[str, Tuple[int, int]] = ENDPOINT_LIMITS
@@ -40,7 +84,9 @@ class AdvancedRateLimiter:
         self, key: str, limit: int, window: int, burst_limit: Optional[int] = None
     ) -> Tuple[bool, Dict[str, int]]:
         """
-        Check if request exceeds rate limit using sliding window
+        Check if request exceeds rate limit using sliding window.
+        Pruning, burst check, counting and recording run atomically in a
+        single Lua script call.
 
         Args:
             key: Unique identifier for rate limit (e.g., "user:123:/api/bookings")
@@ -51,58 +97,34 @@ class AdvancedRateLimiter:
         Returns:
             (allowed, metadata) tuple
         """
-        current_time = int(time.time())
-        window_start = current_time - window
+        now_ms = int(time.time() * 1000)
+        current_time = now_ms // 1000
 
         try:
-            # Remove old entries outside the window
-            await self.redis.zremrangebyscore(key, 0, window_start)
-
-            # Count requests in current window
-            request_count = await self.redis.zcard(key)
-
-            # Check burst limit (requests in last 5 seconds)
-            if burst_limit:
-                burst_start = current_time - 5
-                burst_count = await self.redis.zcount(key, burst_start, current_time)
-                if burst_count >= burst_limit:
-                    metadata = {
-                        "limit": limit,
-                        "remaining": 0,
-                        "reset": current_time + 5,
-                        "burst_exceeded": True,
-                    }
-                    return False, metadata
-
-            # Check main rate limit
-            if request_count >= limit:
-                # Get oldest request timestamp to calculate reset time
-                oldest = await self.redis.zrange(key, 0, 0, withscores=True)
-                reset_time = (
-                    int(oldest[0][1]) + window if oldest else current_time + window
-                )
-
-                metadata = {
-                    "limit": limit,
-                    "remaining": 0,
-                    "reset": reset_time,
-                    "retry_after": reset_time - current_time,
-                }
-                return False, metadata
-
-            # Add current request
-            await self.redis.zadd(key, {str(current_time): current_time})
-
-            # Set expiry on the key
-            await self.redis.expire(key, window)
-
+            allowed, remaining, reset_ms, burst_exceeded = await self._script(
+                keys=[key],
+                args=[
+                    now_ms,
+                    window * 1000,
+                    limit,
+                    burst_limit or 0,
+                    BURST_WINDOW * 1000,
+                    f"{now_ms}:{uuid.uuid4().hex[:8]}",
+                ],
+            )
+            reset_time = math.ceil(int(reset_ms) / 1000)
             metadata = {
                 "limit": limit,
-                "remaining": limit - request_count - 1,
-                "reset": current_time + window,
+                "remaining": int(remaining),
+                "reset": reset_time,
             }
-
-            return True, metadata
+            if allowed:
+                return True, metadata
+            if burst_exceeded:
+                metadata["burst_exceeded"] = True
+            else:
+                metadata["retry_after"] = reset_time - current_time
+            return False, metadata
 
         except Exception as e:
             logger.error(f"Rate limit check failed: {e}")
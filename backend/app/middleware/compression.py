@@ -1,17 +1,115 @@
 """
 API Response Compression Middleware
-Compresses JSON responses using gzip for faster data transfer
+Streams responses through gzip, brotli or zstd, whichever the client prefers
+and this server supports, as a pure ASGI middleware.
+
+Bodies are never collected in full: the first chunks are held only until
+``minimum_size`` bytes have arrived (smaller responses go out uncompressed),
+then each chunk is compressed and flushed as it is produced, so streamed
+list/export responses keep streaming.
 """
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-import gzip
 import logging
-from typing import Callable
+import zlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/html",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+)
+
+# Dynamic-content levels: fast enough to run per request.
+_BROTLI_QUALITY = 4
+_ZSTD_LEVEL = 3
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compressobj()
 
-class CompressionMiddleware(BaseHTTPMiddleware):
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Server preference order; only encodings whose library is installed.
+ENCODERS = {"gzip": _GzipEncoder}
+if zstandard is not None:
+    ENCODERS = {"zstd": _ZstdEncoder, **ENCODERS}
+if brotli is not None:
+    ENCODERS = {"br": _BrotliEncoder, **ENCODERS}
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding the client accepts (q > 0)."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    for name in ENCODERS:
+        if accepted.get(name, accepted.get("*", 0.0)) > 0:
+            return name
+    return None
+
+
+class CompressionMiddleware:
     """
     Middleware to compress API responses
     Reduces bandwidth usage and improves response times
@@ -19,100 +117,118 @@ class CompressionMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         minimum_size: int = 1024,  # Only compress responses > 1KB
         compression_level: int = 6,  # gzip compression level (1-9)
     ):
-        super().__init__(app)
+        self.app = app
         self.minimum_size = minimum_size
         self.compression_level = compression_level
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request and compress response if applicable"""
-
-        # Check if client accepts gzip
-        accept_encoding = request.headers.get("accept-encoding", "")
-        if "gzip" not in accept_encoding.lower():
-            return await call_next(request)
-
-        # Get response
-        response = await call_next(request)
-
-        # Only compress successful responses
-        if response.status_code >= 400:
-            return response
-
-        # Check content type
-        content_type = response.headers.get("content-type", "")
-        compressible_types = [
-            "application/json",
-            "text/html",
-            "text/css",
-            "text/javascript",
-            "application/javascript",
-        ]
-
-        if not any(ct in content_type for ct in compressible_types):
-            return response
-
-        # Get response body
-        body = b""
-        async for chunk in response.body_iterator:
-            body += chunk
-
-        # Only compress if response is large enough
-        if len(body) < self.minimum_size:
-            return Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type,
-            )
-
-        # Compress response
-        try:
-            compressed_body = gzip.compress(body, compresslevel=self.compression_level)
-
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(
+            send, encoding, self.minimum_size, self.compression_level
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request state: decides on the first body chunks, then streams."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int, level: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start_message: Optional[Message] = None
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+        elif message["type"] == "http.response.start":
+            self.start_message = message
+            if not self._compressible(Headers(raw=message["headers"]), message["status"]):
+                self.passthrough = True
+                await self._send(message)
+        elif message["type"] != "http.response.body":
+            # e.g. http.response.pathsend: the body bypasses us entirely
+            if self.encoder is None:
+                self.passthrough = True
+                await self._send(self.start_message)
+            await self._send(message)
+        elif self.encoder is not None:
+            await self._send_compressed(message.get("body", b""), message.get("more_body", False))
+        else:
+            await self._sniff(message.get("body", b""), message.get("more_body", False))
+
+    @staticmethod
+    def _compressible(headers: Headers, status: int) -> bool:
+        if status >= 400 or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return any(ct in content_type for ct in COMPRESSIBLE_TYPES)
+
+    async def _sniff(self, body: bytes, more_body: bool) -> None:
+        """Hold chunks until we know whether the response is big enough."""
+        if body:
+            self.pending.append(body)
+            self.pending_size += len(body)
+        if more_body and self.pending_size < self.minimum_size:
+            return
+        body, self.pending = b"".join(self.pending), []
+        if self.pending_size < self.minimum_size:
+            await self._send_plain(body)
+            return
+
+        self.encoder = ENCODERS[self.encoding](self.level)
+        if not more_body:
+            compressed = self.encoder.compress(body) + self.encoder.finish()
             # Only use compression if it actually reduces size
-            if len(compressed_body) >= len(body):
-                return Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
-                )
-
-            # Create new response with compressed content
-            headers = dict(response.headers)
-            headers["content-encoding"] = "gzip"
-            headers["content-length"] = str(len(compressed_body))
-            headers["vary"] = "Accept-Encoding"
-
-            # Remove any existing content-encoding
-            if "content-encoding" in headers and headers["content-encoding"] != "gzip":
-                del headers["content-encoding"]
-
+            if len(compressed) >= len(body):
+                await self._send_plain(body)
+                return
             logger.debug(
-                f"Compressed response: {len(body)} -> {len(compressed_body)} bytes "
-                f"({100 * (1 - len(compressed_body) / len(body)):.1f}% reduction)"
-            )
-
-            return Response(
-                content=compressed_body,
-                status_code=response.status_code,
-                headers=headers,
-                media_type=response.media_type,
-            )
-
-        except Exception as e:
-            logger.error(f"Compression failed: {e}")
-            # Return uncompressed response on error
-            return Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type,
+                f"Compressed response ({self.encoding}): {len(body)} -> {len(compressed)} bytes"
             )
+            await self._send_start(len(compressed))
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+        await self._send_start(None)
+        await self._send_compressed(body, more_body=True)
+
+    async def _send_start(self, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(content_length)
+        self.start_message["headers"] = headers.raw
+        await self._send(self.start_message)
+
+    async def _send_plain(self, body: bytes) -> None:
+        self.passthrough = True
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": body})
+
+    async def _send_compressed(self, body: bytes, more_body: bool) -> None:
+        if more_body:
+            chunk = self.encoder.compress(body) + self.encoder.flush()
+        else:
+            chunk = self.encoder.compress(body) + self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
 
 
 # Usage in main.py:
@@ -7,9 +7,11 @@ from slowapi import Limiter  # type: ignore
 from slowapi.util import get_remote_address  # type: ignore
 from slowapi.errors import RateLimitExceeded  # type: ignore
 import redis.asyncio as redis
-from typing import Optional
+from typing import Dict, Optional
+import asyncio
 import collections
 import logging
+import math
 import time
 import uuid
 
@@ -37,6 +39,57 @@ redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
 return 0
 """
 
+# Lua script for GCRA (generic cell rate algorithm) rate limiting.
+# The key holds a single value, the theoretical arrival time (TAT) of the next
+# request, so memory per key is constant regardless of traffic.
+# KEYS[1] = the rate-limit key
+# ARGV[1] = now (ms)
+# ARGV[2] = emission interval (ms between requests at the sustained rate)
+# ARGV[3] = burst tolerance (ms the TAT may run ahead of now)
+# ARGV[4] = tokens wanted (1 for a single request, more to lease a batch)
+# Returns the number of tokens granted (0 = rate-limited)
+_GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local granted = math.floor((tonumber(ARGV[3]) - (tat - now)) / interval) + 1
+if granted <= 0 then
+    return 0
+end
+granted = math.min(granted, tonumber(ARGV[4]))
+local new_tat = tat + granted * interval
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return granted
+"""
+
+_SCRIPTS = {"gcra": _GCRA_LUA, "sliding_window": _SLIDING_WINDOW_LUA}
+# Redis key suffix per algorithm.  GCRA stores a string where the sliding
+# window keeps a ZSET, so the two must never share a key (rolling deploys,
+# RATE_LIMIT_ALGORITHM changes); the sliding window keeps the original key.
+_KEY_SUFFIXES = {"gcra": ":gcra", "sliding_window": ""}
+
+# Seconds between sweeps of idle keys from the in-memory fallback.
+_MEMORY_SWEEP_INTERVAL = 30.0
+
+
+def _gcra_params(limit: int, window: int) -> tuple:
+    """(emission interval, burst tolerance) in ms: `limit` back-to-back requests per `window`."""
+    interval = math.ceil(window * 1000 / limit)
+    return interval, interval * (limit - 1)
+
+
+class _Lease:
+    """Tokens this pod took from a Redis GCRA bucket ahead of use."""
+
+    __slots__ = ("tokens", "expires")
+
+    def __init__(self, tokens: int, expires: float):
+        self.tokens = tokens
+        self.expires = expires
+
 
 # Initialize rate limiter
 limiter = Limiter(
@@ -48,16 +101,25 @@ limiter = Limiter(
 class RateLimitMiddleware:
     """
     Custom rate limiting middleware with Redis backend.
-    Falls back to an in-memory sliding-window counter when Redis is unavailable
-    so rate limiting is never disabled during Redis outages (SEC-04).
+    Uses GCRA or a sliding window (RATE_LIMIT_ALGORITHM) in Redis, and falls
+    back to an in-memory GCRA limiter when Redis is unavailable so rate
+    limiting is never disabled during Redis outages (SEC-04).
     SonarQube: S4790 - DoS protection
     """
 
-    def __init__(self):
+    def __init__(self, algorithm: Optional[str] = None):
+        self.algorithm = algorithm or settings.RATE_LIMIT_ALGORITHM
+        if self.algorithm not in _SCRIPTS:
+            raise ValueError(f"Unknown rate limit algorithm: {self.algorithm}")
         self.redis_client: Optional[redis.Redis] = None
         self._lua_sha: Optional[str] = None
-        # In-memory fallback: key -> deque of timestamps
-        self._memory_windows: dict = collections.defaultdict(collections.deque)
+        # In-memory fallback: key -> TAT (monotonic seconds), least recently used first
+        self._memory_tats: "collections.OrderedDict[str, float]" = collections.OrderedDict()
+        self._memory_max_keys = settings.RATE_LIMIT_LOCAL_MAX_KEYS
+        self._memory_next_sweep = 0.0
+        # Leased tokens per bucket (GCRA only) and in-flight background refills
+        self._leases: Dict[str, _Lease] = {}
+        self._refills: Dict[str, asyncio.Task] = {}
 
     async def connect_redis(self):
         """Connect to Redis for distributed rate limiting"""
@@ -67,80 +129,141 @@ class RateLimitMiddleware:
             )
             await self.redis_client.ping()
             # Pre-load the Lua script so each call uses EVALSHA (faster)
-            self._lua_sha = await self.redis_client.script_load(_SLIDING_WINDOW_LUA)
+            self._lua_sha = await self.redis_client.script_load(_SCRIPTS[self.algorithm])
             logger.info("Connected to Redis for rate limiting")
         except Exception as e:
             logger.warning(f"Redis connection failed, using in-memory: {e}")
             self.redis_client = None
             self._lua_sha = None
 
-    async def check_rate_limit(self, key: str, limit: int, window: int = 60) -> bool:
+    async def check_rate_limit(
+        self, key: str, limit: int, window: int = 60, lease_fraction: Optional[float] = None
+    ) -> bool:
         """
-        Atomic sliding-window rate limit check using a server-side Lua script.
+        Atomic rate limit check using a server-side Lua script.
 
         Args:
             key: Unique identifier (IP or user ID)
             limit: Maximum requests allowed
             window: Time window in seconds
+            lease_fraction: If set (GCRA only), lease this fraction of the
+                limit from Redis at a time and spend it locally, so most
+                requests skip the Redis round-trip. Leased tokens are already
+                counted in Redis, so the global limit still holds; a pod may
+                reject early while other pods hold unspent tokens.
 
         Returns:
             True if allowed, False if rate limit exceeded
         """
         if not self.redis_client:
-            # SEC-04: Use in-memory sliding-window instead of failing open.
+            # SEC-04: Use the in-memory limiter instead of failing open.
             return self._check_memory_rate_limit(key, limit, window)
 
         try:
-            now = int(time.time())
-            window_start = now - window
-            member_id = f"{now}:{uuid.uuid4().hex[:8]}"
-
-            if self._lua_sha:
-                result = await self.redis_client.evalsha(
-                    self._lua_sha,
-                    1,
-                    key,
-                    str(window_start),
-                    str(now),
-                    member_id,
-                    str(window),
-                    str(limit),
-                )
-            else:
-                # Fallback: load script on the fly
-                result = await self.redis_client.eval(
-                    _SLIDING_WINDOW_LUA,
-                    1,
-                    key,
-                    str(window_start),
-                    str(now),
-                    member_id,
-                    str(window),
-                    str(limit),
-                )
-
-            return result == 1
+            redis_key = key + _KEY_SUFFIXES[self.algorithm]
+            batch = self._lease_size(limit, lease_fraction)
+            if batch > 1:
+                return await self._check_leased(redis_key, limit, window, batch)
+            return await self._take(redis_key, limit, window, 1) == 1
 
         except Exception as e:
             logger.error(f"Rate limit check failed: {e}")
             # SEC-04: Fall back to in-memory counter, not open access
             return self._check_memory_rate_limit(key, limit, window)
 
+    async def _take(self, key: str, limit: int, window: int, count: int) -> int:
+        """Run the limiter script once; returns how many requests it admitted."""
+        args = self._script_args(limit, window, count)
+        if self._lua_sha:
+            result = await self.redis_client.evalsha(self._lua_sha, 1, key, *args)
+        else:
+            # Fallback: load script on the fly
+            result = await self.redis_client.eval(_SCRIPTS[self.algorithm], 1, key, *args)
+        return int(result)
+
+    def _lease_size(self, limit: int, lease_fraction: Optional[float]) -> int:
+        if not lease_fraction or self.algorithm != "gcra":
+            return 1
+        return max(1, int(limit * lease_fraction))
+
+    async def _check_leased(self, key: str, limit: int, window: int, batch: int) -> bool:
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None and lease.tokens > 0 and lease.expires > now:
+            lease.tokens -= 1
+            if lease.tokens <= batch // 2 and key not in self._refills:
+                self._refills[key] = asyncio.create_task(
+                    self._refill(key, limit, window, batch)
+                )
+            return True
+
+        granted = await self._take(key, limit, window, batch)
+        if not granted:
+            return False
+        # A refill may have landed while we waited; Redis counted both batches.
+        self._add_to_lease(key, granted - 1, window)
+        return True
+
+    async def _refill(self, key: str, limit: int, window: int, batch: int) -> None:
+        """Top up a lease in the background before it runs out."""
+        try:
+            granted = await self._take(key, limit, window, batch)
+            if granted:
+                self._add_to_lease(key, granted, window)
+        except Exception as e:
+            logger.warning(f"Rate limit lease refill failed for {key}: {e}")
+        finally:
+            self._refills.pop(key, None)
+
+    def _add_to_lease(self, key: str, tokens: int, window: int) -> None:
+        """Add freshly taken tokens to any unexpired lease for the bucket."""
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        remaining = lease.tokens if lease is not None and lease.expires > now else 0
+        self._store_lease(key, remaining + tokens, now + window)
+
+    def _store_lease(self, key: str, tokens: int, expires: float) -> None:
+        if key not in self._leases and len(self._leases) >= self._memory_max_keys:
+            now = time.monotonic()
+            self._leases = {k: v for k, v in self._leases.items() if v.expires > now}
+            if len(self._leases) >= self._memory_max_keys:
+                self._leases.clear()
+        self._leases[key] = _Lease(tokens, expires)
+
+    def _script_args(self, limit: int, window: int, count: int = 1) -> list:
+        if self.algorithm == "gcra":
+            interval, tolerance = _gcra_params(limit, window)
+            return [str(int(time.time() * 1000)), str(interval), str(tolerance), str(count)]
+        now = int(time.time())
+        member_id = f"{now}:{uuid.uuid4().hex[:8]}"
+        return [str(now - window), str(now), member_id, str(window), str(limit)]
+
     def _check_memory_rate_limit(self, key: str, limit: int, window: int) -> bool:
-        """Sliding-window rate limiter using an in-memory deque (Redis fallback)."""
-        now = time.time()
-        window_start = now - window
-        timestamps = self._memory_windows[key]
-        # Drop timestamps outside the window
-        while timestamps and timestamps[0] < window_start:
-            timestamps.popleft()
-        if len(timestamps) >= limit:
+        """GCRA rate limiter over a bounded in-memory map (Redis fallback)."""
+        now = time.monotonic()
+        if now >= self._memory_next_sweep:
+            self._sweep_memory(now)
+        interval, tolerance = (v / 1000 for v in _gcra_params(limit, window))
+        tat = max(self._memory_tats.pop(key, now), now)
+        if tat - now > tolerance:
+            self._memory_tats[key] = tat
             return False
-        timestamps.append(now)
+        while len(self._memory_tats) >= self._memory_max_keys:
+            self._memory_tats.popitem(last=False)
+        self._memory_tats[key] = tat + interval
         return True
 
+    def _sweep_memory(self, now: float) -> None:
+        """Drop keys whose TAT has passed; they are indistinguishable from new keys."""
+        self._memory_tats = collections.OrderedDict(
+            (key, tat) for key, tat in self._memory_tats.items() if tat > now
+        )
+        self._memory_next_sweep = now + _MEMORY_SWEEP_INTERVAL
+
     async def close(self):
         """Close Redis connection"""
+        for task in list(self._refills.values()):
+            task.cancel()
         if self.redis_client:
             await self.redis_client.close()
 
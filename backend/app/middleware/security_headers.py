@@ -3,21 +3,20 @@ Security Headers Middleware
 Adds security headers to all responses to protect against common attacks.
 SonarQube: S5122 - HTTP security headers
 """
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to every response.
     Recommended by OWASP.
     """
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         # Build connect-src from configured ALLOWED_ORIGINS so we never hardcode
         # localhost in production (SEC-05).
         allowed = settings.ALLOWED_ORIGINS if isinstance(settings.ALLOWED_ORIGINS, list) else [settings.ALLOWED_ORIGINS]
@@ -30,41 +29,45 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             f"'self' {connect_origins} "
             "https://*.googleapis.com https://api.razorpay.com"
         )
+        # The headers never change per request, so build them once.
+        self._headers = {
+            # Prevent MIME-sniffing
+            "X-Content-Type-Options": "nosniff",
+            # Prevent clickjacking (allow from same origin if needed, but DENY is safer)
+            # We might need to change this if we embed in iframes, but for now DENY is best.
+            "X-Frame-Options": "DENY",
+            # Enable XSS filtering in browsers that support it
+            "X-XSS-Protection": "1; mode=block",
+            # Force HTTPS (HSTS) - 1 year
+            # Only effective if served over HTTPS, but good to have
+            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+            # Control referrer information
+            "Referrer-Policy": "strict-origin-when-cross-origin",
+            # Content Security Policy (CSP) — SonarQube: S5122
+            # connect-src is built from settings.ALLOWED_ORIGINS (no hardcoded localhost).
+            # 'unsafe-inline' kept for style compatibility;
+            # migrate to nonce-based CSP when frontend supports it.
+            "Content-Security-Policy": (
+                "default-src 'self'; "
+                "img-src 'self' data: https:; "
+                "script-src 'self' https://apis.google.com https://checkout.razorpay.com; "
+                "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
+                "font-src 'self' data: https://fonts.gstatic.com; "
+                f"connect-src {self._csp_connect_src}; "
+                "frame-src 'self' https://api.razorpay.com;"
+            ),
+        }
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Prevent MIME-sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self._headers.items():
+                    headers[name] = value
+            await send(message)
 
-        # Prevent clickjacking (allow from same origin if needed, but DENY is safer)
-        # We might need to change this if we embed in iframes, but for now DENY is best.
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Enable XSS filtering in browsers that support it
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Force HTTPS (HSTS) - 1 year
-        # Only effective if served over HTTPS, but good to have
-        response.headers[
-            "Strict-Transport-Security"
-        ] = "max-age=31536000; includeSubDomains"
-
-        # Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Content Security Policy (CSP) — SonarQube: S5122
-        # connect-src is built from settings.ALLOWED_ORIGINS (no hardcoded localhost).
-        # 'unsafe-inline' kept for style compatibility;
-        # migrate to nonce-based CSP when frontend supports it.
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "img-src 'self' data: https:; "
-            "script-src 'self' https://apis.google.com https://checkout.razorpay.com; "
-            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
-            "font-src 'self' data: https://fonts.gstatic.com; "
-            f"connect-src {self._csp_connect_src}; "
-            "frame-src 'self' https://api.razorpay.com;"
-        )
-
-        return response
+        await self.app(scope, receive, send_with_headers)
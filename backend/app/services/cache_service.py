@@ -4,14 +4,208 @@ Redis Caching Service
 import redis.asyncio as redis
 import json
 import asyncio
+import math
+import random
 import time
-from typing import Optional, Any, List, Callable, Awaitable
+import uuid
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Optional, Any, Dict, Iterable, List, Callable, Awaitable, Tuple
 from app.core.config import settings
 from app.core.interfaces import ICacheService
+from app.utils import cache_codec
+from redis.exceptions import NoScriptError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Every instance listens here and drops the named keys / patterns from its L1.
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Resubscribe backoff (seconds) after the invalidation listener loses Redis.
+_INVALIDATION_RETRY_MIN = 0.5
+_INVALIDATION_RETRY_MAX = 30.0
+
+# Tag "acharya:42" → Redis sorted set cache:ztag:acharya:42 of the keys cached
+# under it, scored by their expiry (ms).  Each tagged write drops expired
+# members and, past CACHE_TAG_MAX_MEMBERS, deletes the soonest-expiring keys
+# along with their members, so a tag set never outgrows its live keys.  Tags
+# shared by every entry of a kind belong in a generation instead (see
+# :meth:`CacheService.generation`).
+TAG_KEY_PREFIX = "cache:ztag:"
+# KEYS[1] = cache key, KEYS[2..] = tag sets; ARGV = value, ttl, now_ms, max_members
+_SET_WITH_TAGS_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cap = tonumber(ARGV[4])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+for i = 2, #KEYS do
+    redis.call('ZADD', KEYS[i], now + ttl * 1000, KEYS[1])
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+    local excess = redis.call('ZCARD', KEYS[i]) - cap
+    if excess > 0 then
+        local oldest = redis.call('ZRANGE', KEYS[i], 0, excess - 1)
+        redis.call('UNLINK', unpack(oldest))
+        redis.call('ZREMRANGEBYRANK', KEYS[i], 0, excess - 1)
+    end
+    if redis.call('TTL', KEYS[i]) < ttl then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return 1
+"""
+# KEYS = tag sets; ARGV[1] = now_ms.  Deletes the live members and the sets;
+# returns the members deleted.
+_INVALIDATE_TAGS_SCRIPT = """
+local removed = {}
+for i = 1, #KEYS do
+    local members = redis.call('ZRANGEBYSCORE', KEYS[i], ARGV[1], '+inf')
+    for j = 1, #members, 500 do
+        redis.call('UNLINK', unpack(members, j, math.min(j + 499, #members)))
+    end
+    for _, member in ipairs(members) do
+        removed[#removed + 1] = member
+    end
+    redis.call('DEL', KEYS[i])
+end
+return removed
+"""
+# Generation counters: cache:gen:search:acharyas holds an integer that callers
+# fold into their keys; INCR retires every key built from the old value.
+GENERATION_KEY_PREFIX = "cache:gen:"
+# Loaded once per connection (SCRIPT LOAD) and run by SHA.
+_SCRIPTS = {"set_with_tags": _SET_WITH_TAGS_SCRIPT, "invalidate_tags": _INVALIDATE_TAGS_SCRIPT}
+
+try:
+    from prometheus_client import Counter
+
+    CACHE_L1_EVENTS = Counter(
+        "savitara_cache_l1_events_total",
+        "In-process L1 cache lookups and removals",
+        ["event"],  # hit | miss | eviction | expiration | invalidation
+    )
+    _METRICS_ENABLED = True
+except ImportError:
+    _METRICS_ENABLED = False
+
+_MISSING = object()
+
+# get_or_compute stores {"_swr": 1, "v": value, "soft": ..., "delta": ...}.
+_ENVELOPE_MARKER = "_swr"
+
+
+class L1Cache:
+    """Sharded LRU with per-entry TTL, bounded by entry count and bytes.
+
+    Each shard owns ``1/shards`` of both budgets, so eviction only walks one
+    small ``OrderedDict``.  Entry size is the length of the encoded value.
+    Single event loop — no locking.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, shards: int = 16) -> None:
+        shards = max(1, shards)
+        # key → (expires_at, size, value), least recently used first
+        self._shards: List["OrderedDict[str, Tuple[float, int, Any]]"] = [
+            OrderedDict() for _ in range(shards)
+        ]
+        self._shard_bytes = [0] * shards
+        self._max_entries = max(1, max_entries // shards)
+        self._max_bytes = max(1, max_bytes // shards)
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _index(self, key: str) -> int:
+        return hash(key) % len(self._shards)
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or ``_MISSING``."""
+        idx = self._index(key)
+        shard = self._shards[idx]
+        entry = shard.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            self._remove(idx, key)
+            self._record("expiration")
+            entry = None
+        if entry is None:
+            self._record("miss")
+            return _MISSING
+        shard.move_to_end(key)
+        self._record("hit")
+        return entry[2]
+
+    def set(self, key: str, value: Any, ttl: float, size: int) -> bool:
+        """Store *value*; entries larger than a shard's byte budget are not admitted."""
+        idx = self._index(key)
+        self._remove(idx, key)
+        if size > self._max_bytes:
+            return False
+        shard = self._shards[idx]
+        shard[key] = (time.monotonic() + ttl, size, value)
+        self._shard_bytes[idx] += size
+        while len(shard) > self._max_entries or self._shard_bytes[idx] > self._max_bytes:
+            _, (_, evicted_size, _) = shard.popitem(last=False)
+            self._shard_bytes[idx] -= evicted_size
+            self._record("eviction")
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._remove(self._index(key), key)
+
+    def delete_matching(self, pattern: str) -> int:
+        """Drop every key matching a Redis-style glob pattern."""
+        removed = 0
+        for idx, shard in enumerate(self._shards):
+            for key in [k for k in shard if fnmatchcase(k, pattern)]:
+                removed += self._remove(idx, key)
+        return removed
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        now = time.monotonic()
+        removed = 0
+        for idx, shard in enumerate(self._shards):
+            for key in [k for k, entry in shard.items() if entry[0] < now]:
+                removed += self._remove(idx, key)
+        self.expirations += removed
+        if _METRICS_ENABLED and removed:
+            CACHE_L1_EVENTS.labels(event="expiration").inc(removed)
+        return removed
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+        self._shard_bytes = [0] * len(self._shards)
+
+    def _remove(self, idx: int, key: str) -> bool:
+        entry = self._shards[idx].pop(key, None)
+        if entry is None:
+            return False
+        self._shard_bytes[idx] -= entry[1]
+        return True
+
+    def _record(self, event: str) -> None:
+        if event == "hit":
+            self.hits += 1
+        elif event == "miss":
+            self.misses += 1
+        elif event == "eviction":
+            self.evictions += 1
+        elif event == "expiration":
+            self.expirations += 1
+        if _METRICS_ENABLED:
+            CACHE_L1_EVENTS.labels(event=event).inc()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self),
+            "bytes": sum(self._shard_bytes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
 
 class CacheService(ICacheService):
     """
@@ -25,26 +219,124 @@ class CacheService(ICacheService):
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
         self.default_ttl = settings.CACHE_TTL
-        self.l1_cache: dict = {}  # {key: (value, timestamp)}
+        self.codec = cache_codec.get_codec(settings.CACHE_CODEC, settings.CACHE_COMPRESS_MIN_BYTES)
+        self.l1_cache = L1Cache(
+            settings.CACHE_L1_MAX_ENTRIES,
+            settings.CACHE_L1_MAX_BYTES,
+            settings.CACHE_L1_SHARDS,
+        )
+        # Tags our own invalidation messages so the listener can skip them.
+        self._instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._script_shas: Dict[str, str] = {}
+        self._background_tasks: List[asyncio.Task] = []
+        # get_or_compute: misses being computed, and stale keys being refreshed
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
 
     async def connect(self):
         """Initialize Redis connection"""
         try:
             self.redis = await redis.from_url(
-                settings.REDIS_URL, encoding="utf-8", decode_responses=True
+                settings.REDIS_URL, decode_responses=False  # values are binary (cache_codec)
             )
             await self.redis.ping()
+            await self._load_scripts()
             logger.info("Redis connection established")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             self.redis = None
+        self._start_background_tasks()
+
+    async def _load_scripts(self) -> None:
+        """SCRIPT LOAD the Lua helpers so each call sends only the SHA."""
+        self._script_shas = {
+            name: await self.redis.script_load(source) for name, source in _SCRIPTS.items()
+        }
+
+    def _eval_script(self, target: Any, name: str, numkeys: int, *args: Any) -> Any:
+        """EVALSHA *name* on a client or pipeline; EVAL if the scripts are not loaded."""
+        sha = self._script_shas.get(name)
+        if sha:
+            return target.evalsha(sha, numkeys, *args)
+        return target.eval(_SCRIPTS[name], numkeys, *args)
 
     async def disconnect(self):
         """Close Redis connection"""
+        for task in self._background_tasks:
+            task.cancel()
+        self._background_tasks = []
+        await self._close_pubsub()
         if self.redis:
             await self.redis.close()
             logger.info("Redis connection closed")
 
+    def _start_background_tasks(self) -> None:
+        if self._background_tasks:
+            return
+        self._background_tasks.append(asyncio.create_task(self._sweep_l1()))
+        if self.redis:
+            self._background_tasks.append(asyncio.create_task(self._listen_for_invalidations()))
+
+    async def _sweep_l1(self) -> None:
+        """Expire L1 entries that are never read again."""
+        while True:
+            await asyncio.sleep(settings.CACHE_L1_SWEEP_INTERVAL)
+            removed = self.l1_cache.sweep()
+            if removed:
+                logger.debug(f"L1 sweep removed {removed} expired entries")
+
+    async def _listen_for_invalidations(self) -> None:
+        """Apply other pods' invalidations, resubscribing with backoff on errors."""
+        backoff = _INVALIDATION_RETRY_MIN
+        while True:
+            try:
+                self._pubsub = self.redis.pubsub()
+                await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything published while we were unsubscribed was missed.
+                self.l1_cache.clear()
+                backoff = _INVALIDATION_RETRY_MIN
+                async for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription lost, retrying: {e}")
+            await self._close_pubsub()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, _INVALIDATION_RETRY_MAX)
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.close()
+        except Exception as e:
+            logger.debug(f"Closing cache invalidation subscription failed: {e}")
+        self._pubsub = None
+
+    def _apply_invalidation(self, raw: Any) -> None:
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation: {raw!r}")
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        if "keys" in message:
+            for key in message["keys"]:
+                self.l1_cache.delete(key)
+        elif "pattern" in message:
+            self.l1_cache.delete_matching(message["pattern"])
+        elif message.get("all"):
+            self.l1_cache.clear()
+        if _METRICS_ENABLED:
+            CACHE_L1_EVENTS.labels(event="invalidation").inc()
+
+    def _invalidation(self, **fields) -> str:
+        return json.dumps({"origin": self._instance_id, **fields})
+
     async def get_or_compute(
         self,
         key: str,
@@ -52,105 +344,255 @@ class CacheService(ICacheService):
         expire: Optional[int] = None,
         use_l1_cache: bool = False,
         l1_expire: int = 5,
+        tags: Optional[Iterable[str]] = None,
+        stale_ttl: Optional[int] = None,
     ) -> Any:
         """
         Get from cache or compute safely (Thundering Herd Protection).
-        Includes L1 RAM cache support for Hot Keys.
+
+        The value is fresh for *expire* seconds and then served stale for up
+        to *stale_ttl* more while one background refresh runs.  Hot keys are
+        refreshed early with probability rising towards expiry (XFetch), so
+        they rarely go stale at all.  Concurrent misses on this instance share
+        one computation; across instances a Redis lock elects the computer.
+        Includes L1 RAM cache support for Hot Keys.  A computed value is
+        registered under *tags* (see :meth:`invalidate_tags`).
         """
         if expire is None:
             expire = self.default_ttl
+        if stale_ttl is None:
+            stale_ttl = settings.CACHE_STALE_TTL
+        l1_ttl = l1_expire if use_l1_cache else None
+        refresh = (compute_func, expire, stale_ttl, l1_ttl, tags)
 
         # 1. Check L1 Cache (Hot Key Protection)
-        if use_l1_cache and key in self.l1_cache:
-            value, timestamp = self.l1_cache[key]
-            if time.time() - timestamp < l1_expire:
+        if use_l1_cache:
+            value = self.l1_cache.get(key)
+            if value is not _MISSING:
                 return value
-            del self.l1_cache[key]
 
-        # 2. Check Redis Cache
-        value = await self.get(key)
-        if value is not None:
-            if use_l1_cache:
-                self.l1_cache[key] = (value, time.time())
+        # 2. Check Redis Cache; refresh in the background when stale or due
+        raw = await self._get_raw(key)
+        payload = self._decode(key, raw)
+        if payload is not _MISSING:
+            value, soft_expiry, delta = self._unwrap(payload)
+            if soft_expiry is not None and self._refresh_due(soft_expiry, delta):
+                self._schedule_refresh(key, refresh)
+            elif l1_ttl is not None:
+                self.l1_cache.set(key, value, l1_ttl, len(raw))
             return value
 
-        # 3. Compute with Locking (Thundering Herd Protection)
-        return await self._compute_with_lock(key, compute_func, expire, use_l1_cache)
-
-    async def _compute_with_lock(self, key, compute_func, expire, use_l1_cache):
+        # 3. Compute once per instance, with Locking (Thundering Herd Protection)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._compute_with_lock(key, *refresh))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda fut: self._forget_inflight(key, fut))
+        return await asyncio.shield(inflight)
+
+    def _forget_inflight(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # retrieved by waiters; silence "never retrieved"
+
+    @staticmethod
+    def _unwrap(payload: Any) -> Tuple[Any, Optional[float], float]:
+        """Split a get_or_compute envelope into (value, soft expiry, compute time)."""
+        if isinstance(payload, dict) and payload.get(_ENVELOPE_MARKER) == 1:
+            return payload.get("v"), payload.get("soft"), payload.get("delta", 0.0)
+        return payload, None, 0.0
+
+    @staticmethod
+    def _refresh_due(soft_expiry: float, delta: float) -> bool:
+        """XFetch: recompute early with probability growing as expiry nears.
+
+        ``delta`` is how long the last computation took; slower values start
+        refreshing earlier.  Past the soft expiry this is always true.
+        """
+        jitter = delta * settings.CACHE_XFETCH_BETA * -math.log(1.0 - random.random())
+        return time.time() + jitter >= soft_expiry
+
+    def _schedule_refresh(self, key: str, refresh: tuple) -> None:
+        if key in self._refreshing or key in self._inflight:
+            return
+        task = asyncio.create_task(self._refresh(key, *refresh))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key, compute_func, expire, stale_ttl, l1_ttl, tags) -> None:
+        """Background recompute; skipped if another instance holds the lock."""
         lock_key = f"lock:{key}"
+        try:
+            if not await self.redis.set(lock_key, "1", nx=True, ex=settings.CACHE_LOCK_TTL):
+                return
+            try:
+                await self._compute_and_store(key, compute_func, expire, stale_ttl, l1_ttl, tags)
+            finally:
+                await self.redis.delete(lock_key)
+        except Exception as e:
+            logger.error(f"Background refresh failed for {key}; serving stale value: {e}")
+
+    async def _compute_and_store(self, key, compute_func, expire, stale_ttl, l1_ttl, tags):
+        started = time.monotonic()
+        result = await compute_func()
+        envelope = {
+            _ENVELOPE_MARKER: 1,
+            "v": result,
+            "soft": time.time() + expire,
+            "delta": round(time.monotonic() - started, 4),
+        }
+        try:
+            serialized = self.codec.encode(envelope)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Computed value for {key} is not cacheable: {e}")
+            return result
+        await self._set_raw(key, serialized, expire + stale_ttl, tags)
+        if l1_ttl is not None:
+            self.l1_cache.set(key, result, l1_ttl, len(serialized))
+        return result
+
+    async def _compute_with_lock(self, key, compute_func, expire, stale_ttl, l1_ttl, tags=None):
         if not self.redis:
             return await compute_func()
 
+        lock_key = f"lock:{key}"
         try:
             # Try to acquire lock
             acquired = await self.redis.set(
-                lock_key, "1", nx=True, ex=10
-            )  # 10s lock timeout
-
-            if acquired:
-                try:
-                    result = await compute_func()
-                    await self.set(key, result, expire)
-                    if use_l1_cache:
-                        self.l1_cache[key] = (result, time.time())
-                    return result
-                finally:
-                    await self.redis.delete(lock_key)
-            else:
-                # Lock busy, wait and retry
-                for _ in range(20):  # Try for 2 seconds (20 * 0.1s)
-                    await asyncio.sleep(0.1)
-                    value = await self.get(key)
-                    if value is not None:
-                        if use_l1_cache:
-                            self.l1_cache[key] = (value, time.time())
-                        return value
-
-                # If still no value, fallback to compute
-                return await compute_func()
+                lock_key, "1", nx=True, ex=settings.CACHE_LOCK_TTL
+            )
         except Exception as e:
             logger.error(f"Error in get_or_compute: {e}")
             return await compute_func()
 
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        if acquired:
+            try:
+                return await self._compute_and_store(
+                    key, compute_func, expire, stale_ttl, l1_ttl, tags
+                )
+            finally:
+                try:
+                    await self.redis.delete(lock_key)
+                except Exception as e:
+                    logger.error(f"Failed to release cache lock {lock_key}: {e}")
+
+        # Another instance is computing: wait for its value, then give up
+        for _ in range(20):  # Try for 2 seconds (20 * 0.1s)
+            await asyncio.sleep(0.1)
+            raw = await self._get_raw(key)
+            payload = self._decode(key, raw)
+            if payload is not _MISSING:
+                value = self._unwrap(payload)[0]
+                if l1_ttl is not None:
+                    self.l1_cache.set(key, value, l1_ttl, len(raw))
+                return value
+
+        # If still no value, fallback to compute
+        return await compute_func()
+
+    async def _get_raw(self, key: str) -> Optional[bytes]:
         if not self.redis:
             return None
 
         try:
-            value = await self.redis.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            return await self.redis.get(key) or None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
             return None
 
-    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
-        """Set value in cache"""
+    @staticmethod
+    def _decode(key: str, raw: Optional[bytes]) -> Any:
+        """Decode a stored value, or ``_MISSING`` if absent or unreadable."""
+        if raw is None:
+            return _MISSING
+        try:
+            return cache_codec.decode(raw)
+        except Exception as e:
+            logger.error(f"Cache decode error for key {key}: {e}")
+            return _MISSING
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        payload = self._decode(key, await self._get_raw(key))
+        if payload is _MISSING:
+            return None
+        return self._unwrap(payload)[0]
+
+    async def _set_raw(
+        self, key: str, serialized: bytes, expire: int, tags: Optional[Iterable[str]] = None
+    ) -> bool:
+        """SET (and tag) plus an L1 invalidation for other instances, in one round-trip."""
+        self.l1_cache.delete(key)
         if not self.redis:
             return False
 
+        tag_keys = [self.tag_key(tag) for tag in tags or ()]
         try:
-            serialized = json.dumps(value, default=str)
-            if expire is None:
-                expire = self.default_ttl
-
-            await self.redis.set(key, serialized, ex=expire)
+            try:
+                await self._pipeline_set(key, serialized, expire, tag_keys)
+            except NoScriptError:
+                # Redis restarted or failed over and lost the script cache.
+                await self._load_scripts()
+                await self._pipeline_set(key, serialized, expire, tag_keys)
             logger.debug(f"Cached key {key} with TTL {expire}s")
             return True
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
 
+    async def _pipeline_set(
+        self, key: str, serialized: bytes, expire: int, tag_keys: List[str]
+    ) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if tag_keys:
+                self._eval_script(
+                    pipe,
+                    "set_with_tags",
+                    1 + len(tag_keys),
+                    key,
+                    *tag_keys,
+                    serialized,
+                    expire,
+                    int(time.time() * 1000),
+                    settings.CACHE_TAG_MAX_MEMBERS,
+                )
+            else:
+                pipe.set(key, serialized, ex=expire)
+            pipe.publish(INVALIDATION_CHANNEL, self._invalidation(keys=[key]))
+            await pipe.execute()
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        expire: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """Set value in cache, optionally registered under *tags*"""
+        if not self.redis:
+            return False
+
+        try:
+            serialized = self.codec.encode(value)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Cache set error for key {key}: {e}")
+            return False
+        if expire is None:
+            expire = self.default_ttl
+        return await self._set_raw(key, serialized, expire, tags)
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
+        self.l1_cache.delete(key)
         if not self.redis:
             return False
 
         try:
-            await self.redis.delete(key)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(key)
+                pipe.publish(INVALIDATION_CHANNEL, self._invalidation(keys=[key]))
+                await pipe.execute()
             logger.debug(f"Deleted cache key {key}")
             return True
         except Exception as e:
@@ -161,8 +603,86 @@ class CacheService(ICacheService):
         """Delete all keys matching pattern (satisfies ICacheService interface)."""
         return await self.delete_pattern(pattern)
 
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key cached under any of *tags*; returns how many.
+
+        Cost scales with the tagged keys, not with the keyspace.
+        """
+        if not tags:
+            return 0
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        if not self.redis:
+            return 0
+
+        now_ms = int(time.time() * 1000)
+        try:
+            try:
+                members = await self._eval_script(
+                    self.redis, "invalidate_tags", len(tag_keys), *tag_keys, now_ms
+                )
+            except NoScriptError:
+                await self._load_scripts()
+                members = await self._eval_script(
+                    self.redis, "invalidate_tags", len(tag_keys), *tag_keys, now_ms
+                )
+            removed = [key.decode() if isinstance(key, bytes) else key for key in members]
+            for key in removed:
+                self.l1_cache.delete(key)
+            if removed:
+                await self.redis.publish(INVALIDATION_CHANNEL, self._invalidation(keys=removed))
+            logger.debug(f"Invalidated {len(removed)} keys tagged {', '.join(tags)}")
+            return len(removed)
+        except Exception as e:
+            logger.error(f"Cache tag invalidation error for {tags}: {e}")
+            return 0
+
+    async def generation(self, name: str) -> int:
+        """Current value of the *name* generation counter (0 if never bumped).
+
+        Read through L1; :meth:`bump_generation` broadcasts an invalidation so
+        every instance picks up the new value on its next read.
+        """
+        key = f"{GENERATION_KEY_PREFIX}{name}"
+        cached = self.l1_cache.get(key)
+        if cached is not _MISSING:
+            return cached
+        if not self.redis:
+            return 0
+        try:
+            value = int(await self.redis.get(key) or 0)
+        except Exception as e:
+            logger.error(f"Cache generation read error for {name}: {e}")
+            return 0
+        self.l1_cache.set(key, value, settings.CACHE_GENERATION_L1_TTL, 8)
+        return value
+
+    async def bump_generation(self, name: str) -> int:
+        """Advance the *name* generation, orphaning every key built from the old one.
+
+        The orphaned entries are never looked up again and expire on their own
+        TTL, so this is O(1) however many keys used the old generation.
+        """
+        key = f"{GENERATION_KEY_PREFIX}{name}"
+        self.l1_cache.delete(key)
+        if not self.redis:
+            return 0
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.incr(key)
+                pipe.publish(INVALIDATION_CHANNEL, self._invalidation(keys=[key]))
+                value, _ = await pipe.execute()
+            return int(value)
+        except Exception as e:
+            logger.error(f"Cache generation bump error for {name}: {e}")
+            return 0
+
     async def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern"""
+        """Delete all keys matching pattern.
+
+        SCANs the whole keyspace; prefer tags (:meth:`invalidate_tags`) for
+        anything on a request path.
+        """
+        self.l1_cache.delete_matching(pattern)
         if not self.redis:
             return 0
 
@@ -171,6 +691,7 @@ class CacheService(ICacheService):
             async for key in self.redis.scan_iter(match=pattern):
                 keys.append(key)
 
+            await self.redis.publish(INVALIDATION_CHANNEL, self._invalidation(pattern=pattern))
             if keys:
                 deleted = await self.redis.delete(*keys)
                 logger.info(f"Deleted {deleted} keys matching pattern {pattern}")
@@ -208,30 +729,41 @@ class CacheService(ICacheService):
             return 0
 
     async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
-        """Get multiple values"""
-        if not self.redis:
+        """Get multiple values in one MGET (None for misses)"""
+        if not self.redis or not keys:
             return [None] * len(keys)
 
         try:
             values = await self.redis.mget(keys)
-            return [json.loads(v) if v else None for v in values]
         except Exception as e:
             logger.error(f"Cache get_many error: {e}")
             return [None] * len(keys)
+        results: List[Optional[Any]] = []
+        for key, raw in zip(keys, values, strict=True):
+            payload = self._decode(key, raw)
+            results.append(None if payload is _MISSING else self._unwrap(payload)[0])
+        return results
 
     async def set_many(self, mapping: dict, expire: Optional[int] = None) -> bool:
-        """Set multiple values"""
-        if not self.redis:
+        """Set multiple values in one pipelined round-trip"""
+        if not self.redis or not mapping:
             return False
 
         try:
-            serialized = {k: json.dumps(v, default=str) for k, v in mapping.items()}
-            await self.redis.mset(serialized)
-
-            if expire:
-                for key in mapping.keys():
-                    await self.redis.expire(key, expire)
-
+            serialized = {k: self.codec.encode(v) for k, v in mapping.items()}
+        except (TypeError, ValueError) as e:
+            logger.error(f"Cache set_many error: {e}")
+            return False
+        if expire is None:
+            expire = self.default_ttl
+        for key in serialized:
+            self.l1_cache.delete(key)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in serialized.items():
+                    pipe.set(key, value, ex=expire)
+                pipe.publish(INVALIDATION_CHANNEL, self._invalidation(keys=list(serialized)))
+                await pipe.execute()
             logger.debug(f"Cached {len(mapping)} keys")
             return True
         except Exception as e:
@@ -240,11 +772,13 @@ class CacheService(ICacheService):
 
     async def clear_all(self) -> bool:
         """Clear all cache (use with caution)"""
+        self.l1_cache.clear()
         if not self.redis:
             return False
 
         try:
             await self.redis.flushdb()
+            await self.redis.publish(INVALIDATION_CHANNEL, self._invalidation(all=True))
             logger.warning("Cleared all cache")
             return True
         except Exception as e:
@@ -253,6 +787,11 @@ class CacheService(ICacheService):
 
     # Helper methods for common caching patterns
 
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        """Redis set holding the keys cached under *tag*"""
+        return f"{TAG_KEY_PREFIX}{tag}"
+
     def user_cache_key(self, user_id: str) -> str:
         """Generate cache key for user"""
         return f"user:{user_id}"
@@ -280,9 +819,10 @@ class CacheService(ICacheService):
         return await self.get(self.user_cache_key(user_id))
 
     async def invalidate_user(self, user_id: str):
-        """Invalidate user cache"""
-        await self.delete(self.user_cache_key(user_id))
-        await self.delete_pattern(f"user:{user_id}:*")
+        """Invalidate user cache and every entry tagged with the user key"""
+        key = self.user_cache_key(user_id)
+        await self.delete(key)
+        await self.invalidate_tags(key)
 
 
 # Global cache instance
@@ -1,12 +1,27 @@
-"""Global emergency kill switches and incident controls (A23/A24)."""
+"""Global emergency kill switches and incident controls (A23/A24).
+
+Every pod keeps the controls in memory so middleware can read them without a
+database round-trip.  ``set_controls`` publishes on ``KILL_SWITCH_CHANNEL``
+and each pod reloads its snapshot on that notification; the snapshot is also
+re-read every ``KILL_SWITCH_POLL_INTERVAL`` seconds in case a notification is
+missed or Redis is unavailable.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
+KILL_SWITCH_CHANNEL = "kill_switch:changed"
 
 DEFAULT_CONTROLS: Dict[str, Any] = {
     "payments_enabled": True,
@@ -18,9 +33,17 @@ DEFAULT_CONTROLS: Dict[str, Any] = {
 
 
 class KillSwitchService:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, redis_client: Optional[Redis] = None):
         self.db = db
         self.collection = db.global_controls
+        self.redis_client = redis_client
+        # Replaced wholesale on refresh, never mutated in place.
+        self._snapshot: Dict[str, Any] = DEFAULT_CONTROLS
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def current_controls(self) -> Dict[str, Any]:
+        """In-memory controls for the request path (read-only, no I/O)."""
+        return self._snapshot
 
     async def get_controls(self) -> Dict[str, Any]:
         doc = await self.collection.find_one({"_id": "global"})
@@ -44,4 +67,56 @@ class KillSwitchService:
             },
             upsert=True,
         )
+        self._snapshot = current
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.publish(KILL_SWITCH_CHANNEL, actor_id)
+            except Exception as e:
+                logger.warning(f"Kill switch change notification failed: {e}")
         return current
+
+    async def refresh(self) -> None:
+        """Reload the snapshot; keeps the previous one if MongoDB is unreachable."""
+        try:
+            self._snapshot = await self.get_controls()
+        except Exception as e:
+            logger.error(f"Kill switch refresh failed: {e}")
+
+    async def start(self) -> None:
+        """Load the snapshot and keep it current in the background."""
+        await self.refresh()
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch(self) -> None:
+        interval = settings.KILL_SWITCH_POLL_INTERVAL
+        while True:
+            if self.redis_client is not None:
+                try:
+                    await self._listen(interval)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Kill switch subscription lost, polling: {e}")
+            await asyncio.sleep(interval)
+            await self.refresh()
+
+    async def _listen(self, interval: float) -> None:
+        """Refresh on every change notification, and at least every ``interval`` s."""
+        pubsub = self.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(KILL_SWITCH_CHANNEL)
+            while True:
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=interval)
+                await self.refresh()
+        finally:
+            await pubsub.close()
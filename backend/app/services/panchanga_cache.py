@@ -0,0 +1,180 @@
+"""
+Two-level, geo-quantized Panchanga cache.
+
+A daily Panchanga splits into two halves with very different cardinalities:
+
+* date elements (Tithi, Nakshatra, Yoga, Karana, month, eras, festivals) are
+  the same for every observer — keyed by ``(date, panchanga_type)``;
+* location elements (sunrise/sunset and everything derived from them, plus
+  local end times) are keyed by ``(date, geohash cell, IANA timezone)`` and
+  computed at the cell centre, so every request inside a cell shares one
+  entry.
+
+Each half is looked up in a bounded in-process LRU, then Redis, and only then
+computed in the Panchanga process pool.
+"""
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.cache_service import cache
+from app.services.panchanga_executor import panchanga_executor
+from app.services.panchanga_service import PanchangaService, panchanga_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_KEY_VERSION = "v1"
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+_ALLOWED_TYPES = {"lunar", "solar"}
+
+
+def geohash_cell(latitude: float, longitude: float, precision: int) -> Tuple[str, float, float]:
+    """Return ``(geohash, centre_lat, centre_lon)`` of the cell containing the point."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars), (lat_lo + lat_hi) / 2, (lon_lo + lon_hi) / 2
+
+
+class _LocalLRU:
+    """Bounded LRU with per-entry expiry (single event loop — no locking)."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PanchangaCache:
+    """Serves daily Panchanga from date-only and geohash-bucketed cache entries."""
+
+    def __init__(
+        self,
+        *,
+        precision: int,
+        local_size: int,
+        local_ttl_seconds: float,
+        redis_ttl_seconds: int,
+    ) -> None:
+        self.precision = precision
+        self._redis_ttl = redis_ttl_seconds
+        self._local = _LocalLRU(local_size, local_ttl_seconds)
+        self.stats: Dict[str, int] = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    def date_key(self, date_obj: date, panchanga_type: str) -> str:
+        return f"panchanga:{_KEY_VERSION}:date:{date_obj.isoformat()}:{panchanga_type}"
+
+    def location_key(self, date_obj: date, cell: str, tz_name: str) -> str:
+        return f"panchanga:{_KEY_VERSION}:geo:{date_obj.isoformat()}:{cell}:{tz_name}"
+
+    async def _lookup(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        value = self._local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+        value = await cache.get(key)
+        if value is not None:
+            self.stats["redis_hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            value = await compute()
+            await cache.set(key, value, expire=self._redis_ttl)
+        self._local.set(key, value)
+        return value
+
+    async def get_daily_panchanga(
+        self,
+        date_obj: date,
+        latitude: float,
+        longitude: float,
+        panchanga_type: str = "lunar",
+    ) -> Dict[str, Any]:
+        """Same result shape as ``PanchangaService.get_daily_panchanga``."""
+        if panchanga_type not in _ALLOWED_TYPES:
+            raise ValueError(
+                f"Invalid panchanga_type {panchanga_type!r}. "
+                f"Allowed values are: {sorted(_ALLOWED_TYPES)}"
+            )
+        tz_name = panchanga_service._resolve_timezone(latitude, longitude)
+        cell, cell_lat, cell_lon = geohash_cell(latitude, longitude, self.precision)
+
+        date_elements = await self._lookup(
+            self.date_key(date_obj, panchanga_type),
+            lambda: panchanga_executor.run("get_date_elements", date_obj, panchanga_type),
+        )
+        location_elements = await self._lookup(
+            self.location_key(date_obj, cell, tz_name),
+            lambda: panchanga_executor.run(
+                "get_location_elements", date_obj, cell_lat, cell_lon, tz_name
+            ),
+        )
+        return PanchangaService.assemble_daily_panchanga(
+            date_elements, location_elements, tz_name, latitude, longitude
+        )
+
+    def hit_rate(self) -> float:
+        total = sum(self.stats.values())
+        if not total:
+            return 0.0
+        return (self.stats["local_hits"] + self.stats["redis_hits"]) / total
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+panchanga_cache = PanchangaCache(
+    precision=settings.PANCHANGA_GEOHASH_PRECISION,
+    local_size=settings.PANCHANGA_LOCAL_CACHE_SIZE,
+    local_ttl_seconds=settings.PANCHANGA_LOCAL_CACHE_TTL,
+    redis_ttl_seconds=settings.PANCHANGA_CACHE_TTL,
+)
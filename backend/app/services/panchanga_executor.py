@@ -0,0 +1,157 @@
+"""
+Async facade over PanchangaService.
+
+Panchanga calculations are pure CPU work (ephem, TimezoneFinder, pytz) and
+would otherwise run directly on the event loop inside ``async def`` routes.
+This facade runs them in a ``ProcessPoolExecutor`` whose workers pre-warm the
+timezone grid, ephemeris cache and this year's transition tables, and
+coalesces identical in-flight calls so a burst of requests for the same
+(date, lat, lon, type) shares a single computation.
+
+Set ``PANCHANGA_EXECUTOR_WORKERS=0`` to use the default thread pool instead
+(useful where spawning processes is not allowed).
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.panchanga_service import panchanga_service
+from app.services.timezone_grid import timezone_resolver
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_DEFAULT_LAT = 28.6139  # Delhi
+_DEFAULT_LON = 77.2090
+
+
+def _warm_worker() -> None:
+    """Process-pool initializer: load heavy per-process state once."""
+    try:
+        timezone_resolver.warm_up()
+        panchanga_service.get_daily_panchanga(date.today(), _DEFAULT_LAT, _DEFAULT_LON)
+    except Exception as e:  # noqa: BLE001 - warm-up is best effort
+        logger.warning(f"Panchanga worker warm-up failed: {e}")
+
+
+def _invoke(method: str, args: Tuple[Any, ...]) -> Any:
+    """Run ``panchanga_service.<method>(*args)`` — module-level so it pickles."""
+    return getattr(panchanga_service, method)(*args)
+
+
+class PanchangaExecutor:
+    """Runs PanchangaService methods off the event loop with request coalescing."""
+
+    def __init__(self, max_workers: int) -> None:
+        self._max_workers = max_workers
+        self._executor: Optional[Executor] = None
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+
+    def start(self) -> None:
+        """Create the process pool (idempotent).  Workers warm up in the background."""
+        if self._executor is not None or self._max_workers <= 0:
+            return
+        # spawn, not fork: the parent holds Mongo/Redis client threads and sockets.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        logger.info(f"Panchanga process pool started with {self._max_workers} workers")
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, method: str, args: Tuple[Any, ...]) -> Any:
+        if self._max_workers <= 0:
+            return await asyncio.to_thread(_invoke, method, args)
+        self.start()
+        try:
+            return await asyncio.wrap_future(self._executor.submit(_invoke, method, args))
+        except BrokenProcessPool:
+            logger.error("Panchanga process pool broke; restarting it")
+            self.shutdown()
+            raise
+
+    async def run(self, method: str, *args: Any) -> Any:
+        """
+        Call ``panchanga_service.<method>(*args)`` in the pool.
+
+        Concurrent calls with identical arguments await the same future; one
+        caller being cancelled does not cancel the shared computation.
+        """
+        key = (method, *args)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._submit(method, args))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _f: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    # ------------------------------------------------------------------
+    # Typed wrappers for the methods the API uses
+    # ------------------------------------------------------------------
+
+    async def get_daily_panchanga(
+        self,
+        date_obj: date,
+        latitude: float = _DEFAULT_LAT,
+        longitude: float = _DEFAULT_LON,
+        panchanga_type: str = "lunar",
+    ) -> Dict[str, Any]:
+        return await self.run("get_daily_panchanga", date_obj, latitude, longitude, panchanga_type)
+
+    async def get_daily_panchanga_many(
+        self,
+        dates: Tuple[date, ...],
+        latitude: float,
+        longitude: float,
+        panchanga_type: str = "lunar",
+    ) -> List[Dict[str, Any]]:
+        return await self.run("get_daily_panchanga_many", tuple(dates), latitude, longitude, panchanga_type)
+
+    async def get_auspicious_muhurat(
+        self, date_obj: date, latitude: float, longitude: float
+    ) -> List[Dict[str, Any]]:
+        return await self.run("get_auspicious_muhurat", date_obj, latitude, longitude)
+
+    async def calculate_rahu_kalam(
+        self, date_obj: date, latitude: float, longitude: float
+    ) -> Dict[str, Any]:
+        return await self.run("calculate_rahu_kalam", date_obj, latitude, longitude)
+
+    async def calculate_tithi(
+        self, date_obj: date, latitude: float = _DEFAULT_LAT, longitude: float = _DEFAULT_LON
+    ) -> Dict[str, Any]:
+        return await self.run("calculate_tithi", date_obj, latitude, longitude)
+
+    async def calculate_nakshatra(
+        self, date_obj: date, latitude: float = _DEFAULT_LAT, longitude: float = _DEFAULT_LON
+    ) -> Dict[str, Any]:
+        return await self.run("calculate_nakshatra", date_obj, latitude, longitude)
+
+    async def is_auspicious_for(
+        self, date_obj: date, activity: str, latitude: float, longitude: float
+    ) -> Dict[str, Any]:
+        return await self.run("is_auspicious_for", date_obj, activity, latitude, longitude)
+
+    async def get_upcoming_festivals(self, count: int = 10) -> List[Dict[str, Any]]:
+        return await self.run("get_upcoming_festivals", count)
+
+    async def get_ekadashi_dates(self, year: int) -> List[Dict[str, Any]]:
+        return await self.run("get_ekadashi_dates", year)
+
+    async def get_month_calendar(
+        self, year: int, month: int, latitude: float, longitude: float, panchanga_type: str = "lunar"
+    ) -> List[Dict[str, Any]]:
+        return await self.run("get_month_calendar", year, month, latitude, longitude, panchanga_type)
+
+
+panchanga_executor = PanchangaExecutor(settings.PANCHANGA_EXECUTOR_WORKERS)
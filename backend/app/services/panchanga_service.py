@@ -4,11 +4,16 @@ Accurate astronomical calculations using the ephem library.
 Supports both Chandramana (Lunar) and Souramana (Solar) Panchanga types.
 Timezone-aware output via timezonefinder + pytz.
 """
+import calendar as cal_module
 import logging
 import math
-from datetime import date, datetime, timedelta
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import cached_property, lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 try:
     import ephem
     EPHEM_AVAILABLE = True
@@ -17,13 +22,15 @@ except ImportError:
 
 try:
     import pytz
-    from timezonefinder import TimezoneFinder
+    from timezonefinder import TimezoneFinder  # noqa: F401 - availability check; used via timezone_grid
     TZ_AVAILABLE = True
 except ImportError:
     TZ_AVAILABLE = False
 
 from app.core.config import get_settings
 from app.core.exceptions import ExternalServiceError
+from app.services.panchanga_transitions import transition_store
+from app.services.timezone_grid import timezone_resolver
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -378,129 +385,409 @@ _VARJYAM_OFFSET_H: Dict[int, float] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Ephemeris snapshot — one Sun/Moon evaluation per (date, location)
+# ---------------------------------------------------------------------------
+
+# Coordinates are rounded before keying the snapshot LRU (4 dp ≈ 11 m), far
+# below the resolution of any Panchanga element.
+_COORD_PRECISION = 4
+
+
+def _sun_moon_longitudes_at(
+    date_obj: date, latitude: float, longitude: float
+) -> Tuple[float, float]:
+    """
+    Return (sun_ecliptic_lon_deg, moon_ecliptic_lon_deg) at 06:00 UTC on the date.
+    Falls back to simplified values if ephem is unavailable.
+    """
+    if EPHEM_AVAILABLE:
+        obs = ephem.Observer()
+        obs.lat = str(latitude)
+        obs.lon = str(longitude)
+        obs.date = f"{date_obj.strftime('%Y/%m/%d')} 06:00:00"  # 06:00 UTC ≈ 11:30 IST
+        obs.pressure = 0  # disable atmospheric refraction for cleaner calcs
+        sun = ephem.Sun()
+        moon = ephem.Moon()
+        sun.compute(obs)
+        moon.compute(obs)
+        return math.degrees(ephem.Ecliptic(sun).lon), math.degrees(ephem.Ecliptic(moon).lon)
+
+    # Simplified fallback (accurate to ±1–2 degrees for sun, ±3 for moon)
+    # Reference: J2000.0 = 2000-01-01T12:00 TT
+    j2000 = date(2000, 1, 1)
+    n = (date_obj - j2000).days + 0.5
+
+    # Sun mean longitude
+    L0 = (280.46646 + 0.9856474 * n) % 360
+    M = math.radians((357.52911 + 0.9856003 * n) % 360)
+    sun_lon = (L0 + 1.914602 * math.sin(M) + 0.019993 * math.sin(2 * M)) % 360
+
+    # Moon mean longitude (very simplified)
+    lm = (218.316 + 13.176396 * n) % 360
+    mm = math.radians((134.963 + 13.064993 * n) % 360)
+    moon_lon = (lm + 6.289 * math.sin(mm)) % 360
+
+    return sun_lon, moon_lon
+
+
+def _horizon_observer(day: date, latitude: float, longitude: float) -> Any:
+    """Build an ephem Observer at 00:00 UTC of ``day`` for rise/set searches."""
+    obs = ephem.Observer()
+    obs.lat = str(latitude)
+    obs.lon = str(longitude)
+    obs.date = day.strftime(DATE_START_FMT)
+    obs.pressure = 0
+    obs.horizon = "-0:34"  # Standard sunrise/sunset definition
+    return obs
+
+
+def _ephem_to_utc(value: Any) -> datetime:
+    """Convert an ``ephem.Date`` to an aware UTC datetime."""
+    return value.datetime().replace(tzinfo=timezone.utc)
+
+
+class EphemerisSnapshot:
+    """
+    Sun/Moon state for one (date, location), shared by every Panchanga helper.
+
+    Ecliptic longitudes are evaluated once on construction.  Rise/set instants
+    are resolved lazily on first access, so Tithi-only callers (Ekadashi scans,
+    the Tithi endpoint) never pay for horizon-crossing searches.
+    """
+
+    def __init__(self, date_obj: date, latitude: float, longitude: float) -> None:
+        self.date_obj = date_obj
+        self.latitude = latitude
+        self.longitude = longitude
+        self.sun_lon, self.moon_lon = _sun_moon_longitudes_at(date_obj, latitude, longitude)
+
+    @cached_property
+    def sun_rise_set_utc(self) -> Optional[Tuple[datetime, datetime]]:
+        """(sunrise, sunset) in UTC, or None without ephem / during polar day or night."""
+        if not EPHEM_AVAILABLE:
+            return None
+        obs = _horizon_observer(self.date_obj, self.latitude, self.longitude)
+        sun = ephem.Sun()
+        try:
+            return _ephem_to_utc(obs.next_rising(sun)), _ephem_to_utc(obs.next_setting(sun))
+        except (ephem.AlwaysUpError, ephem.NeverUpError):
+            return None
+
+    @cached_property
+    def next_sunrise_utc(self) -> Optional[datetime]:
+        """Sunrise of the following calendar day in UTC, or None."""
+        if not EPHEM_AVAILABLE:
+            return None
+        obs = _horizon_observer(self.date_obj + timedelta(days=1), self.latitude, self.longitude)
+        try:
+            return _ephem_to_utc(obs.next_rising(ephem.Sun()))
+        except (ephem.AlwaysUpError, ephem.NeverUpError):
+            return None
+
+    @cached_property
+    def moon_rise_set_utc(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """(moonrise, moonset) in UTC; either side is None if it does not occur."""
+        if not EPHEM_AVAILABLE:
+            return None, None
+        obs = _horizon_observer(self.date_obj, self.latitude, self.longitude)
+        moon = ephem.Moon()
+        try:
+            rise: Optional[datetime] = _ephem_to_utc(obs.next_rising(moon))
+        except (ephem.AlwaysUpError, ephem.NeverUpError):
+            rise = None
+        try:
+            obs.date = self.date_obj.strftime(DATE_START_FMT)  # reset
+            moon_set: Optional[datetime] = _ephem_to_utc(obs.next_setting(moon))
+        except (ephem.AlwaysUpError, ephem.NeverUpError):
+            moon_set = None
+        return rise, moon_set
+
+
+@lru_cache(maxsize=settings.PANCHANGA_EPHEMERIS_CACHE_SIZE)
+def _cached_snapshot(date_obj: date, latitude: float, longitude: float) -> EphemerisSnapshot:
+    return EphemerisSnapshot(date_obj, latitude, longitude)
+
+
+def get_ephemeris_snapshot(date_obj: date, latitude: float, longitude: float) -> EphemerisSnapshot:
+    """Return the (LRU-cached) ephemeris snapshot for a date and location."""
+    return _cached_snapshot(
+        date_obj,
+        round(latitude, _COORD_PRECISION),
+        round(longitude, _COORD_PRECISION),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Vectorised range engine — Sun/Moon longitudes for many days as arrays
+# ---------------------------------------------------------------------------
+
+_NAK_SPAN = 360.0 / 27
+
+# Sampling cadence for the range engine.  The Sun is smooth enough that an
+# 8-day grid interpolates to ~1e-3°; the Moon needs a 2-day grid (~0.02° worst
+# case).  Any day whose interpolated value lies within _BOUNDARY_GUARD_DEG of
+# an element boundary is re-evaluated exactly, so element numbers always match
+# the single-day path.
+_SUN_STEP_DAYS = 8
+_MOON_STEP_DAYS = 2
+_BOUNDARY_GUARD_DEG = 0.1
+
+# (function of (sun, moon) in degrees, boundary spacing) for every element
+# derived from range longitudes: Tithi, Nakshatra, Yoga, lunar and solar month.
+_RANGE_BOUNDARIES = (
+    (lambda sun, moon: moon - sun, 12.0),
+    (lambda sun, moon: moon, _NAK_SPAN),
+    (lambda sun, moon: sun + moon, _NAK_SPAN),
+    (lambda sun, moon: moon, 30.0),
+    (lambda sun, moon: sun, 30.0),
+)
+
+
+def _sample_body(body: Any, obs: Any, base: float, days: np.ndarray) -> np.ndarray:
+    """Ecliptic longitude (degrees) of ``body`` at ``base + d`` for each ``d`` in ``days``."""
+    out = np.empty(days.shape[0])
+    for i, offset in enumerate(days):
+        obs.date = base + float(offset)
+        body.compute(obs)
+        out[i] = ephem.Ecliptic(body).lon
+    return np.degrees(out)
+
+
+def _interpolate_grid(samples: np.ndarray, step: int, days: int) -> np.ndarray:
+    """
+    4-point Lagrange interpolation of an angle series onto every day in ``[0, days)``.
+
+    ``samples[j]`` holds the value at day ``(j - 1) * step``; the series is
+    unwrapped first so 360°→0° crossings interpolate correctly.
+    """
+    unwrapped = np.unwrap(samples, period=360.0)
+    x = np.arange(days)
+    k = (x + step) // step
+    t = (x + step) / step - k
+    p0, p1, p2, p3 = unwrapped[k - 1], unwrapped[k], unwrapped[k + 1], unwrapped[k + 2]
+    value = (
+        -t * (t - 1) * (t - 2) / 6 * p0
+        + (t + 1) * (t - 1) * (t - 2) / 2 * p1
+        - (t + 1) * t * (t - 2) / 2 * p2
+        + (t + 1) * t * (t - 1) / 6 * p3
+    )
+    return value % 360
+
+
+def _sun_moon_longitude_arrays(
+    start: date, days: int, latitude: float, longitude: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (sun_lon, moon_lon) arrays at 06:00 UTC for ``days`` consecutive dates.
+
+    With ephem, the Sun and Moon are sampled on coarse grids and interpolated;
+    days close to an element boundary are then recomputed exactly.  Without
+    ephem, the simplified fallback is evaluated directly as array operations.
+    """
+    if not EPHEM_AVAILABLE:
+        n = (start - date(2000, 1, 1)).days + 0.5 + np.arange(days)
+        L0 = (280.46646 + 0.9856474 * n) % 360
+        M = np.radians((357.52911 + 0.9856003 * n) % 360)
+        sun_lon = (L0 + 1.914602 * np.sin(M) + 0.019993 * np.sin(2 * M)) % 360
+        lm = (218.316 + 13.176396 * n) % 360
+        mm = np.radians((134.963 + 13.064993 * n) % 360)
+        moon_lon = (lm + 6.289 * np.sin(mm)) % 360
+        return sun_lon, moon_lon
+
+    obs = ephem.Observer()
+    obs.lat = str(latitude)
+    obs.lon = str(longitude)
+    obs.pressure = 0
+    base = ephem.Date(f"{start.strftime('%Y/%m/%d')} 06:00:00")
+    sun = ephem.Sun()
+    moon = ephem.Moon()
+
+    def grid(step: int) -> np.ndarray:
+        return (np.arange((days - 1) // step + 4) - 1) * step
+
+    sun_lon = _interpolate_grid(_sample_body(sun, obs, base, grid(_SUN_STEP_DAYS)), _SUN_STEP_DAYS, days)
+    moon_lon = _interpolate_grid(_sample_body(moon, obs, base, grid(_MOON_STEP_DAYS)), _MOON_STEP_DAYS, days)
+
+    near = np.zeros(days, dtype=bool)
+    for combine, span in _RANGE_BOUNDARIES:
+        rem = combine(sun_lon, moon_lon) % span
+        near |= np.minimum(rem, span - rem) < _BOUNDARY_GUARD_DEG
+    exact_days = np.flatnonzero(near)
+    if exact_days.size:
+        sun_lon[exact_days] = _sample_body(sun, obs, base, exact_days)
+        moon_lon[exact_days] = _sample_body(moon, obs, base, exact_days)
+    return sun_lon, moon_lon
+
+
+@dataclass(frozen=True)
+class PanchangaRange:
+    """
+    Tithi / Nakshatra / Yoga / Karana numbers for consecutive dates as NumPy arrays.
+
+    Index ``i`` corresponds to ``start + i days``; numbering matches the
+    single-day ``calculate_*`` helpers (Tithi 1–30, Nakshatra/Yoga 1–27,
+    Karana 1–11).
+    """
+
+    start: date
+    sun_lon: np.ndarray
+    moon_lon: np.ndarray
+    tithi: np.ndarray
+    nakshatra: np.ndarray
+    yoga: np.ndarray
+    karana: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.tithi.shape[0])
+
+    def date_at(self, index: int) -> date:
+        return self.start + timedelta(days=int(index))
+
+    @classmethod
+    def from_longitudes(cls, start: date, sun_lon: np.ndarray, moon_lon: np.ndarray) -> "PanchangaRange":
+        tithi = np.minimum(((moon_lon - sun_lon) % 360 / 12).astype(np.int64) + 1, 30)
+        nakshatra = np.minimum((moon_lon / _NAK_SPAN).astype(np.int64) + 1, 27)
+        yoga = np.minimum(((sun_lon + moon_lon) % 360 / _NAK_SPAN).astype(np.int64) + 1, 27)
+        half_index = (tithi - 1) * 2  # first half of each Tithi, as in _compute_karana_number
+        karana = np.where(half_index >= 56, 8 + (half_index - 56), half_index % 7 + 1)
+        return cls(
+            start=start,
+            sun_lon=sun_lon,
+            moon_lon=moon_lon,
+            tithi=tithi,
+            nakshatra=nakshatra,
+            yoga=yoga,
+            karana=karana,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Local-time conversion
+# ---------------------------------------------------------------------------
+# A daily Panchanga converts ~60 UTC instants into the same timezone.  Rather
+# than pytz.timezone() + astimezone() + strftime() for each one, tz objects are
+# cached, the UTC offset is resolved once per (timezone, UTC day) and local
+# times are produced as minutes-since-midnight formatted from a lookup table.
+
+_HHMM: Tuple[str, ...] = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in range(60))
+
+
+@lru_cache(maxsize=512)
+def _tzinfo(tz_name: str) -> Any:
+    return pytz.timezone(tz_name)
+
+
+@lru_cache(maxsize=4096)
+def _utc_offset_seconds(tz_name: str, utc_day: date) -> Optional[int]:
+    """
+    UTC offset of ``tz_name`` throughout ``utc_day`` (a UTC calendar day), or
+    None when the offset changes during that day (DST switch).
+    """
+    tz = _tzinfo(tz_name)
+    start = datetime(utc_day.year, utc_day.month, utc_day.day, tzinfo=timezone.utc)
+    first = start.astimezone(tz).utcoffset()
+    last = (start + timedelta(days=1, seconds=-1)).astimezone(tz).utcoffset()
+    if first != last:
+        return None
+    return int(first.total_seconds())
+
+
+def _local_minutes(dt_utc: datetime, tz_name: str) -> Tuple[date, int]:
+    """Convert an aware UTC datetime to (local date, minutes since local midnight)."""
+    offset = _utc_offset_seconds(tz_name, dt_utc.date())
+    if offset is None:
+        local = dt_utc.astimezone(_tzinfo(tz_name))
+        return local.date(), local.hour * 60 + local.minute
+    seconds = dt_utc.hour * 3600 + dt_utc.minute * 60 + dt_utc.second + offset
+    day_shift, seconds = divmod(seconds, 86400)
+    local_date = dt_utc.date() + timedelta(days=day_shift) if day_shift else dt_utc.date()
+    return local_date, seconds // 60
+
+
 # ---------------------------------------------------------------------------
 # PanchangaService
 # ---------------------------------------------------------------------------
 
+# Date-element keys placed explicitly by assemble_daily_panchanga; every other
+# date-element key is the Panchanga-type month header that leads the dict.
+_DAILY_DATE_BODY_KEYS = frozenset({
+    "date", "day_of_week", "day_of_week_sa", "tithi", "nakshatra", "yoga", "karana",
+    "samvatsara", "vikrama_samvat", "shaka_samvat", "kali_yuga", "ayana", "ritu",
+    "surya_rashi", "chandra_rashi", "festivals",
+})
+
+
 class PanchangaService:
     """
     Accurate Panchanga service using the pyephem ephemeris library.
     Falls back to simplified arithmetic when ephem is unavailable.
     """
 
-    _tf = None  # TimezoneFinder singleton — lazy-initialised
-
     # ------------------------------------------------------------------
     # Timezone helpers
     # ------------------------------------------------------------------
 
-    def _get_tf(self) -> Optional[Any]:
-        """Return a cached TimezoneFinder instance (or None if unavailable)."""
-        if not TZ_AVAILABLE:
-            return None
-        if PanchangaService._tf is None:
-            PanchangaService._tf = TimezoneFinder()
-        return PanchangaService._tf
-
     def _resolve_timezone(self, latitude: float, longitude: float) -> str:
-        """Resolve IANA timezone name from coordinates. Falls back to Asia/Kolkata."""
-        tf = self._get_tf()
-        if tf is None:
-            return "Asia/Kolkata"
-        tz_name = tf.timezone_at(lat=latitude, lng=longitude)
+        """
+        Resolve IANA timezone name from coordinates via the precomputed grid
+        (TimezoneFinder on border cells). Falls back to Asia/Kolkata.
+        """
+        tz_name = timezone_resolver.timezone_at(latitude, longitude)
         return tz_name or "Asia/Kolkata"
 
     def _format_time_in_tz(self, dt: datetime, tz_name: str, fmt: str = "%H:%M") -> str:
         """Format a UTC datetime in the given IANA timezone."""
         if not TZ_AVAILABLE:
             return dt.strftime(fmt)
-        tz = pytz.timezone(tz_name)
-        local_dt = dt.astimezone(tz)
-        return local_dt.strftime(fmt)
+        if fmt == "%H:%M":
+            return _HHMM[_local_minutes(dt, tz_name)[1]]
+        return dt.astimezone(_tzinfo(tz_name)).strftime(fmt)
 
     # ------------------------------------------------------------------
     # Core astronomy helpers (ephem-backed, float fallback)
     # ------------------------------------------------------------------
 
-    def _build_observer(self, date_obj: date, latitude: float, longitude: float) -> Any:
-        """Build an ephem Observer for the given date and location (noon UTC)."""
-        obs = ephem.Observer()
-        obs.lat = str(latitude)
-        obs.lon = str(longitude)
-        obs.date = f"{date_obj.strftime('%Y/%m/%d')} 06:00:00"  # 06:00 UTC ≈ 11:30 IST
-        obs.pressure = 0  # disable atmospheric refraction for cleaner calcs
-        return obs
+    def _ephemeris(self, date_obj: date, latitude: float, longitude: float) -> EphemerisSnapshot:
+        """Return the shared ephemeris snapshot for the date and location."""
+        return get_ephemeris_snapshot(date_obj, latitude, longitude)
 
     def _sun_moon_longitudes(
         self, date_obj: date, latitude: float, longitude: float
     ) -> Tuple[float, float]:
-        """
-        Return (sun_ecliptic_lon_deg, moon_ecliptic_lon_deg) for the date.
-        Falls back to simplified values if ephem is unavailable.
-        """
-        if EPHEM_AVAILABLE:
-            obs = self._build_observer(date_obj, latitude, longitude)
-            sun = ephem.Sun()
-            moon = ephem.Moon()
-            sun.compute(obs)
-            moon.compute(obs)
-            return math.degrees(ephem.Ecliptic(sun).lon), math.degrees(ephem.Ecliptic(moon).lon)
-
-        # Simplified fallback (accurate to ±1–2 degrees for sun, ±3 for moon)
-        # Reference: J2000.0 = 2000-01-01T12:00 TT
-        j2000 = date(2000, 1, 1)
-        n = (date_obj - j2000).days + 0.5
-
-        # Sun mean longitude
-        L0 = (280.46646 + 0.9856474 * n) % 360
-        M = math.radians((357.52911 + 0.9856003 * n) % 360)
-        sun_lon = (L0 + 1.914602 * math.sin(M) + 0.019993 * math.sin(2 * M)) % 360
-
-        # Moon mean longitude (very simplified)
-        lm = (218.316 + 13.176396 * n) % 360
-        mm = math.radians((134.963 + 13.064993 * n) % 360)
-        moon_lon = (lm + 6.289 * math.sin(mm)) % 360
-
-        return sun_lon, moon_lon
+        """Return (sun_ecliptic_lon_deg, moon_ecliptic_lon_deg) for the date."""
+        eph = self._ephemeris(date_obj, latitude, longitude)
+        return eph.sun_lon, eph.moon_lon
 
-    def _compute_tithi_number(
-        self, date_obj: date, latitude: float, longitude: float
-    ) -> int:
+    def _compute_tithi_number(self, eph: EphemerisSnapshot) -> int:
         """
         Compute Tithi (1–30) using the Moon–Sun elongation.
 
         Tithi = ceil((Moon_lon - Sun_lon) / 12)   — 1-indexed, range [1..30]
         Tithi 30 = Amavasya (new moon, 0° elongation).
         """
-        sun_lon, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        diff = (moon_lon - sun_lon) % 360
+        diff = (eph.moon_lon - eph.sun_lon) % 360
         tithi = int(diff / 12) + 1
         if tithi > 30:
             tithi = 30
         return tithi
 
-    def _compute_nakshatra_number(
-        self, date_obj: date, latitude: float, longitude: float
-    ) -> int:
+    def _compute_nakshatra_number(self, eph: EphemerisSnapshot) -> int:
         """
         Compute Nakshatra (1–27) from Moon ecliptic longitude.
 
         Nakshatra = floor(Moon_lon / (360/27)) + 1
         """
-        _, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        nak = int(moon_lon / (360.0 / 27)) + 1
+        nak = int(eph.moon_lon / (360.0 / 27)) + 1
         return min(nak, 27)
 
-    def _compute_yoga_number(
-        self, date_obj: date, latitude: float, longitude: float
-    ) -> int:
+    def _compute_yoga_number(self, eph: EphemerisSnapshot) -> int:
         """
         Compute Yoga (1–27) from combined Sun + Moon longitude.
 
         Yoga = floor(((Sun_lon + Moon_lon) % 360) / (360/27)) + 1
         """
-        sun_lon, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        combined = (sun_lon + moon_lon) % 360
+        combined = (eph.sun_lon + eph.moon_lon) % 360
         yoga = int(combined / (360.0 / 27)) + 1
         return min(yoga, 27)
 
@@ -525,50 +812,26 @@ class PanchangaService:
             return 8 + (half_index - 56)  # 8, 9, 10, or 11
         return (half_index % 7) + 1  # repeating set 1–7
 
-    def _compute_sunrise_sunset(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> Tuple[str, str]:
+    def _compute_sunrise_sunset(self, eph: EphemerisSnapshot, tz_name: str) -> Tuple[str, str]:
         """
-        Compute localised sunrise and sunset times for the given date and location.
+        Compute localised sunrise and sunset times for the snapshot's date and location.
         Returns (sunrise_str, sunset_str) in HH:MM format in the local timezone.
         """
         if not EPHEM_AVAILABLE:
             return "06:15", "18:30"
-
-        obs = ephem.Observer()
-        obs.lat = str(latitude)
-        obs.lon = str(longitude)
-        obs.date = date_obj.strftime(DATE_START_FMT)
-        obs.pressure = 0
-        obs.horizon = "-0:34"  # Standard sunrise/sunset definition
-
-        sun = ephem.Sun()
-        try:
-            rise_utc = obs.next_rising(sun).datetime()
-            set_utc = obs.next_setting(sun).datetime()
-            sunrise = self._format_time_in_tz(
-                rise_utc.replace(tzinfo=pytz.utc) if TZ_AVAILABLE else rise_utc,
-                tz_name
-            )
-            sunset = self._format_time_in_tz(
-                set_utc.replace(tzinfo=pytz.utc) if TZ_AVAILABLE else set_utc,
-                tz_name
-            )
-            return sunrise, sunset
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
+        rise_set = eph.sun_rise_set_utc
+        if rise_set is None:
             return "06:00", "18:00"
+        rise_utc, set_utc = rise_set
+        return self._format_time_in_tz(rise_utc, tz_name), self._format_time_in_tz(set_utc, tz_name)
 
     def _minutes_to_hhmm(self, total_minutes: float) -> str:
-        """Convert minutes-since-midnight to HH:MM string."""
-        h = int(total_minutes // 60) % 24
-        m = int(total_minutes % 60)
-        return f"{h:02d}:{m:02d}"
+        """Convert minutes-since-midnight to HH:MM string (wraps past midnight)."""
+        return _HHMM[math.floor(total_minutes) % 1440]
 
     def _kalam_period(
         self,
-        date_obj: date,
-        latitude: float,
-        longitude: float,
+        eph: EphemerisSnapshot,
         tz_name: str,
         part_table: Dict[int, int],
     ) -> Tuple[str, str]:
@@ -578,28 +841,15 @@ class PanchangaService:
         The day (sunrise→sunset) is divided into 8 equal parts.
         `part_table[weekday]` gives the 1-indexed part number for the Kalam.
         """
-        if EPHEM_AVAILABLE and TZ_AVAILABLE:
-            obs = ephem.Observer()
-            obs.lat = str(latitude)
-            obs.lon = str(longitude)
-            obs.date = date_obj.strftime(DATE_START_FMT)
-            obs.pressure = 0
-            obs.horizon = "-0:34"
-            sun = ephem.Sun()
-            try:
-                tz = pytz.timezone(tz_name)
-                rise_local = obs.next_rising(sun).datetime().replace(tzinfo=pytz.utc).astimezone(tz)
-                set_local  = obs.next_setting(sun).datetime().replace(tzinfo=pytz.utc).astimezone(tz)
-                rise_mins = rise_local.hour * 60 + rise_local.minute
-                set_mins  = set_local.hour * 60 + set_local.minute
-                day_span  = set_mins - rise_mins
-                part_len  = day_span / 8.0
-                part_num  = part_table[date_obj.weekday()] - 1  # 0-indexed
-                start_mins = rise_mins + part_num * part_len
-                end_mins   = start_mins + part_len
-                return self._minutes_to_hhmm(start_mins), self._minutes_to_hhmm(end_mins)
-            except (ephem.AlwaysUpError, ephem.NeverUpError, Exception):
-                pass
+        times = self._sunrise_sunset_local_mins(eph, tz_name)
+        if times is not None:
+            rise_mins, set_mins = times
+            day_span  = set_mins - rise_mins
+            part_len  = day_span / 8.0
+            part_num  = part_table[eph.date_obj.weekday()] - 1  # 0-indexed
+            start_mins = rise_mins + part_num * part_len
+            end_mins   = start_mins + part_len
+            return self._minutes_to_hhmm(start_mins), self._minutes_to_hhmm(end_mins)
 
         # Fallback fixed times (Delhi / IST)
         fallback_rahu = {0: ("07:30","09:00"), 1: ("15:00","16:30"),
@@ -614,7 +864,7 @@ class PanchangaService:
                          2: ("10:30","12:00"), 3: ("09:00","10:30"),
                          4: ("07:30","09:00"), 5: ("06:00","07:30"),
                          6: ("15:00","16:30")}
-        wd = date_obj.weekday()
+        wd = eph.date_obj.weekday()
         if part_table is RAHU_KALAM_PART:
             return fallback_rahu[wd]
         if part_table is YAMAGANDAM_PART:
@@ -625,14 +875,8 @@ class PanchangaService:
     # Panchanga element builders
     # ------------------------------------------------------------------
 
-    def calculate_tithi(
-        self,
-        date_obj: date,
-        latitude: float = 28.6139,
-        longitude: float = 77.2090,
-    ) -> Dict[str, Any]:
-        """Return Tithi dict with normalised keys (name / name_sa)."""
-        tithi_num = self._compute_tithi_number(date_obj, latitude, longitude)
+    def _tithi_info(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
+        tithi_num = self._compute_tithi_number(eph)
         name_en, name_sa = TITHI_NAMES.get(tithi_num, ("Unknown", "Unknown"))
         paksha_en, paksha_sa = PAKSHA_FOR_TITHI[tithi_num]
         return {
@@ -648,17 +892,10 @@ class PanchangaService:
             "is_new_moon": tithi_num == 30,
         }
 
-    def calculate_nakshatra(
-        self,
-        date_obj: date,
-        latitude: float = 28.6139,
-        longitude: float = 77.2090,
-    ) -> Dict[str, Any]:
-        """Return Nakshatra dict with normalised keys."""
-        nak_num = self._compute_nakshatra_number(date_obj, latitude, longitude)
+    def _nakshatra_info(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
+        nak_num = self._compute_nakshatra_number(eph)
         name_en, name_sa = NAKSHATRA_NAMES.get(nak_num, ("Unknown", "Unknown"))
-        _, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        pada = int((moon_lon % (360.0 / 27)) / ((360.0 / 27) / 4)) + 1
+        pada = int((eph.moon_lon % (360.0 / 27)) / ((360.0 / 27) / 4)) + 1
         return {
             "number": nak_num,
             "name": name_en,
@@ -667,26 +904,13 @@ class PanchangaService:
             "pada": min(pada, 4),
         }
 
-    def calculate_yoga(
-        self,
-        date_obj: date,
-        latitude: float = 28.6139,
-        longitude: float = 77.2090,
-    ) -> Dict[str, Any]:
-        """Return Yoga dict with normalised keys."""
-        yoga_num = self._compute_yoga_number(date_obj, latitude, longitude)
+    def _yoga_info(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
+        yoga_num = self._compute_yoga_number(eph)
         name_en, name_sa = YOGA_NAMES.get(yoga_num, ("Unknown", "Unknown"))
         return {"number": yoga_num, "name": name_en, "name_sa": name_sa}
 
-    def calculate_karana(
-        self,
-        date_obj: date,
-        latitude: float = 28.6139,
-        longitude: float = 77.2090,
-    ) -> Dict[str, Any]:
-        """Return Karana dict with normalised keys."""
-        tithi_num = self._compute_tithi_number(date_obj, latitude, longitude)
-        kar_num = self._compute_karana_number(tithi_num)
+    def _karana_info(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
+        kar_num = self._compute_karana_number(self._compute_tithi_number(eph))
         name_en, name_sa = KARANA_NAMES.get(kar_num, ("Unknown", "Unknown"))
         is_bhadra = kar_num == 7  # Vishti / Bhadra
         return {
@@ -697,15 +921,8 @@ class PanchangaService:
             "warning": (f"Vishti (Bhadra) Karana — {AVOID_AUSPICIOUS}" if is_bhadra else None),
         }
 
-    def calculate_rahu_kalam(
-        self,
-        date_obj: date,
-        latitude: float = 28.6139,
-        longitude: float = 77.2090,
-    ) -> Dict[str, Any]:
-        """Return location-aware Rahu Kalam period."""
-        tz_name = self._resolve_timezone(latitude, longitude)
-        start, end = self._kalam_period(date_obj, latitude, longitude, tz_name, RAHU_KALAM_PART)
+    def _rahu_kalam_info(self, eph: EphemerisSnapshot, tz_name: str) -> Dict[str, Any]:
+        start, end = self._kalam_period(eph, tz_name, RAHU_KALAM_PART)
         return {
             "start": start,
             "end": end,
@@ -714,24 +931,58 @@ class PanchangaService:
             "timezone": tz_name,
         }
 
-    def _calculate_yamagandam(
+    def calculate_tithi(
         self,
         date_obj: date,
         latitude: float = 28.6139,
         longitude: float = 77.2090,
     ) -> Dict[str, Any]:
-        tz_name = self._resolve_timezone(latitude, longitude)
-        start, end = self._kalam_period(date_obj, latitude, longitude, tz_name, YAMAGANDAM_PART)
-        return {"start": start, "end": end, "timezone": tz_name}
+        """Return Tithi dict with normalised keys (name / name_sa)."""
+        return self._tithi_info(self._ephemeris(date_obj, latitude, longitude))
 
-    def _calculate_gulika_kalam(
+    def calculate_nakshatra(
         self,
         date_obj: date,
         latitude: float = 28.6139,
         longitude: float = 77.2090,
     ) -> Dict[str, Any]:
+        """Return Nakshatra dict with normalised keys."""
+        return self._nakshatra_info(self._ephemeris(date_obj, latitude, longitude))
+
+    def calculate_yoga(
+        self,
+        date_obj: date,
+        latitude: float = 28.6139,
+        longitude: float = 77.2090,
+    ) -> Dict[str, Any]:
+        """Return Yoga dict with normalised keys."""
+        return self._yoga_info(self._ephemeris(date_obj, latitude, longitude))
+
+    def calculate_karana(
+        self,
+        date_obj: date,
+        latitude: float = 28.6139,
+        longitude: float = 77.2090,
+    ) -> Dict[str, Any]:
+        """Return Karana dict with normalised keys."""
+        return self._karana_info(self._ephemeris(date_obj, latitude, longitude))
+
+    def calculate_rahu_kalam(
+        self,
+        date_obj: date,
+        latitude: float = 28.6139,
+        longitude: float = 77.2090,
+    ) -> Dict[str, Any]:
+        """Return location-aware Rahu Kalam period."""
         tz_name = self._resolve_timezone(latitude, longitude)
-        start, end = self._kalam_period(date_obj, latitude, longitude, tz_name, GULIKA_PART)
+        return self._rahu_kalam_info(self._ephemeris(date_obj, latitude, longitude), tz_name)
+
+    def _calculate_yamagandam(self, eph: EphemerisSnapshot, tz_name: str) -> Dict[str, Any]:
+        start, end = self._kalam_period(eph, tz_name, YAMAGANDAM_PART)
+        return {"start": start, "end": end, "timezone": tz_name}
+
+    def _calculate_gulika_kalam(self, eph: EphemerisSnapshot, tz_name: str) -> Dict[str, Any]:
+        start, end = self._kalam_period(eph, tz_name, GULIKA_PART)
         return {"start": start, "end": end, "timezone": tz_name}
 
     # ------------------------------------------------------------------
@@ -769,13 +1020,13 @@ class PanchangaService:
             "kali_yuga": kali_yuga,
         }
 
-    def _compute_ayana(self, date_obj: date, latitude: float, longitude: float) -> Dict[str, Any]:
+    def _compute_ayana(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
         """
         Compute Ayana (celestial half-year) from Sun's ecliptic longitude.
         Uttarayana: Sun at 270°–90° (starts winter solstice, traditional Makar Sankranti).
         Dakshinayana: Sun at 90°–270° (starts summer solstice).
         """
-        sun_lon, _ = self._sun_moon_longitudes(date_obj, latitude, longitude)
+        sun_lon = eph.sun_lon
         if sun_lon >= 270 or sun_lon < 90:
             return {
                 "name": "Uttarayana",
@@ -788,10 +1039,9 @@ class PanchangaService:
             "description": "Sun moving southward",
         }
 
-    def _compute_ritu(self, date_obj: date, latitude: float, longitude: float) -> Dict[str, Any]:
+    def _compute_ritu(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
         """Compute the current Ritu (season) from Sun's ecliptic longitude."""
-        sun_lon, _ = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        ritu_idx = int(sun_lon / 60) % 6
+        ritu_idx = int(eph.sun_lon / 60) % 6
         name_en, name_sa = RITU_NAMES[ritu_idx]
         return {
             "number": ritu_idx + 1,
@@ -799,108 +1049,75 @@ class PanchangaService:
             "name_sa": name_sa,
         }
 
-    def _compute_surya_rashi(self, date_obj: date, latitude: float, longitude: float) -> Dict[str, Any]:
+    def _compute_surya_rashi(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
         """Return Sun's Rashi (zodiac sign) from Sun's ecliptic longitude."""
-        sun_lon, _ = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        idx = int(sun_lon / 30) % 12
+        idx = int(eph.sun_lon / 30) % 12
         name_en, name_sa = RASHI_NAMES[idx]
         return {"number": idx + 1, "name": name_en, "name_sa": name_sa,
-                "longitude": round(sun_lon % 30, 2)}
+                "longitude": round(eph.sun_lon % 30, 2)}
 
-    def _compute_chandra_rashi(self, date_obj: date, latitude: float, longitude: float) -> Dict[str, Any]:
+    def _compute_chandra_rashi(self, eph: EphemerisSnapshot) -> Dict[str, Any]:
         """Return Moon's Rashi (zodiac sign) from Moon's ecliptic longitude."""
-        _, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        idx = int(moon_lon / 30) % 12
+        idx = int(eph.moon_lon / 30) % 12
         name_en, name_sa = RASHI_NAMES[idx]
         return {"number": idx + 1, "name": name_en, "name_sa": name_sa,
-                "longitude": round(moon_lon % 30, 2)}
+                "longitude": round(eph.moon_lon % 30, 2)}
 
-    def _compute_moonrise_moonset(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> Dict[str, str]:
+    def _compute_moonrise_moonset(self, eph: EphemerisSnapshot, tz_name: str) -> Dict[str, str]:
         """Compute moonrise and moonset times in local timezone."""
         if not EPHEM_AVAILABLE or not TZ_AVAILABLE:
             return {"moonrise": "N/A", "moonset": "N/A"}
-        obs = ephem.Observer()
-        obs.lat = str(latitude)
-        obs.lon = str(longitude)
-        obs.date = date_obj.strftime(DATE_START_FMT)
-        obs.pressure = 0
-        obs.horizon = "-0:34"
-        moon = ephem.Moon()
-        try:
-            rise_utc = obs.next_rising(moon).datetime().replace(tzinfo=pytz.utc)
-            moonrise = self._format_time_in_tz(rise_utc, tz_name)
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            moonrise = "N/A"
-        try:
-            obs.date = date_obj.strftime(DATE_START_FMT)  # reset
-            set_utc = obs.next_setting(moon).datetime().replace(tzinfo=pytz.utc)
-            moonset = self._format_time_in_tz(set_utc, tz_name)
-        except (ephem.AlwaysUpError, ephem.NeverUpError):
-            moonset = "N/A"
-        return {"moonrise": moonrise, "moonset": moonset}
+        rise_utc, set_utc = eph.moon_rise_set_utc
+        return {
+            "moonrise": self._format_time_in_tz(rise_utc, tz_name) if rise_utc else "N/A",
+            "moonset": self._format_time_in_tz(set_utc, tz_name) if set_utc else "N/A",
+        }
 
     def _sunrise_sunset_local_mins(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
+        self, eph: EphemerisSnapshot, tz_name: str
     ) -> Optional[Tuple[float, float]]:
         """Return (sunrise_mins, sunset_mins) as minutes since midnight in local tz, or None."""
         if not EPHEM_AVAILABLE or not TZ_AVAILABLE:
             return None
-        obs = ephem.Observer()
-        obs.lat = str(latitude)
-        obs.lon = str(longitude)
-        obs.date = date_obj.strftime(DATE_START_FMT)
-        obs.pressure = 0
-        obs.horizon = "-0:34"
-        tz = pytz.timezone(tz_name)
-        sun = ephem.Sun()
+        rise_set = eph.sun_rise_set_utc
+        if rise_set is None:
+            return None
         try:
-            rise = obs.next_rising(sun).datetime().replace(tzinfo=pytz.utc).astimezone(tz)
-            sset = obs.next_setting(sun).datetime().replace(tzinfo=pytz.utc).astimezone(tz)
-            return rise.hour * 60 + rise.minute, sset.hour * 60 + sset.minute
-        except (ephem.AlwaysUpError, ephem.NeverUpError, Exception):
+            _, rise_mins = _local_minutes(rise_set[0], tz_name)
+            _, set_mins = _local_minutes(rise_set[1], tz_name)
+        except Exception:
             return None
+        return rise_mins, set_mins
 
-    def _next_sunrise_local_mins(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> float:
+    def _next_sunrise_local_mins(self, eph: EphemerisSnapshot, tz_name: str) -> float:
         """Return sunrise of next calendar day as minutes since midnight + 24*60."""
         if not EPHEM_AVAILABLE or not TZ_AVAILABLE:
             return 24 * 60 + 6 * 60  # fallback: 06:00 next day
-        obs = ephem.Observer()
-        obs.lat = str(latitude)
-        obs.lon = str(longitude)
-        next_day = date_obj + timedelta(days=1)
-        obs.date = next_day.strftime(DATE_START_FMT)
-        obs.pressure = 0
-        obs.horizon = "-0:34"
-        tz = pytz.timezone(tz_name)
-        sun = ephem.Sun()
+        next_rise = eph.next_sunrise_utc
+        if next_rise is None:
+            return 24 * 60 + 6 * 60
         try:
-            rise = obs.next_rising(sun).datetime().replace(tzinfo=pytz.utc).astimezone(tz)
-            return rise.hour * 60 + rise.minute + 24 * 60
-        except (ephem.AlwaysUpError, ephem.NeverUpError, Exception):
+            _, rise_mins = _local_minutes(next_rise, tz_name)
+        except Exception:
             return 24 * 60 + 6 * 60
+        return rise_mins + 24 * 60
 
-    def _compute_choghadiya(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> List[Dict[str, Any]]:
+    def _compute_choghadiya(self, eph: EphemerisSnapshot, tz_name: str) -> List[Dict[str, Any]]:
         """
         Compute 16 Choghadiya periods (8 day + 8 night) for the date.
         Day: sunrise → sunset divided into 8 equal parts.
         Night: sunset → next sunrise divided into 8 equal parts.
         """
-        times = self._sunrise_sunset_local_mins(date_obj, latitude, longitude, tz_name)
+        times = self._sunrise_sunset_local_mins(eph, tz_name)
         if times is None:
             return []
         rise_mins, set_mins = times
-        rise_next_mins = self._next_sunrise_local_mins(date_obj, latitude, longitude, tz_name)
+        rise_next_mins = self._next_sunrise_local_mins(eph, tz_name)
 
         day_chg_len = (set_mins - rise_mins) / 8
         night_chg_len = (rise_next_mins - set_mins) / 8
 
-        wd = date_obj.weekday()
+        wd = eph.date_obj.weekday()
         day_start_idx = _CHG_DAY_START[wd]
         night_start_idx = _CHG_NIGHT_START[wd]
 
@@ -929,25 +1146,23 @@ class PanchangaService:
             })
         return result
 
-    def _compute_hora(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> List[Dict[str, Any]]:
+    def _compute_hora(self, eph: EphemerisSnapshot, tz_name: str) -> List[Dict[str, Any]]:
         """
         Compute 24 planetary Horas for the date.
         Day horas: sunrise → sunset in 12 equal parts.
         Night horas: sunset → next sunrise in 12 equal parts.
         Each successive hora advances 5 steps in HORA_LORDS (verified by weekday cycle).
         """
-        times = self._sunrise_sunset_local_mins(date_obj, latitude, longitude, tz_name)
+        times = self._sunrise_sunset_local_mins(eph, tz_name)
         if times is None:
             return []
         rise_mins, set_mins = times
-        rise_next_mins = self._next_sunrise_local_mins(date_obj, latitude, longitude, tz_name)
+        rise_next_mins = self._next_sunrise_local_mins(eph, tz_name)
 
         day_hora_len = (set_mins - rise_mins) / 12
         night_hora_len = (rise_next_mins - set_mins) / 12
 
-        wd = date_obj.weekday()
+        wd = eph.date_obj.weekday()
         first_idx = _HORA_DAY_LORD[wd]
 
         result: List[Dict[str, Any]] = []
@@ -974,22 +1189,20 @@ class PanchangaService:
             })
         return result
 
-    def _compute_durmuhurtam(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> List[Dict[str, Any]]:
+    def _compute_durmuhurtam(self, eph: EphemerisSnapshot, tz_name: str) -> List[Dict[str, Any]]:
         """
         Compute Durmuhurtam (inauspicious windows) for the date.
         Day (sunrise → sunset) is divided into 30 equal muhurtas.
         Traditional positions per weekday from _DURM_POS.
         """
-        times = self._sunrise_sunset_local_mins(date_obj, latitude, longitude, tz_name)
+        times = self._sunrise_sunset_local_mins(eph, tz_name)
         if times is None:
             return []
         rise_mins, set_mins = times
         day_span = set_mins - rise_mins
         muhurta_len = day_span / 30
 
-        wd = date_obj.weekday()
+        wd = eph.date_obj.weekday()
         result: List[Dict[str, Any]] = []
         for start_pos, end_pos in _DURM_POS.get(wd, []):
             start_m = rise_mins + (start_pos - 1) * muhurta_len
@@ -1001,16 +1214,15 @@ class PanchangaService:
             })
         return result
 
-    def _compute_varjyam(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> Optional[Dict[str, Any]]:
+    def _compute_varjyam(self, eph: EphemerisSnapshot, tz_name: str) -> Optional[Dict[str, Any]]:
         """
         Compute Varjyam (nakshatra-based inauspicious period, ~1.5h).
         Each nakshatra has a fixed offset after its start; see _VARJYAM_OFFSET_H.
         """
         if not TZ_AVAILABLE:
             return None
-        _, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
+        date_obj = eph.date_obj
+        moon_lon = eph.moon_lon
         nak_span = 360.0 / 27
         nak_num = min(int(moon_lon / nak_span) + 1, 27)
 
@@ -1029,77 +1241,92 @@ class PanchangaService:
         vs_dt = nak_start_dt + timedelta(hours=offset_h)
         ve_dt = vs_dt + timedelta(hours=1.5)
 
-        tz = pytz.timezone(tz_name)
-        vs_local = vs_dt.astimezone(tz)
-        ve_local = ve_dt.astimezone(tz)
+        vs_date, vs_mins = _local_minutes(vs_dt, tz_name)
+        ve_date, ve_mins = _local_minutes(ve_dt, tz_name)
         # Only report if Varjyam falls on this date in local tz
-        if vs_local.date() != date_obj and ve_local.date() != date_obj:
+        if vs_date != date_obj and ve_date != date_obj:
             return None
         nak_name = NAKSHATRA_NAMES.get(nak_num, ("Unknown", ""))[0]
         return {
-            "start": vs_local.strftime("%H:%M"),
-            "end": ve_local.strftime("%H:%M"),
+            "start": _HHMM[vs_mins],
+            "end": _HHMM[ve_mins],
             "nakshatra": nak_name,
             "warning": "Avoid auspicious activities during Varjyam",
         }
 
-    def _compute_tithi_end_time(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> str:
+    def _exact_element_end_utc(self, eph: EphemerisSnapshot, kind: str) -> Optional[datetime]:
         """
-        Estimate when the current Tithi ends.
-        Uses Moon–Sun elongation rate ≈ 0.507°/hr (synodic month = 29.53 days).
-        Returns HH:MM in local tz, or 'Tomorrow'.
+        Exact UTC end of the ``kind`` element current at 06:00 UTC, looked up in
+        the yearly transition tables.  None when ephem is unavailable.
         """
-        sun_lon, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        elongation = (moon_lon - sun_lon) % 360
-        tithi_num = int(elongation / 12) + 1
-        tithi_end_elong = tithi_num * 12
-        remaining_deg = tithi_end_elong - elongation
-        if remaining_deg <= 0:
-            remaining_deg += 12
-        rate = 360 / (29.53 * 24)  # degrees / hour
-        remaining_hours = remaining_deg / rate
+        if not EPHEM_AVAILABLE:
+            return None
+        date_obj = eph.date_obj
         ref_dt = datetime(
-            date_obj.year, date_obj.month, date_obj.day, 6, 0, 0, tzinfo=pytz.utc
+            date_obj.year, date_obj.month, date_obj.day, 6, 0, 0, tzinfo=timezone.utc
         )
-        end_dt = ref_dt + timedelta(hours=remaining_hours)
+        try:
+            return transition_store.element_at(kind, ref_dt).end
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("Transition table lookup failed for %s on %s: %s", kind, date_obj, exc)
+            return None
+
+    def _format_end_time(self, end_dt: datetime, date_obj: date, tz_name: str) -> str:
         if TZ_AVAILABLE:
-            tz = pytz.timezone(tz_name)
-            end_local = end_dt.astimezone(tz)
-            if end_local.date() > date_obj:
+            end_date, end_mins = _local_minutes(end_dt, tz_name)
+            if end_date > date_obj:
                 return "Tomorrow"
-            return end_local.strftime("%H:%M")
+            return _HHMM[end_mins]
         return self._minutes_to_hhmm((end_dt.hour * 60 + end_dt.minute) % (24 * 60))
 
-    def _compute_nakshatra_end_time(
-        self, date_obj: date, latitude: float, longitude: float, tz_name: str
-    ) -> str:
+    def _compute_tithi_end_time(self, eph: EphemerisSnapshot, tz_name: str) -> str:
         """
-        Estimate when the current Nakshatra ends.
-        Uses Moon sidereal speed ≈ 0.549°/hr (sidereal month = 27.32 days).
+        When the current Tithi ends, from the precomputed transition tables.
+        Falls back to the Moon–Sun elongation rate ≈ 0.507°/hr (synodic month
+        = 29.53 days) without ephem.
         Returns HH:MM in local tz, or 'Tomorrow'.
         """
-        _, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-        nak_span = 360.0 / 27
-        nak_num = min(int(moon_lon / nak_span) + 1, 27)
-        nak_end_lon = nak_num * nak_span
-        remaining_deg = nak_end_lon - moon_lon
-        if remaining_deg <= 0:
-            remaining_deg += nak_span
-        rate = 360 / (27.32 * 24)
-        remaining_hours = remaining_deg / rate
-        ref_dt = datetime(
-            date_obj.year, date_obj.month, date_obj.day, 6, 0, 0, tzinfo=pytz.utc
-        )
-        end_dt = ref_dt + timedelta(hours=remaining_hours)
-        if TZ_AVAILABLE:
-            tz = pytz.timezone(tz_name)
-            end_local = end_dt.astimezone(tz)
-            if end_local.date() > date_obj:
-                return "Tomorrow"
-            return end_local.strftime("%H:%M")
-        return self._minutes_to_hhmm((end_dt.hour * 60 + end_dt.minute) % (24 * 60))
+        date_obj = eph.date_obj
+        end_dt = self._exact_element_end_utc(eph, "tithi")
+        if end_dt is None:
+            elongation = (eph.moon_lon - eph.sun_lon) % 360
+            tithi_num = int(elongation / 12) + 1
+            tithi_end_elong = tithi_num * 12
+            remaining_deg = tithi_end_elong - elongation
+            if remaining_deg <= 0:
+                remaining_deg += 12
+            rate = 360 / (29.53 * 24)  # degrees / hour
+            remaining_hours = remaining_deg / rate
+            ref_dt = datetime(
+                date_obj.year, date_obj.month, date_obj.day, 6, 0, 0, tzinfo=timezone.utc
+            )
+            end_dt = ref_dt + timedelta(hours=remaining_hours)
+        return self._format_end_time(end_dt, date_obj, tz_name)
+
+    def _compute_nakshatra_end_time(self, eph: EphemerisSnapshot, tz_name: str) -> str:
+        """
+        When the current Nakshatra ends, from the precomputed transition tables.
+        Falls back to the Moon sidereal speed ≈ 0.549°/hr (sidereal month =
+        27.32 days) without ephem.
+        Returns HH:MM in local tz, or 'Tomorrow'.
+        """
+        date_obj = eph.date_obj
+        end_dt = self._exact_element_end_utc(eph, "nakshatra")
+        if end_dt is None:
+            moon_lon = eph.moon_lon
+            nak_span = 360.0 / 27
+            nak_num = min(int(moon_lon / nak_span) + 1, 27)
+            nak_end_lon = nak_num * nak_span
+            remaining_deg = nak_end_lon - moon_lon
+            if remaining_deg <= 0:
+                remaining_deg += nak_span
+            rate = 360 / (27.32 * 24)
+            remaining_hours = remaining_deg / rate
+            ref_dt = datetime(
+                date_obj.year, date_obj.month, date_obj.day, 6, 0, 0, tzinfo=timezone.utc
+            )
+            end_dt = ref_dt + timedelta(hours=remaining_hours)
+        return self._format_end_time(end_dt, date_obj, tz_name)
 
     # ------------------------------------------------------------------
     # Daily Panchanga — main public interface
@@ -1115,6 +1342,10 @@ class PanchangaService:
         """
         Return a complete Panchanga dict for the given date, location, and type.
 
+        Every element is derived from a single shared :class:`EphemerisSnapshot`,
+        so a daily Panchanga costs one Sun/Moon evaluation and one set of
+        rise/set searches (none at all on a snapshot LRU hit).
+
         Args:
             date_obj: The date to compute for.
             latitude: Observer latitude (degrees N positive).
@@ -1135,108 +1366,166 @@ class PanchangaService:
             )
         try:
             tz_name = self._resolve_timezone(latitude, longitude)
-            tithi   = self.calculate_tithi(date_obj, latitude, longitude)
-            nakshatra = self.calculate_nakshatra(date_obj, latitude, longitude)
-            yoga    = self.calculate_yoga(date_obj, latitude, longitude)
-            karana  = self.calculate_karana(date_obj, latitude, longitude)
-            rahu_kalam = self.calculate_rahu_kalam(date_obj, latitude, longitude)
-            sunrise, sunset = self._compute_sunrise_sunset(date_obj, latitude, longitude, tz_name)
-
-            inauspicious = {
-                "rahu_kalam": rahu_kalam,
-                "yamagandam": self._calculate_yamagandam(date_obj, latitude, longitude),
-                "gulika_kalam": self._calculate_gulika_kalam(date_obj, latitude, longitude),
-            }
-
-            muhurat  = self.get_auspicious_muhurat(date_obj, latitude, longitude, tz_name)
-            festivals = self.get_festivals_for_date(date_obj)
-
-            # Extended elements
-            samvatsara = self._compute_samvatsara(date_obj)
-            eras = self._compute_eras(date_obj)
-            ayana = self._compute_ayana(date_obj, latitude, longitude)
-            ritu = self._compute_ritu(date_obj, latitude, longitude)
-            surya_rashi = self._compute_surya_rashi(date_obj, latitude, longitude)
-            chandra_rashi = self._compute_chandra_rashi(date_obj, latitude, longitude)
-            moonrise_set = self._compute_moonrise_moonset(date_obj, latitude, longitude, tz_name)
-            choghadiya = self._compute_choghadiya(date_obj, latitude, longitude, tz_name)
-            hora = self._compute_hora(date_obj, latitude, longitude, tz_name)
-            durmuhurtam = self._compute_durmuhurtam(date_obj, latitude, longitude, tz_name)
-            varjyam = self._compute_varjyam(date_obj, latitude, longitude, tz_name)
-            tithi_end_time = self._compute_tithi_end_time(date_obj, latitude, longitude, tz_name)
-            nakshatra_end_time = self._compute_nakshatra_end_time(date_obj, latitude, longitude, tz_name)
-
-            # --- Panchanga-type-specific month information ---
-            sun_lon, _ = self._sun_moon_longitudes(date_obj, latitude, longitude)
-
-            if panchanga_type == "solar":
-                solar_idx = int(sun_lon / 30) % 12
-                month_name_en, month_name_sa = SOLAR_MONTH_NAMES[solar_idx]
-                month_info = {
-                    "panchanga_type": "solar",
-                    "panchanga_type_name": "Souramana",
-                    "month_name": month_name_en,
-                    "month_name_sa": month_name_sa,
-                    "sun_longitude": round(sun_lon, 4),
-                    "solar_month_index": solar_idx + 1,
-                }
-            else:
-                # Chandramana — lunar month based on Moon's approximate position
-                _, moon_lon = self._sun_moon_longitudes(date_obj, latitude, longitude)
-                lunar_idx = int(moon_lon / 30) % 12
-                lm_en, lm_sa = LUNAR_MONTH_NAMES[lunar_idx]
-                month_info = {
-                    "panchanga_type": "lunar",
-                    "panchanga_type_name": "Chandramana",
-                    "month_name": lm_en,
-                    "month_name_sa": lm_sa,
-                    "paksha": tithi["paksha"],
-                    "paksha_sa": tithi["paksha_sa"],
-                }
+            eph = self._ephemeris(date_obj, latitude, longitude)
+            return self.assemble_daily_panchanga(
+                self._date_elements(eph, panchanga_type),
+                self._location_elements(eph, tz_name),
+                tz_name,
+                latitude,
+                longitude,
+            )
+        except Exception as e:
+            logger.error("Panchanga calculation error: %s", e, exc_info=True)
+            raise ExternalServiceError(service_name="Panchanga", details={"error": str(e)})
 
-            return {
-                **month_info,
-                "date": date_obj.isoformat(),
-                "day_of_week": date_obj.strftime("%A"),
-                "day_of_week_sa": HINDI_DAYS.get(date_obj.weekday(), ""),
-                "sunrise": sunrise,
-                "sunset": sunset,
-                "moonrise": moonrise_set["moonrise"],
-                "moonset": moonrise_set["moonset"],
-                "tithi": tithi,
-                "tithi_end_time": tithi_end_time,
-                "nakshatra": nakshatra,
-                "nakshatra_end_time": nakshatra_end_time,
-                "yoga": yoga,
-                "karana": karana,
-                "samvatsara": samvatsara,
-                "vikrama_samvat": eras["vikrama_samvat"],
-                "shaka_samvat": eras["shaka_samvat"],
-                "kali_yuga": eras["kali_yuga"],
-                "ayana": ayana,
-                "ritu": ritu,
-                "surya_rashi": surya_rashi,
-                "chandra_rashi": chandra_rashi,
-                "choghadiya": choghadiya,
-                "hora": hora,
-                "durmuhurtam": durmuhurtam,
-                "varjyam": varjyam,
-                "rahu_kalam": rahu_kalam,
-                "festivals": festivals,
-                "muhurat": muhurat,
-                "inauspicious_periods": inauspicious,
-                "meta": {
-                    "timezone": tz_name,
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "ephem_available": EPHEM_AVAILABLE,
-                },
-            }
+    def get_date_elements(self, date_obj: date, panchanga_type: str = "lunar") -> Dict[str, Any]:
+        """
+        The location-independent part of a daily Panchanga (Tithi, Nakshatra,
+        Yoga, Karana, month, eras, festivals …).  These come from geocentric
+        longitudes at 06:00 UTC, so any observer yields the same values.
+        """
+        try:
+            return self._date_elements(self._ephemeris(date_obj, 28.6139, 77.2090), panchanga_type)
+        except Exception as e:
+            logger.error("Panchanga calculation error: %s", e, exc_info=True)
+            raise ExternalServiceError(service_name="Panchanga", details={"error": str(e)})
 
+    def get_location_elements(
+        self, date_obj: date, latitude: float, longitude: float, tz_name: str
+    ) -> Dict[str, Any]:
+        """The sunrise/sunset- and timezone-dependent part of a daily Panchanga."""
+        try:
+            return self._location_elements(self._ephemeris(date_obj, latitude, longitude), tz_name)
         except Exception as e:
             logger.error("Panchanga calculation error: %s", e, exc_info=True)
             raise ExternalServiceError(service_name="Panchanga", details={"error": str(e)})
 
+    def _date_elements(self, eph: EphemerisSnapshot, panchanga_type: str) -> Dict[str, Any]:
+        date_obj = eph.date_obj
+        tithi = self._tithi_info(eph)
+        eras = self._compute_eras(date_obj)
+
+        # --- Panchanga-type-specific month information ---
+        sun_lon = eph.sun_lon
+
+        if panchanga_type == "solar":
+            solar_idx = int(sun_lon / 30) % 12
+            month_name_en, month_name_sa = SOLAR_MONTH_NAMES[solar_idx]
+            month_info = {
+                "panchanga_type": "solar",
+                "panchanga_type_name": "Souramana",
+                "month_name": month_name_en,
+                "month_name_sa": month_name_sa,
+                "sun_longitude": round(sun_lon, 4),
+                "solar_month_index": solar_idx + 1,
+            }
+        else:
+            # Chandramana — lunar month based on Moon's approximate position
+            lunar_idx = int(eph.moon_lon / 30) % 12
+            lm_en, lm_sa = LUNAR_MONTH_NAMES[lunar_idx]
+            month_info = {
+                "panchanga_type": "lunar",
+                "panchanga_type_name": "Chandramana",
+                "month_name": lm_en,
+                "month_name_sa": lm_sa,
+                "paksha": tithi["paksha"],
+                "paksha_sa": tithi["paksha_sa"],
+            }
+
+        return {
+            **month_info,
+            "date": date_obj.isoformat(),
+            "day_of_week": date_obj.strftime("%A"),
+            "day_of_week_sa": HINDI_DAYS.get(date_obj.weekday(), ""),
+            "tithi": tithi,
+            "nakshatra": self._nakshatra_info(eph),
+            "yoga": self._yoga_info(eph),
+            "karana": self._karana_info(eph),
+            "samvatsara": self._compute_samvatsara(date_obj),
+            "vikrama_samvat": eras["vikrama_samvat"],
+            "shaka_samvat": eras["shaka_samvat"],
+            "kali_yuga": eras["kali_yuga"],
+            "ayana": self._compute_ayana(eph),
+            "ritu": self._compute_ritu(eph),
+            "surya_rashi": self._compute_surya_rashi(eph),
+            "chandra_rashi": self._compute_chandra_rashi(eph),
+            "festivals": self.get_festivals_for_date(date_obj),
+        }
+
+    def _location_elements(self, eph: EphemerisSnapshot, tz_name: str) -> Dict[str, Any]:
+        rahu_kalam = self._rahu_kalam_info(eph, tz_name)
+        sunrise, sunset = self._compute_sunrise_sunset(eph, tz_name)
+        moonrise_set = self._compute_moonrise_moonset(eph, tz_name)
+        return {
+            "sunrise": sunrise,
+            "sunset": sunset,
+            "moonrise": moonrise_set["moonrise"],
+            "moonset": moonrise_set["moonset"],
+            "tithi_end_time": self._compute_tithi_end_time(eph, tz_name),
+            "nakshatra_end_time": self._compute_nakshatra_end_time(eph, tz_name),
+            "choghadiya": self._compute_choghadiya(eph, tz_name),
+            "hora": self._compute_hora(eph, tz_name),
+            "durmuhurtam": self._compute_durmuhurtam(eph, tz_name),
+            "varjyam": self._compute_varjyam(eph, tz_name),
+            "rahu_kalam": rahu_kalam,
+            "muhurat": self._muhurat_from_sunrise(sunrise),
+            "inauspicious_periods": {
+                "rahu_kalam": rahu_kalam,
+                "yamagandam": self._calculate_yamagandam(eph, tz_name),
+                "gulika_kalam": self._calculate_gulika_kalam(eph, tz_name),
+            },
+        }
+
+    @staticmethod
+    def assemble_daily_panchanga(
+        date_elements: Dict[str, Any],
+        location_elements: Dict[str, Any],
+        tz_name: str,
+        latitude: float,
+        longitude: float,
+    ) -> Dict[str, Any]:
+        """Merge the two halves into the public daily Panchanga shape."""
+        d, loc = date_elements, location_elements
+        head = {k: v for k, v in d.items() if k not in _DAILY_DATE_BODY_KEYS}
+        return {
+            **head,
+            "date": d["date"],
+            "day_of_week": d["day_of_week"],
+            "day_of_week_sa": d["day_of_week_sa"],
+            "sunrise": loc["sunrise"],
+            "sunset": loc["sunset"],
+            "moonrise": loc["moonrise"],
+            "moonset": loc["moonset"],
+            "tithi": d["tithi"],
+            "tithi_end_time": loc["tithi_end_time"],
+            "nakshatra": d["nakshatra"],
+            "nakshatra_end_time": loc["nakshatra_end_time"],
+            "yoga": d["yoga"],
+            "karana": d["karana"],
+            "samvatsara": d["samvatsara"],
+            "vikrama_samvat": d["vikrama_samvat"],
+            "shaka_samvat": d["shaka_samvat"],
+            "kali_yuga": d["kali_yuga"],
+            "ayana": d["ayana"],
+            "ritu": d["ritu"],
+            "surya_rashi": d["surya_rashi"],
+            "chandra_rashi": d["chandra_rashi"],
+            "choghadiya": loc["choghadiya"],
+            "hora": loc["hora"],
+            "durmuhurtam": loc["durmuhurtam"],
+            "varjyam": loc["varjyam"],
+            "rahu_kalam": loc["rahu_kalam"],
+            "festivals": d["festivals"],
+            "muhurat": loc["muhurat"],
+            "inauspicious_periods": loc["inauspicious_periods"],
+            "meta": {
+                "timezone": tz_name,
+                "latitude": latitude,
+                "longitude": longitude,
+                "ephem_available": EPHEM_AVAILABLE,
+            },
+        }
+
     # ------------------------------------------------------------------
     # Muhurat
     # ------------------------------------------------------------------
@@ -1258,7 +1547,12 @@ class PanchangaService:
         if date_obj is None:
             date_obj = date.today()
 
-        sunrise_str, _ = self._compute_sunrise_sunset(date_obj, latitude, longitude, tz_name)
+        eph = self._ephemeris(date_obj, latitude, longitude)
+        sunrise_str, _ = self._compute_sunrise_sunset(eph, tz_name)
+        return self._muhurat_from_sunrise(sunrise_str)
+
+    def _muhurat_from_sunrise(self, sunrise_str: str) -> List[Dict[str, Any]]:
+        """Build the Muhurat list anchored on a local ``HH:MM`` sunrise."""
         try:
             sr_h, sr_m = map(int, sunrise_str.split(":"))
         except (ValueError, AttributeError):
@@ -1337,20 +1631,125 @@ class PanchangaService:
 
     def get_ekadashi_dates(self, year: int) -> List[Dict[str, Any]]:
         """Return all Ekadashi dates for the given year."""
+        year_range = self.get_panchanga_range(date(year, 1, 1), date(year, 12, 31))
         ekadashis = []
-        current = date(year, 1, 1)
-        end = date(year, 12, 31)
-        while current <= end:
-            tithi = self.calculate_tithi(current)
-            if tithi["is_ekadashi"]:
-                ekadashis.append({
-                    "date": current.isoformat(),
-                    "paksha": tithi["paksha"],
-                    "name": f"{tithi['paksha']} Ekadashi",
-                })
-            current += timedelta(days=1)
+        for idx in np.flatnonzero((year_range.tithi == 11) | (year_range.tithi == 26)):
+            paksha = PAKSHA_FOR_TITHI[int(year_range.tithi[idx])][0]
+            ekadashis.append({
+                "date": year_range.date_at(idx).isoformat(),
+                "paksha": paksha,
+                "name": f"{paksha} Ekadashi",
+            })
         return ekadashis
 
+    # ------------------------------------------------------------------
+    # Date ranges (calendar views, yearly scans)
+    # ------------------------------------------------------------------
+
+    def get_daily_panchanga_many(
+        self,
+        dates: Tuple[date, ...],
+        latitude: float = 28.6139,
+        longitude: float = 77.2090,
+        panchanga_type: str = "lunar",
+    ) -> List[Dict[str, Any]]:
+        """Full daily Panchanga for each of ``dates`` — one executor round-trip per chunk."""
+        return [
+            self.get_daily_panchanga(d, latitude, longitude, panchanga_type) for d in dates
+        ]
+
+    def get_panchanga_range(
+        self,
+        start: date,
+        end: date,
+        latitude: float = 28.6139,
+        longitude: float = 77.2090,
+    ) -> PanchangaRange:
+        """
+        Compute Tithi / Nakshatra / Yoga / Karana for every date in ``[start, end]``.
+
+        Sun and Moon longitudes are sampled once per day into NumPy arrays and
+        every element is derived with array operations, so a full year costs a
+        few milliseconds instead of 365 independent ephemeris builds.
+
+        Raises:
+            ValueError: If ``end`` is before ``start``.
+        """
+        if end < start:
+            raise ValueError("end must be on or after start")
+        days = (end - start).days + 1
+        sun_lon, moon_lon = _sun_moon_longitude_arrays(
+            start,
+            days,
+            round(latitude, _COORD_PRECISION),
+            round(longitude, _COORD_PRECISION),
+        )
+        return PanchangaRange.from_longitudes(start, sun_lon, moon_lon)
+
+    def get_month_calendar(
+        self,
+        year: int,
+        month: int,
+        latitude: float = 28.6139,
+        longitude: float = 77.2090,
+        panchanga_type: str = "lunar",
+    ) -> List[Dict[str, Any]]:
+        """
+        Return a lightweight per-day Panchanga summary for a calendar month.
+
+        Lunar elements come from :meth:`get_panchanga_range`; only sunrise,
+        Rahu Kalam and end times touch the per-day ephemeris snapshot.
+        """
+        first = date(year, month, 1)
+        last = date(year, month, cal_module.monthrange(year, month)[1])
+        tz_name = self._resolve_timezone(latitude, longitude)
+        month_range = self.get_panchanga_range(first, last, latitude, longitude)
+
+        results: List[Dict[str, Any]] = []
+        for i in range(len(month_range)):
+            d = month_range.date_at(i)
+            eph = self._ephemeris(d, latitude, longitude)
+            tithi_num = int(month_range.tithi[i])
+            nak_num = int(month_range.nakshatra[i])
+            yoga_num = int(month_range.yoga[i])
+            tithi_en, tithi_sa = TITHI_NAMES.get(tithi_num, ("Unknown", "Unknown"))
+            nak_en, nak_sa = NAKSHATRA_NAMES.get(nak_num, ("Unknown", "Unknown"))
+            yoga_en, yoga_sa = YOGA_NAMES.get(yoga_num, ("Unknown", "Unknown"))
+            if panchanga_type == "solar":
+                month_name = SOLAR_MONTH_NAMES[int(month_range.sun_lon[i] / 30) % 12][0]
+            else:
+                month_name = LUNAR_MONTH_NAMES[int(month_range.moon_lon[i] / 30) % 12][0]
+            sunrise, sunset = self._compute_sunrise_sunset(eph, tz_name)
+            results.append({
+                "date": d.isoformat(),
+                "day_of_week": d.strftime("%A"),
+                "day_of_week_sa": HINDI_DAYS.get(d.weekday(), ""),
+                "tithi": {
+                    "number": tithi_num,
+                    "name": tithi_en,
+                    "name_sa": tithi_sa,
+                    "paksha": PAKSHA_FOR_TITHI[tithi_num][0],
+                    "end_time": self._compute_tithi_end_time(eph, tz_name),
+                },
+                "nakshatra": {
+                    "number": nak_num,
+                    "name": nak_en,
+                    "name_sa": nak_sa,
+                    "end_time": self._compute_nakshatra_end_time(eph, tz_name),
+                },
+                "yoga": {"name": yoga_en, "name_sa": yoga_sa},
+                "sunrise": sunrise,
+                "sunset": sunset,
+                "month_name": month_name,
+                "panchanga_type": panchanga_type,
+                "festivals": self.get_festivals_for_date(d),
+                "is_ekadashi": tithi_num in (11, 26),
+                "is_full_moon": tithi_num == 15,
+                "is_new_moon": tithi_num == 30,
+                "rahu_kalam": self._rahu_kalam_info(eph, tz_name),
+            })
+        return results
+
     # ------------------------------------------------------------------
     # Auspiciousness check
     # ------------------------------------------------------------------
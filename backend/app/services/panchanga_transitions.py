@@ -0,0 +1,356 @@
+"""
+Panchanga transition tables.
+
+Precomputes the exact UTC instants at which every Tithi, Karana, Nakshatra and
+Yoga begins during a calendar year, so "which element is current at instant t
+and when does it end" becomes a binary search instead of a mean-motion
+extrapolation.
+
+Boundaries are bracketed on a 0.1-day grid (shorter than the briefest Karana,
+~0.39 day) and refined with the Illinois variant of regula falsi to within one
+second.  The ecliptic longitudes used by PanchangaService are geocentric, so a
+single table per year serves every location.
+
+Whole-year tables are only kept for a window around the current year; an
+instant outside it is resolved directly by bracketing its two boundaries from
+the mean angular rate and refining them the same way.
+"""
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, NamedTuple, Optional
+
+import numpy as np
+
+try:
+    import ephem
+    EPHEM_AVAILABLE = True
+except ImportError:
+    EPHEM_AVAILABLE = False
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TABLE_FORMAT_VERSION = 1
+
+_NAK_SPAN = 360.0 / 27
+_SCAN_STEP_DAYS = 0.1
+_YEAR_MARGIN_DAYS = 3.0        # tables overlap neighbouring years so edge lookups resolve
+_TOLERANCE_DAYS = 1.0 / 86400  # one second
+_ANGLE_TOLERANCE_DEG = 1e-6
+_MAX_ITERATIONS = 40
+
+# element kind → (angle as a function of (sun_deg, moon_deg), boundary spacing in degrees,
+#                 mean angular rate in degrees/day)
+_ELEMENTS: Dict[str, tuple] = {
+    "tithi": (lambda sun, moon: (moon - sun) % 360, 12.0, 360.0 / 29.530589),
+    "karana": (lambda sun, moon: (moon - sun) % 360, 6.0, 360.0 / 29.530589),
+    "nakshatra": (lambda sun, moon: moon % 360, _NAK_SPAN, 360.0 / 27.321662),
+    "yoga": (lambda sun, moon: (sun + moon) % 360, _NAK_SPAN, 360.0 / 27.321662 + 360.0 / 365.2422),
+}
+TRANSITION_KINDS = tuple(_ELEMENTS)
+
+
+def karana_number(half_index: int) -> int:
+    """
+    Map a 0-based half-Tithi index (0–59) to its Karana number (1–11).
+
+    Indices 0–55 cycle through the seven movable Karanas; 56–59 are the fixed
+    Shakuni, Chatushpada, Naga and Kimstughna.
+    """
+    if half_index >= 56:
+        return 8 + (half_index - 56)
+    return (half_index % 7) + 1
+
+
+class Transition(NamedTuple):
+    """One Panchanga element occurrence: its number and UTC start/end instants."""
+
+    number: int
+    start: datetime
+    end: datetime
+
+
+def _epoch_to_utc(seconds: float) -> datetime:
+    return datetime.fromtimestamp(float(seconds), tz=timezone.utc)
+
+
+class TransitionTable:
+    """
+    Sorted boundary instants for one element kind and year.
+
+    ``starts[i]`` is the Unix timestamp (seconds) at which element
+    ``numbers[i]`` begins; it ends at ``starts[i + 1]``.
+    """
+
+    __slots__ = ("kind", "year", "starts", "numbers")
+
+    def __init__(self, kind: str, year: int, starts: np.ndarray, numbers: np.ndarray) -> None:
+        self.kind = kind
+        self.year = year
+        self.starts = starts
+        self.numbers = numbers
+
+    def __len__(self) -> int:
+        return int(self.starts.shape[0])
+
+    def element_at(self, when: datetime) -> Transition:
+        """Return the element current at ``when`` (an aware datetime)."""
+        ts = when.timestamp()
+        idx = int(np.searchsorted(self.starts, ts, side="right")) - 1
+        if idx < 0 or idx + 1 >= len(self):
+            raise ValueError(f"{when.isoformat()} is outside the {self.kind} table for {self.year}")
+        return Transition(
+            number=int(self.numbers[idx]),
+            start=_epoch_to_utc(self.starts[idx]),
+            end=_epoch_to_utc(self.starts[idx + 1]),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Table construction
+# ---------------------------------------------------------------------------
+
+_UNIX_EPOCH_DJD = 25567.5  # ephem.Date("1970/1/1") — Dublin Julian Day of the Unix epoch
+
+
+class _LongitudeSampler:
+    """Geocentric Sun/Moon ecliptic longitudes (degrees) at ephem dates."""
+
+    def __init__(self) -> None:
+        self._sun = ephem.Sun()
+        self._moon = ephem.Moon()
+
+    def __call__(self, djd: float) -> tuple:
+        when = ephem.Date(djd)
+        self._sun.compute(when)
+        self._moon.compute(when)
+        return (
+            math.degrees(ephem.Ecliptic(self._sun).lon),
+            math.degrees(ephem.Ecliptic(self._moon).lon),
+        )
+
+
+def _boundary_offset(
+    sample: "_LongitudeSampler", angle_of: Callable, boundary: float
+) -> Callable[[float], float]:
+    """Signed degrees (-180, 180] by which the element angle is past ``boundary``."""
+
+    def offset(djd: float) -> float:
+        return (angle_of(*sample(djd)) - boundary + 180.0) % 360.0 - 180.0
+
+    return offset
+
+
+def _refine_crossing(
+    offset: Callable[[float], float], lo: float, hi: float, f_lo: float, f_hi: float
+) -> float:
+    """Illinois regula falsi for the root of ``offset`` bracketed by ``[lo, hi]``."""
+    side = 0
+    for _ in range(_MAX_ITERATIONS):
+        mid = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+        f_mid = offset(mid)
+        if abs(f_mid) < _ANGLE_TOLERANCE_DEG:
+            return mid
+        if f_mid * f_hi > 0:
+            hi, f_hi = mid, f_mid
+            if side == -1:
+                f_lo /= 2
+            side = -1
+        else:
+            lo, f_lo = mid, f_mid
+            if side == 1:
+                f_hi /= 2
+            side = 1
+        if hi - lo < _TOLERANCE_DAYS:
+            break
+    return (lo + hi) / 2
+
+
+def build_transition_tables(year: int) -> Dict[str, TransitionTable]:
+    """Compute the Tithi, Karana, Nakshatra and Yoga tables for ``year``."""
+    if not EPHEM_AVAILABLE:
+        raise RuntimeError("ephem is required to build Panchanga transition tables")
+
+    sample = _LongitudeSampler()
+    first = float(ephem.Date(f"{year}/1/1")) - _YEAR_MARGIN_DAYS
+    last = float(ephem.Date(f"{year + 1}/1/1")) + _YEAR_MARGIN_DAYS
+    grid = first + _SCAN_STEP_DAYS * np.arange(int((last - first) / _SCAN_STEP_DAYS) + 1)
+    sun_moon = np.array([sample(t) for t in grid])
+    sun_lon, moon_lon = sun_moon[:, 0], sun_moon[:, 1]
+
+    tables: Dict[str, TransitionTable] = {}
+    for kind, (angle_of, span, _rate) in _ELEMENTS.items():
+        index = (angle_of(sun_lon, moon_lon) // span).astype(np.int64)
+        changes = np.flatnonzero(index[1:] != index[:-1])
+        starts = np.empty(changes.shape[0], dtype=np.int64)
+        numbers = np.empty(changes.shape[0], dtype=np.int8)
+        for n, i in enumerate(changes):
+            offset = _boundary_offset(sample, angle_of, float(index[i + 1] * span))
+            crossing = _refine_crossing(
+                offset, grid[i], grid[i + 1], offset(grid[i]), offset(grid[i + 1])
+            )
+            starts[n] = _djd_to_epoch(crossing)
+            numbers[n] = _element_number(kind, int(index[i + 1]))
+        tables[kind] = TransitionTable(kind, year, starts, numbers)
+    return tables
+
+
+def _djd_to_epoch(djd: float) -> int:
+    return round((djd - _UNIX_EPOCH_DJD) * 86400)
+
+
+def _element_number(kind: str, index: int) -> int:
+    return karana_number(index) if kind == "karana" else index + 1
+
+
+def find_transition(kind: str, when: datetime) -> Transition:
+    """
+    Solve for the ``kind`` element current at ``when`` without a yearly table.
+
+    Each boundary is bracketed starting from the mean-motion estimate, widened
+    in 0.1-day steps until the angle crosses it, then refined like the tables.
+    """
+    if not EPHEM_AVAILABLE:
+        raise RuntimeError("ephem is required to find Panchanga transitions")
+
+    angle_of, span, rate = _ELEMENTS[kind]
+    sample = _LongitudeSampler()
+    djd = when.timestamp() / 86400 + _UNIX_EPOCH_DJD
+    angle = angle_of(*sample(djd))
+    index = int(angle // span)
+
+    start_offset = _boundary_offset(sample, angle_of, index * span)
+    start = _solve_crossing(start_offset, djd, -(angle - index * span) / rate, -_SCAN_STEP_DAYS)
+    end_offset = _boundary_offset(sample, angle_of, (index + 1) * span)
+    end = _solve_crossing(end_offset, djd, ((index + 1) * span - angle) / rate, _SCAN_STEP_DAYS)
+    return Transition(
+        number=_element_number(kind, index),
+        start=_epoch_to_utc(_djd_to_epoch(start)),
+        end=_epoch_to_utc(_djd_to_epoch(end)),
+    )
+
+
+def _solve_crossing(
+    offset: Callable[[float], float], djd: float, estimate_days: float, step: float
+) -> float:
+    """Root of ``offset`` on the side of ``djd`` given by the sign of ``step``."""
+    forward = step > 0
+    near, f_near = djd, offset(djd)
+    far = djd + estimate_days
+    f_far = offset(far)
+    # Until the angle has passed the boundary (forward) or not yet reached it
+    # (backward), move the bracket outward.
+    while (f_far < 0) if forward else (f_far >= 0):
+        near, f_near = far, f_far
+        far += step
+        f_far = offset(far)
+    if f_far == f_near:
+        return far
+    lo, hi, f_lo, f_hi = (near, far, f_near, f_far) if forward else (far, near, f_far, f_near)
+    return _refine_crossing(offset, lo, hi, f_lo, f_hi)
+
+
+# ---------------------------------------------------------------------------
+# Per-process store (memory, optionally backed by .npz files)
+# ---------------------------------------------------------------------------
+
+class TransitionTableStore:
+    """
+    Lazily builds and caches yearly transition tables.
+
+    Tables are only built for years within ``years_around`` of the current
+    year and at most ``max_years`` are kept (least recently used evicted);
+    :meth:`element_at` solves other years directly.  When ``cache_dir`` is set,
+    tables are persisted as one compact ``.npz`` per year so restarts and
+    sibling workers skip the build.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, *, years_around: int = 1, max_years: int = 4
+    ) -> None:
+        self._cache_dir = cache_dir
+        self._years_around = years_around
+        self._max_years = max(1, max_years)
+        self._years: "OrderedDict[int, Dict[str, TransitionTable]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, year: int) -> Optional[str]:
+        if not self._cache_dir:
+            return None
+        return os.path.join(self._cache_dir, f"panchanga_transitions_v{TABLE_FORMAT_VERSION}_{year}.npz")
+
+    def _load(self, year: int) -> Optional[Dict[str, TransitionTable]]:
+        path = self._path(year)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return {
+                    kind: TransitionTable(kind, year, data[f"{kind}_starts"], data[f"{kind}_numbers"])
+                    for kind in TRANSITION_KINDS
+                }
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning("Ignoring unreadable transition table %s: %s", path, exc)
+            return None
+
+    def _save(self, year: int, tables: Dict[str, TransitionTable]) -> None:
+        path = self._path(year)
+        if not path:
+            return
+        arrays = {}
+        for kind, table in tables.items():
+            arrays[f"{kind}_starts"] = table.starts
+            arrays[f"{kind}_numbers"] = table.numbers
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fh:
+                np.savez_compressed(fh, **arrays)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Could not persist transition table %s: %s", path, exc)
+
+    def tables_for_year(self, year: int) -> Dict[str, TransitionTable]:
+        with self._lock:
+            tables = self._years.get(year)
+            if tables is None:
+                tables = self._load(year)
+                if tables is None:
+                    tables = build_transition_tables(year)
+                    self._save(year, tables)
+                self._years[year] = tables
+                while len(self._years) > self._max_years:
+                    self._years.popitem(last=False)
+            else:
+                self._years.move_to_end(year)
+        return tables
+
+    def window(self) -> range:
+        """Years that get whole-year tables: the current year ± ``years_around``."""
+        current = datetime.now(timezone.utc).year
+        return range(current - self._years_around, current + self._years_around + 1)
+
+    def warm_up(self) -> None:
+        """Build (or load) the tables for every year in :meth:`window`."""
+        for year in self.window():
+            self.tables_for_year(year)
+
+    def element_at(self, kind: str, when: datetime) -> Transition:
+        """Return the ``kind`` element current at ``when`` with its exact start/end."""
+        year = when.astimezone(timezone.utc).year
+        if year in self._years or year in self.window():
+            return self.tables_for_year(year)[kind].element_at(when)
+        return find_transition(kind, when)
+
+
+transition_store = TransitionTableStore(
+    settings.PANCHANGA_TRANSITION_CACHE_DIR,
+    years_around=settings.PANCHANGA_TRANSITION_YEARS_AROUND,
+    max_years=settings.PANCHANGA_TRANSITION_MAX_YEARS,
+)
@@ -0,0 +1,193 @@
+"""
+Cluster-wide WebSocket presence.
+
+Two Redis structures are shared by every instance:
+
+* ``ws:presence``       hash   user → pod currently holding the socket
+  (used for pod-mode routing);
+* ``ws:presence:seen``  zset   user → last heartbeat, unix seconds.
+
+A user is online while their score is younger than ``WS_PRESENCE_TTL``.
+Each pod buffers connect/disconnect deltas and writes them in one pipeline
+every ``WS_PRESENCE_FLUSH_INTERVAL`` seconds, and re-stamps all of its local
+users every ``WS_PRESENCE_HEARTBEAT_INTERVAL`` so that users of a crashed pod
+age out on their own.  Reads answer from local sockets first, then a short
+TTL cache, and batch the remaining lookups into a single ``ZMSCORE``.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_KEY = "ws:presence"
+PRESENCE_SEEN_KEY = "ws:presence:seen"
+
+# Drop a presence entry only if it still points at the given pod (the user may
+# have reconnected elsewhere since).
+PRESENCE_RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+# Users re-stamped per ZADD during a heartbeat.
+_HEARTBEAT_CHUNK = 1000
+
+
+class PresenceService:
+    """Batched presence writes and cached, batched presence reads for one pod."""
+
+    def __init__(self, pod_id: str, local_users: Collection[str]) -> None:
+        self.redis_client: Optional[redis.Redis] = None
+        self.pod_id = pod_id
+        # Sockets held by this instance (the manager's active_connections).
+        self._local_users = local_users
+        # Changes since the last flush.
+        self._joins: Set[str] = set()
+        self._leaves: Set[str] = set()
+        # user → (online, monotonic expiry)
+        self._cache: Dict[str, Tuple[bool, float]] = {}
+        self._last_heartbeat = 0.0
+        self.flush_task: Optional[asyncio.Task] = None
+
+    def mark_online(self, user_id: str) -> None:
+        self._leaves.discard(user_id)
+        self._joins.add(user_id)
+        self._cache.pop(user_id, None)
+
+    def mark_offline(self, user_id: str) -> None:
+        self._joins.discard(user_id)
+        self._leaves.add(user_id)
+        self._cache.pop(user_id, None)
+
+    def start(
+        self,
+        on_registered: Callable[[List[str]], Awaitable[None]],
+        interval: float,
+    ) -> None:
+        """Periodically flush presence changes and heartbeats."""
+        if not self.redis_client or self.flush_task:
+            return
+
+        async def _flush_loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    registered = await self.flush()
+                    if registered:
+                        await on_registered(registered)
+                except RedisError as exc:
+                    logger.error("Presence flush error: %s", exc)
+                except Exception:
+                    logger.exception("Unexpected presence flush failure")
+
+        self.flush_task = asyncio.create_task(_flush_loop())
+
+    async def flush(self) -> List[str]:
+        """Write pending changes (and a heartbeat when due) in one pipeline.
+
+        Returns the users newly registered to this pod.
+        """
+        if not self.redis_client:
+            return []
+        now = time.time()
+        heartbeat_due = now - self._last_heartbeat >= settings.WS_PRESENCE_HEARTBEAT_INTERVAL
+        if not (self._joins or self._leaves or heartbeat_due):
+            return []
+
+        joins, self._joins = self._joins, set()
+        leaves, self._leaves = self._leaves, set()
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                if joins:
+                    pipe.hset(PRESENCE_KEY, mapping={user_id: self.pod_id for user_id in joins})
+                    pipe.zadd(PRESENCE_SEEN_KEY, {user_id: now for user_id in joins})
+                for user_id in leaves:
+                    pipe.eval(
+                        PRESENCE_RELEASE_SCRIPT, 2, PRESENCE_KEY, PRESENCE_SEEN_KEY,
+                        user_id, self.pod_id,
+                    )
+                if heartbeat_due:
+                    local = [user_id for user_id in list(self._local_users) if user_id not in joins]
+                    for start in range(0, len(local), _HEARTBEAT_CHUNK):
+                        chunk = local[start:start + _HEARTBEAT_CHUNK]
+                        pipe.zadd(PRESENCE_SEEN_KEY, {user_id: now for user_id in chunk})
+                    pipe.zremrangebyscore(
+                        PRESENCE_SEEN_KEY, "-inf", now - settings.WS_PRESENCE_TTL
+                    )
+                await pipe.execute()
+        except RedisError:
+            # Keep changes made since the swap; retry the rest on the next flush.
+            self._joins |= joins - self._leaves
+            self._leaves |= leaves - self._joins
+            raise
+        if heartbeat_due:
+            self._last_heartbeat = now
+        return list(joins)
+
+    async def are_online(self, user_ids: Iterable[str]) -> Dict[str, bool]:
+        """Map each user id to whether it has a live socket on any instance."""
+        result: Dict[str, bool] = {}
+        misses: List[str] = []
+        now = time.monotonic()
+        for user_id in dict.fromkeys(user_ids):
+            if user_id in self._local_users:
+                result[user_id] = True
+                continue
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[1] > now:
+                result[user_id] = cached[0]
+                continue
+            misses.append(user_id)
+
+        if not misses:
+            return result
+        scores: List[Optional[float]] = [None] * len(misses)
+        if self.redis_client:
+            try:
+                scores = await self.redis_client.zmscore(PRESENCE_SEEN_KEY, misses)
+            except RedisError as exc:
+                logger.error("Presence lookup failed: %s", exc)
+                for user_id in misses:
+                    result[user_id] = False
+                return result
+
+        cutoff = time.time() - settings.WS_PRESENCE_TTL
+        expires = now + settings.WS_PRESENCE_CACHE_TTL
+        self._prune_cache(now)
+        for user_id, score in zip(misses, scores, strict=True):
+            online = score is not None and float(score) >= cutoff
+            result[user_id] = online
+            if self.redis_client:
+                self._cache[user_id] = (online, expires)
+        return result
+
+    async def is_online(self, user_id: str) -> bool:
+        return (await self.are_online([user_id]))[user_id]
+
+    async def online_users(self) -> List[str]:
+        """All users seen within the presence TTL (local users if Redis is down)."""
+        if self.redis_client:
+            try:
+                return list(await self.redis_client.zrangebyscore(
+                    PRESENCE_SEEN_KEY, time.time() - settings.WS_PRESENCE_TTL, "+inf"
+                ))
+            except RedisError as exc:
+                logger.error("Presence scan failed: %s", exc)
+        return list(self._local_users)
+
+    def _prune_cache(self, now: float) -> None:
+        if len(self._cache) < settings.WS_PRESENCE_CACHE_SIZE:
+            return
+        self._cache = {k: v for k, v in self._cache.items() if v[1] > now}
+        if len(self._cache) >= settings.WS_PRESENCE_CACHE_SIZE:
+            self._cache.clear()
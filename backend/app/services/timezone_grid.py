@@ -0,0 +1,211 @@
+"""
+Precomputed timezone lookup grid.
+
+A quantized lat/lon grid over the regions we serve, where each cell stores the
+index of its IANA timezone, or ``BORDER`` when the cell's corners disagree (a
+timezone boundary passes through it).  Interior cells resolve with two array
+reads; only border cells and points outside the grid fall back to
+TimezoneFinder.
+
+When ``PANCHANGA_TZ_GRID_PATH`` is set the grid is persisted as ``.npy`` (plus a
+``.json`` sidecar with bounds and zone names) and memory-mapped on load, so
+every worker process shares the same pages.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from timezonefinder import TimezoneFinder
+    TZ_AVAILABLE = True
+except ImportError:
+    TZ_AVAILABLE = False
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+GRID_FORMAT_VERSION = 1
+BORDER = np.iinfo(np.uint16).max
+
+Bounds = Tuple[float, float, float, float]  # lat_min, lat_max, lon_min, lon_max
+
+
+def parse_bounds(value: str) -> Bounds:
+    """Parse ``"lat_min,lat_max,lon_min,lon_max"``."""
+    parts = [float(p) for p in value.split(",")]
+    if len(parts) != 4 or parts[0] >= parts[1] or parts[2] >= parts[3]:
+        raise ValueError(f"Invalid timezone grid bounds {value!r}")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+class TimezoneGrid:
+    """Read-only grid lookup; ``timezone_at`` returns None where the grid can't decide."""
+
+    __slots__ = ("bounds", "step", "names", "cells")
+
+    def __init__(self, bounds: Bounds, step: float, names: List[str], cells: np.ndarray) -> None:
+        self.bounds = bounds
+        self.step = step
+        self.names = names
+        self.cells = cells
+
+    def timezone_at(self, latitude: float, longitude: float) -> Optional[str]:
+        lat_min, lat_max, lon_min, lon_max = self.bounds
+        if not (lat_min <= latitude < lat_max and lon_min <= longitude < lon_max):
+            return None
+        row = int((latitude - lat_min) / self.step)
+        col = int((longitude - lon_min) / self.step)
+        rows, cols = self.cells.shape
+        if row >= rows or col >= cols:
+            return None
+        index = int(self.cells[row, col])
+        if index == BORDER:
+            return None
+        return self.names[index]
+
+
+def build_timezone_grid(tf: Any, bounds: Bounds, step: float) -> TimezoneGrid:
+    """
+    Sample TimezoneFinder on the grid lattice and keep a cell only when all four
+    of its corners agree.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounds
+    rows = int(round((lat_max - lat_min) / step))
+    cols = int(round((lon_max - lon_min) / step))
+    names: List[str] = []
+    name_index = {}
+    lattice = np.empty((rows + 1, cols + 1), dtype=np.uint16)
+    for i in range(rows + 1):
+        lat = min(lat_min + i * step, 90.0)
+        for j in range(cols + 1):
+            name = tf.timezone_at(lat=lat, lng=min(lon_min + j * step, 180.0))
+            if name is None:
+                lattice[i, j] = BORDER
+                continue
+            idx = name_index.get(name)
+            if idx is None:
+                idx = name_index[name] = len(names)
+                names.append(name)
+            lattice[i, j] = idx
+
+    corner = lattice[:-1, :-1]
+    interior = (
+        (corner == lattice[1:, :-1])
+        & (corner == lattice[:-1, 1:])
+        & (corner == lattice[1:, 1:])
+    )
+    cells = np.where(interior, corner, BORDER).astype(np.uint16)
+    return TimezoneGrid(bounds, step, names, cells)
+
+
+class TimezoneResolver:
+    """
+    Grid-first timezone resolution with a lazily-initialised TimezoneFinder
+    fallback.  ``warm_up`` loads (or builds) both ahead of the first request.
+    """
+
+    def __init__(self, path: Optional[str], bounds: Bounds, step: float) -> None:
+        self._path = path
+        self._bounds = bounds
+        self._step = step
+        self._grid: Optional[TimezoneGrid] = None
+        self._tf: Optional[Any] = None
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    def _meta_path(self) -> str:
+        return os.path.splitext(self._path)[0] + ".json"
+
+    def _load(self) -> Optional[TimezoneGrid]:
+        if not self._path or not os.path.exists(self._path):
+            return None
+        try:
+            with open(self._meta_path(), encoding="utf-8") as fh:
+                meta = json.load(fh)
+            if meta.get("version") != GRID_FORMAT_VERSION:
+                return None
+            bounds = tuple(meta["bounds"])
+            if bounds != tuple(self._bounds) or meta["step"] != self._step:
+                return None
+            cells = np.load(self._path, mmap_mode="r")
+            return TimezoneGrid(bounds, meta["step"], meta["names"], cells)
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning("Ignoring unreadable timezone grid %s: %s", self._path, exc)
+            return None
+
+    def _save(self, grid: TimezoneGrid) -> None:
+        if not self._path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fh:
+                np.save(fh, grid.cells)
+            meta = {
+                "version": GRID_FORMAT_VERSION,
+                "bounds": list(grid.bounds),
+                "step": grid.step,
+                "names": grid.names,
+            }
+            tmp_meta = f"{self._meta_path()}.{os.getpid()}.tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as fh:
+                json.dump(meta, fh)
+            os.replace(tmp_meta, self._meta_path())
+            os.replace(tmp_path, self._path)
+        except OSError as exc:
+            logger.warning("Could not persist timezone grid %s: %s", self._path, exc)
+
+    def _finder(self) -> Optional[Any]:
+        if not TZ_AVAILABLE:
+            return None
+        if self._tf is None:
+            with self._lock:
+                if self._tf is None:
+                    self._tf = TimezoneFinder()
+        return self._tf
+
+    def grid(self) -> Optional[TimezoneGrid]:
+        if self._grid is None:
+            tf = self._finder()
+            if tf is None:
+                return None
+            with self._lock:
+                if self._grid is None:
+                    grid = self._load()
+                    if grid is None:
+                        grid = build_timezone_grid(tf, self._bounds, self._step)
+                        self._save(grid)
+                    self._grid = grid
+        return self._grid
+
+    def warm_up(self) -> None:
+        grid = self.grid()
+        if grid is not None:
+            logger.info(
+                "Timezone grid ready: %dx%d cells, %d zones", *grid.cells.shape, len(grid.names)
+            )
+
+    def timezone_at(self, latitude: float, longitude: float) -> Optional[str]:
+        grid = self.grid()
+        if grid is not None:
+            name = grid.timezone_at(latitude, longitude)
+            if name is not None:
+                return name
+        tf = self._finder()
+        if tf is None:
+            return None
+        self.fallbacks += 1
+        return tf.timezone_at(lat=latitude, lng=longitude)
+
+
+timezone_resolver = TimezoneResolver(
+    settings.PANCHANGA_TZ_GRID_PATH,
+    parse_bounds(settings.PANCHANGA_TZ_GRID_BOUNDS),
+    settings.PANCHANGA_TZ_GRID_STEP,
+)
@@ -1,19 +1,44 @@
 """
 WebSocket Connection Manager for Real-time Communication
 """
-from typing import Dict, List, Set, Optional, Callable, Awaitable
+from typing import Deque, Dict, Iterable, List, Set, Optional, Callable, Awaitable, Tuple, Union
+from collections import deque
 from fastapi import WebSocket
 from datetime import datetime
-import json
 import logging
 import asyncio
+import os
+import re
+import socket
+import time
+import uuid
 import redis.asyncio as redis
 from redis.exceptions import RedisError
 from app.core.config import settings
+from app.services.presence_service import (
+    PRESENCE_KEY,
+    PRESENCE_RELEASE_SCRIPT,
+    PRESENCE_SEEN_KEY,
+    PresenceService,
+)
+from app.utils import json_codec
 from app.utils.logging_config import get_correlation_id, set_correlation_id
 
 logger = logging.getLogger(__name__)
 
+# Cluster-wide room membership sets are refreshed on every join; a crashed pod's
+# members age out after this long instead of lingering forever.
+ROOM_MEMBERS_TTL_SECONDS = 86400
+
+# Offline messages live in a per-user Redis stream (offline_stream:{id}); the
+# last replayed entry id is kept in offline_cursor:{id}.  Both keys share one
+# TTL, refreshed together on every append.
+OFFLINE_QUEUE_TTL_SECONDS = 86400 * 7
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+# Every instance subscribes here; one PUBLISH reaches all local fan-outs.
+BROADCAST_CHANNEL = "broadcast"
+
 # MON-02: Prometheus metrics for active WebSocket connections
 try:
     from prometheus_client import Counter, Gauge, Histogram
@@ -34,50 +59,339 @@ try:
         "savitara_ws_messages_sent_total",
         "Total WebSocket messages sent to clients",
     )
+    WS_SEND_QUEUE_DEPTH = Gauge(
+        "savitara_ws_send_queue_depth",
+        "Messages waiting in per-connection WebSocket send queues",
+    )
+    WS_MESSAGES_DROPPED = Counter(
+        "savitara_ws_messages_dropped_total",
+        "WebSocket messages dropped before reaching the client",
+        ["reason"],
+    )
+    WS_SLOW_CONSUMER_EVICTIONS = Counter(
+        "savitara_ws_slow_consumer_evictions_total",
+        "WebSocket connections closed for not keeping up with their send queue",
+    )
     _METRICS_ENABLED = True
 except ImportError:  # pragma: no cover
     _METRICS_ENABLED = False
     logger.warning("prometheus_client not installed — WS metrics disabled")
 
 
+# Ephemeral events: a newer one replaces a still-queued one with the same key,
+# and they are the first to go when a send queue overflows.
+DROPPABLE_EVENT_TYPES = frozenset({"typing_indicator", "presence_update", "pong"})
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+
+
+def _coalesce_key(message: dict) -> Optional[tuple]:
+    event_type = message.get("type")
+    if event_type not in DROPPABLE_EVENT_TYPES:
+        return None
+    return (event_type, message.get("conversation_id"), message.get("user_id"))
+
+
+class Frame:
+    """A WebSocket message serialized once and shared by every delivery path.
+
+    ``text`` is what goes to ``send_text``, Redis and the offline stream;
+    ``message`` is only decoded for sockets that still take ``send_json``.
+    Over pub/sub a frame travels as ``<header JSON>\n<text>`` so routing data
+    (target user, room excludes, coalesce key) never requires re-encoding it.
+    """
+
+    __slots__ = ("_message", "_text", "coalesce_key")
+
+    def __init__(
+        self,
+        message: Optional[dict] = None,
+        text: Optional[str] = None,
+        coalesce_key: Optional[tuple] = None,
+    ) -> None:
+        self._message = message
+        self._text = text
+        self.coalesce_key = coalesce_key
+
+    @classmethod
+    def encode(cls, message: dict) -> "Frame":
+        return cls(message, json_codec.dumps(message), _coalesce_key(message))
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = json_codec.dumps(self._message)
+        return self._text
+
+    @property
+    def message(self) -> dict:
+        if self._message is None:
+            self._message = json_codec.loads(self._text)
+        return self._message
+
+    def pack(self, **header) -> str:
+        if self.coalesce_key is not None:
+            header["ck"] = list(self.coalesce_key)
+        return f"{json_codec.dumps(header)}\n{self.text}"
+
+    @classmethod
+    def unpack(cls, raw: str) -> Tuple[dict, "Frame"]:
+        head, sep, body = raw.partition("\n")
+        if not sep:
+            raise ValueError("frame header missing")
+        header = json_codec.loads(head)
+        key = header.pop("ck", None)
+        return header, cls(text=body, coalesce_key=tuple(key) if key else None)
+
+    def with_offline_id(self, entry_id: str) -> "Frame":
+        """Append ``offline_id`` to an encoded JSON object without decoding it."""
+        text = self.text.rstrip()
+        if not text.endswith("}"):
+            return self
+        sep = "" if text[:-1].rstrip().endswith("{") else ","
+        return Frame(
+            text=f'{text[:-1]}{sep}"offline_id":{json_codec.dumps(entry_id)}}}',
+            coalesce_key=self.coalesce_key,
+        )
+
+
+class ConnectionSender:
+    """Bounded outbound queue drained by one writer task per WebSocket.
+
+    Producers (the Redis listener, room fan-out, broadcasts) only enqueue, so a
+    stalled client delays nobody but itself.  ``on_evict(user_id, reason,
+    pending)`` is called once when the connection is judged too slow; *pending*
+    holds the undelivered non-droppable frames, including one refused by a
+    full queue.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        websocket: WebSocket,
+        on_evict: Callable[[str, str, List[Frame]], None],
+        *,
+        max_size: int = 256,
+        overflow_policy: str = "drop_oldest",
+        slow_timeout: float = 10.0,
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown WebSocket overflow policy: {overflow_policy}")
+        self.user_id = user_id
+        self.websocket = websocket
+        self._on_evict = on_evict
+        self._max_size = max(1, max_size)
+        self._overflow_policy = overflow_policy
+        self._slow_timeout = slow_timeout
+        # Entries are [coalesce_key, frame]; the key is None for regular
+        # messages.  _coalesce maps queued droppable keys to their entry.
+        self._queue: Deque[list] = deque()
+        self._coalesce: Dict[tuple, list] = {}
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._full_since: Optional[float] = None
+        self._closed = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, frame: Union[Frame, dict]) -> bool:
+        """Queue *frame* for the writer; returns False if it was dropped."""
+        if self._closed:
+            return False
+        if isinstance(frame, dict):
+            frame = Frame.encode(frame)
+        key = frame.coalesce_key
+        if key is not None and key in self._coalesce:
+            self._coalesce[key][1] = frame
+            self._record_drop("coalesced")
+            return True
+        if len(self._queue) >= self._max_size and not self._make_room(frame):
+            return False
+        entry = [key, frame]
+        self._queue.append(entry)
+        if key is not None:
+            self._coalesce[key] = entry
+        if _METRICS_ENABLED:
+            WS_SEND_QUEUE_DEPTH.inc()
+        self._drained.clear()
+        self._wakeup.set()
+        return True
+
+    async def wait_drained(self) -> bool:
+        """Wait until everything queued so far is written; False if the writer stopped."""
+        await self._drained.wait()
+        return not self._closed
+
+    def _make_room(self, incoming: Frame) -> bool:
+        now = time.monotonic()
+        if self._full_since is None:
+            self._full_since = now
+        if self._overflow_policy == "disconnect" or now - self._full_since >= self._slow_timeout:
+            self._evict("queue_full", incoming=incoming)
+            return False
+        if incoming.coalesce_key is not None or self._overflow_policy == "drop_newest":
+            self._record_drop("overflow")
+            return False
+        # drop_oldest: only droppable events are sacrificed.  A queue full of
+        # regular messages means the client is too slow; evict so the backlog
+        # goes to the offline stream instead of being lost.
+        victim = next((e for e in self._queue if e[0] is not None), None)
+        if victim is None:
+            self._evict("queue_full", incoming=incoming)
+            return False
+        self._queue.remove(victim)
+        self._forget(victim)
+        self._record_drop("overflow")
+        return True
+
+    def _forget(self, entry: list) -> None:
+        if entry[0] is not None:
+            self._coalesce.pop(entry[0], None)
+        if _METRICS_ENABLED:
+            WS_SEND_QUEUE_DEPTH.dec()
+
+    @staticmethod
+    def _record_drop(reason: str) -> None:
+        if _METRICS_ENABLED:
+            WS_MESSAGES_DROPPED.labels(reason=reason).inc()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            entry = self._queue.popleft()
+            self._forget(entry)
+            if len(self._queue) < self._max_size:
+                self._full_since = None
+            try:
+                async with asyncio.timeout(self._slow_timeout):
+                    await self.websocket.send_text(entry[1].text)
+            except TimeoutError:
+                self._evict("send_timeout", in_flight=entry[1])
+                return
+            except RuntimeError as exc:
+                logger.error("WS writer send failed for %s: %s", self.user_id, exc)
+                self._evict("send_failed")
+                return
+            except Exception:
+                logger.exception("Unexpected WS writer failure for %s", self.user_id)
+                self._evict("send_failed")
+                return
+            if not self._queue:
+                self._drained.set()
+
+    def _evict(
+        self,
+        reason: str,
+        *,
+        in_flight: Optional[Frame] = None,
+        incoming: Optional[Frame] = None,
+    ) -> None:
+        """Close the sender and hand every undelivered regular frame to ``on_evict``.
+
+        *in_flight* is a frame already taken off the queue whose send did not
+        complete; *incoming* is one that was refused because the queue is full.
+        """
+        if self._closed:
+            return
+        frames = [entry[1] for entry in self._queue]
+        if in_flight is not None:
+            frames.insert(0, in_flight)
+        if incoming is not None:
+            frames.append(incoming)
+        pending = [frame for frame in frames if frame.coalesce_key is None]
+        self.close()
+        if _METRICS_ENABLED and reason != "send_failed":
+            WS_SLOW_CONSUMER_EVICTIONS.inc()
+        self._on_evict(self.user_id, reason, pending)
+
+    def close(self) -> None:
+        """Stop the writer and discard anything still queued."""
+        if self._closed:
+            return
+        self._closed = True
+        if _METRICS_ENABLED and self._queue:
+            WS_SEND_QUEUE_DEPTH.dec(len(self._queue))
+        self._queue.clear()
+        self._coalesce.clear()
+        self._drained.set()
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
+
+# Pub/sub dispatch target: (channel, routing header, frame).
+FrameHandler = Callable[[str, dict, Frame], Awaitable[None]]
+
+
 class RedisRealtimeTransport:
     """Encapsulates Redis Pub/Sub + offline queue concerns for WebSocket delivery."""
 
-    def __init__(self) -> None:
+    def __init__(self, mode: str = "user", pod_id: Optional[str] = None) -> None:
         self.redis_client: Optional[redis.Redis] = None
         self.pubsub: Optional[redis.client.PubSub] = None
         self.listener_task: Optional[asyncio.Task] = None
 
+        # "user": SUBSCRIBE user:{id} per connection.  "pod": this instance only
+        # listens on ws:pod:{pod_id}; senders look the user up in PRESENCE_KEY.
+        self.mode = mode
+        self.pod_id = pod_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+    @property
+    def pod_routing(self) -> bool:
+        return self.mode == "pod"
+
+    @staticmethod
+    def pod_channel(pod_id: str) -> str:
+        return f"ws:pod:{pod_id}"
+
     async def connect(self) -> None:
         if self.redis_client:
             return
 
         self.redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
         self.pubsub = self.redis_client.pubsub()
-        await self.pubsub.subscribe("system:heartbeat")
+        await self.pubsub.subscribe("system:heartbeat", BROADCAST_CHANNEL)
+        if self.pod_routing:
+            await self.pubsub.subscribe(self.pod_channel(self.pod_id))
 
     async def _process_pubsub_message(
         self,
         message: dict,
-        dispatch_user_message: Callable[[str, dict], Awaitable[None]],
+        dispatch_user_message: FrameHandler,
+        dispatch_room_message: Optional[FrameHandler] = None,
+        dispatch_pod_message: Optional[FrameHandler] = None,
+        dispatch_broadcast_message: Optional[FrameHandler] = None,
     ) -> None:
         if message.get("type") != "message":
             return
 
         raw_data = message.get("data")
         try:
-            data = json.loads(raw_data)
-        except json.JSONDecodeError:
+            header, frame = Frame.unpack(raw_data)
+        except (TypeError, ValueError):
             logger.error("Failed to decode Redis message: %s", raw_data)
             return
 
         channel = message.get("channel", "")
         if channel.startswith("user:"):
-            await dispatch_user_message(channel, data)
+            await dispatch_user_message(channel, header, frame)
+        elif channel.startswith("room:") and dispatch_room_message:
+            await dispatch_room_message(channel, header, frame)
+        elif channel.startswith("ws:pod:") and dispatch_pod_message:
+            await dispatch_pod_message(channel, header, frame)
+        elif channel == BROADCAST_CHANNEL and dispatch_broadcast_message:
+            await dispatch_broadcast_message(channel, header, frame)
 
     def start_listener(
         self,
-        dispatch_user_message: Callable[[str, dict], Awaitable[None]],
+        dispatch_user_message: FrameHandler,
+        dispatch_room_message: Optional[FrameHandler] = None,
+        dispatch_pod_message: Optional[FrameHandler] = None,
+        dispatch_broadcast_message: Optional[FrameHandler] = None,
     ) -> None:
         if not self.pubsub or self.listener_task:
             return
@@ -87,7 +401,13 @@ class RedisRealtimeTransport:
                 return
             try:
                 async for message in self.pubsub.listen():
-                    await self._process_pubsub_message(message, dispatch_user_message)
+                    await self._process_pubsub_message(
+                        message,
+                        dispatch_user_message,
+                        dispatch_room_message,
+                        dispatch_pod_message,
+                        dispatch_broadcast_message,
+                    )
             except (RedisError, RuntimeError) as exc:
                 logger.error("Redis listener error: %s", exc)
             except Exception:
@@ -103,26 +423,120 @@ class RedisRealtimeTransport:
         if self.pubsub:
             await self.pubsub.unsubscribe(f"user:{user_id}")
 
-    async def publish_user_message(self, user_id: str, message_str: str) -> int:
+    async def publish_user_message(self, user_id: str, frame: Frame) -> int:
         if not self.redis_client:
             return 0
-        return await self.redis_client.publish(f"user:{user_id}", message_str)
+        if not self.pod_routing:
+            return await self.redis_client.publish(f"user:{user_id}", frame.pack())
 
-    async def queue_offline_message(self, user_id: str, message_str: str) -> None:
+        pod_id = await self.redis_client.hget(PRESENCE_KEY, user_id)
+        if not pod_id:
+            return 0
+        receivers = await self.redis_client.publish(
+            self.pod_channel(pod_id), frame.pack(user_id=user_id)
+        )
+        if receivers == 0:
+            # The pod is gone; drop its stale entry so later sends queue directly.
+            await self.redis_client.eval(
+                PRESENCE_RELEASE_SCRIPT, 2, PRESENCE_KEY, PRESENCE_SEEN_KEY, user_id, pod_id
+            )
+        return receivers
+
+    async def join_room(self, room_id: str, user_id: str, *, subscribe: bool) -> None:
+        """Record cluster membership; subscribe this pod when it gains its first local member."""
+        if not self.redis_client:
+            return
+        if subscribe and self.pubsub:
+            await self.pubsub.subscribe(f"room:{room_id}")
+        members_key = f"room_members:{room_id}"
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.sadd(members_key, user_id)
+            pipe.expire(members_key, ROOM_MEMBERS_TTL_SECONDS)
+            await pipe.execute()
+
+    async def leave_room(self, room_id: str, user_id: str, *, unsubscribe: bool) -> None:
         if not self.redis_client:
             return
-        queue_key = f"offline_queue:{user_id}"
-        await self.redis_client.rpush(queue_key, message_str)
-        await self.redis_client.expire(queue_key, 86400 * 7)
+        await self.redis_client.srem(f"room_members:{room_id}", user_id)
+        if unsubscribe and self.pubsub:
+            await self.pubsub.unsubscribe(f"room:{room_id}")
 
-    async def get_offline_messages(self, user_id: str) -> list[str]:
+    async def get_room_members(self, room_id: str) -> Set[str]:
+        if not self.redis_client:
+            return set()
+        return set(await self.redis_client.smembers(f"room_members:{room_id}"))
+
+    async def publish_room_message(self, room_id: str, frame: Frame, exclude: List[str]) -> int:
+        if not self.redis_client:
+            return 0
+        return await self.redis_client.publish(f"room:{room_id}", frame.pack(exclude=exclude))
+
+    async def publish_broadcast(self, frame: Frame, exclude: List[str]) -> int:
+        if not self.redis_client:
+            return 0
+        return await self.redis_client.publish(BROADCAST_CHANNEL, frame.pack(exclude=exclude))
+
+    async def queue_offline_message(self, user_id: str, message_str: str) -> None:
+        await self.queue_offline_messages(user_id, [message_str])
+
+    async def queue_offline_messages(self, user_id: str, message_strs: List[str]) -> None:
+        """Append to the user's offline stream (capped, TTL refreshed) in one round-trip.
+
+        The replay cursor's TTL is refreshed alongside the stream's so a user
+        who stays away longer than the TTL does not lose it while messages
+        keep arriving.
+        """
+        if not self.redis_client or not message_strs:
+            return
+        stream_key = f"offline_stream:{user_id}"
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for message_str in message_strs:
+                pipe.xadd(
+                    stream_key,
+                    {"m": message_str},
+                    maxlen=settings.WS_OFFLINE_QUEUE_MAX_LEN,
+                    approximate=True,
+                )
+            pipe.expire(stream_key, OFFLINE_QUEUE_TTL_SECONDS)
+            pipe.expire(f"offline_cursor:{user_id}", OFFLINE_QUEUE_TTL_SECONDS)
+            await pipe.execute()
+
+    async def read_offline_page(
+        self, user_id: str, after_id: str, count: int
+    ) -> List[Tuple[str, str]]:
+        """Return up to *count* ``(entry_id, message_str)`` pairs newer than *after_id*."""
         if not self.redis_client:
             return []
-        return await self.redis_client.lrange(f"offline_queue:{user_id}", 0, -1)
+        entries = await self.redis_client.xrange(
+            f"offline_stream:{user_id}", min=f"({after_id}", max="+", count=count
+        )
+        return [(entry_id, fields.get("m", "")) for entry_id, fields in entries]
 
-    async def clear_offline_messages(self, user_id: str) -> None:
-        if self.redis_client:
-            await self.redis_client.delete(f"offline_queue:{user_id}")
+    async def get_offline_cursor(self, user_id: str) -> Optional[str]:
+        if not self.redis_client:
+            return None
+        return await self.redis_client.get(f"offline_cursor:{user_id}")
+
+    async def ack_offline(self, user_id: str, entry_id: str, *, trim: bool) -> None:
+        """Store the replay cursor; with *trim*, drop entries before it from the stream."""
+        if not self.redis_client:
+            return
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(f"offline_cursor:{user_id}", entry_id, ex=OFFLINE_QUEUE_TTL_SECONDS)
+            if trim:
+                pipe.xtrim(f"offline_stream:{user_id}", minid=entry_id)
+            await pipe.execute()
+
+    async def pop_legacy_offline_messages(self, user_id: str) -> List[str]:
+        """Atomically take whatever is left in the pre-stream ``offline_queue:{id}`` list."""
+        if not self.redis_client:
+            return []
+        legacy_key = f"offline_queue:{user_id}"
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.lrange(legacy_key, 0, -1)
+            pipe.delete(legacy_key)
+            messages, _ = await pipe.execute()
+        return messages
 
 
 class ConnectionManager:
@@ -131,17 +545,26 @@ class ConnectionManager:
 
     Architecture:
     - Persistence: MongoDB (handled by services)
-    - Real-time: Redis Pub/Sub
-    - Offline Queue: Redis Lists
+    - Real-time: Redis Pub/Sub (each message serialized once, see :class:`Frame`)
+    - Offline Queue: Redis Streams
     """
 
     def __init__(self):
         # User ID -> WebSocket mapping (Local to this instance)
         self.active_connections: Dict[str, WebSocket] = {}
 
-        # Room-based connections (for group features)
+        # Room-based connections (for group features): room -> members connected
+        # to this instance.  Cluster-wide membership lives in Redis sets.
         self.rooms: Dict[str, Set[str]] = {}
-        self._transport = RedisRealtimeTransport()
+        self._transport = RedisRealtimeTransport(
+            mode=settings.WS_PUBSUB_MODE, pod_id=settings.WS_POD_ID
+        )
+        self.presence = PresenceService(self._transport.pod_id, self.active_connections)
+        self._background_tasks: Set[asyncio.Task] = set()
+        # User ID -> writer for sockets registered through connect().
+        self._senders: Dict[str, ConnectionSender] = {}
+        # Pod mode: client-supplied replay cursor held until the presence flush.
+        self._replay_from: Dict[str, Optional[str]] = {}
 
     @property
     def redis_client(self) -> Optional[redis.Redis]:
@@ -150,6 +573,7 @@ class ConnectionManager:
     @redis_client.setter
     def redis_client(self, value: Optional[redis.Redis]) -> None:
         self._transport.redis_client = value
+        self.presence.redis_client = value
 
     @property
     def pubsub(self) -> Optional[redis.client.PubSub]:
@@ -175,11 +599,64 @@ class ConnectionManager:
             # Never fail the main flow due to logging
             logger.debug(f"ws_event {event} {fields}")
 
+    def _spawn(self, coro: Awaitable[None], what: str) -> None:
+        """Run a fire-and-forget Redis call, keeping a reference until it finishes."""
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError as e:
+            coro.close()
+            logger.warning(f"Failed to schedule {what}: {e}")
+            return
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _write(self, user_id: str, websocket: WebSocket, frame: Frame) -> None:
+        """Hand *frame* to the connection's writer task.
+
+        Sockets that were not registered through :meth:`connect` have no writer
+        and are written inline with ``send_json``.
+        """
+        sender = self._senders.get(user_id)
+        if sender is not None and sender.websocket is websocket:
+            sender.enqueue(frame)
+            return
+        await websocket.send_json(frame.message)
+
+    def _evict_slow_consumer(self, user_id: str, reason: str, pending: List[Frame]) -> None:
+        """Drop a connection whose writer cannot keep up; keep its backlog for replay."""
+        sender = self._senders.get(user_id)
+        websocket = sender.websocket if sender else self.active_connections.get(user_id)
+        logger.warning(f"Evicting slow WebSocket consumer {user_id} ({reason})")
+        self._log_event("slow_consumer_evicted", user_id=user_id, reason=reason, pending=len(pending))
+        self.disconnect(user_id)
+        if websocket is not None:
+            self._spawn(self._close_socket(websocket), f"close slow socket {user_id}")
+        if pending and self.redis_client:
+            self._spawn(self._requeue_offline(user_id, pending), f"requeue backlog {user_id}")
+
+    @staticmethod
+    async def _close_socket(websocket: WebSocket) -> None:
+        try:
+            async with asyncio.timeout(5):
+                await websocket.close(code=1013, reason="Client too slow")
+        except Exception as exc:
+            logger.debug(f"Closing slow WebSocket failed: {exc}")
+
+    async def _requeue_offline(self, user_id: str, frames: List[Frame]) -> None:
+        await self._transport.queue_offline_messages(user_id, [frame.text for frame in frames])
+
     async def connect_redis(self):
         """Initialize Redis connection for Pub/Sub"""
         try:
             await self._transport.connect()
-            self._transport.start_listener(self._handle_user_message)
+            self._transport.start_listener(
+                self._handle_user_message,
+                self._handle_room_message,
+                self._handle_pod_message,
+                self._handle_broadcast_message,
+            )
+            self.presence.redis_client = self._transport.redis_client
+            self.presence.start(self._on_presence_registered, settings.WS_PRESENCE_FLUSH_INTERVAL)
             logger.info("WebSocket Manager connected to Redis")
             self._log_event("redis_connected")
         except RedisError as e:
@@ -189,14 +666,14 @@ class ConnectionManager:
             logger.exception("Unexpected Redis connection failure")
             self._log_event("redis_connect_failed", error="unexpected_error")
 
-    async def _handle_user_message(self, channel: str, data: dict) -> None:
+    async def _handle_user_message(self, channel: str, header: dict, frame: Frame) -> None:
         """Handle a message for a specific user channel"""
         user_id = channel.split(":", 1)[1]
         websocket = self.active_connections.get(user_id)
 
         if websocket:
             try:
-                await websocket.send_json(data)
+                await self._write(user_id, websocket, frame)
             except RuntimeError as e:
                 logger.error(f"Error sending to {user_id}: {e}")
                 self._log_event("deliver_failed", user_id=user_id, error=str(e))
@@ -204,20 +681,79 @@ class ConnectionManager:
                 logger.exception("Unexpected websocket send failure for user %s", user_id)
                 self._log_event("deliver_failed", user_id=user_id, error="unexpected_error")
 
-    async def connect(self, user_id: str, websocket: WebSocket):
-        """Accept new WebSocket connection"""
+    async def _handle_pod_message(self, channel: str, header: dict, frame: Frame) -> None:
+        """Deliver a ``ws:pod:{id}`` frame routed here via the presence map."""
+        user_id = header.get("user_id")
+        if not user_id:
+            return
+        if user_id in self.active_connections:
+            await self._handle_user_message(f"user:{user_id}", header, frame)
+            return
+        # Disconnected after the sender read the presence map: keep it for replay.
+        try:
+            await self._transport.queue_offline_message(user_id, frame.text)
+            self._log_event("queued", user_id=user_id, channel=channel)
+        except RedisError as exc:
+            logger.error("Failed to queue pod-routed message for %s: %s", user_id, exc)
+
+    async def _on_presence_registered(self, user_ids: List[str]) -> None:
+        """Drain offline queues once the presence map routes new users here.
+
+        Messages sent between connect and the presence flush were queued, so
+        the drain has to wait until the user is routable.  User mode drains
+        on connect instead.
+        """
+        if not self._transport.pod_routing:
+            return
+        for user_id in user_ids:
+            last_offline_id = self._replay_from.pop(user_id, None)
+            if user_id in self.active_connections:
+                self._spawn(
+                    self.check_offline_queue(user_id, last_offline_id),
+                    f"offline replay {user_id}",
+                )
+
+    async def connect(
+        self, user_id: str, websocket: WebSocket, last_offline_id: Optional[str] = None
+    ):
+        """Accept new WebSocket connection.
+
+        *last_offline_id* is the last offline-stream entry the client acked;
+        replay resumes after it instead of after the server-side cursor.
+        """
         await websocket.accept()
         self.active_connections[user_id] = websocket
+        previous = self._senders.pop(user_id, None)
+        if previous is not None:
+            previous.close()
+        self._senders[user_id] = ConnectionSender(
+            user_id,
+            websocket,
+            self._evict_slow_consumer,
+            max_size=settings.WS_SEND_QUEUE_SIZE,
+            overflow_policy=settings.WS_SEND_OVERFLOW_POLICY,
+            slow_timeout=settings.WS_SLOW_CONSUMER_TIMEOUT,
+        )
 
         if _METRICS_ENABLED:
             WS_CONNECT_TOTAL.inc()
             WS_ACTIVE_CONNECTIONS.set(len(self.active_connections))
 
         if self.pubsub:
+            # Registered cluster-wide by the next presence flush; no Redis
+            # round-trip on the connect path.
+            self.presence.mark_online(user_id)
+        if self.pubsub and self._transport.pod_routing:
+            # The flush also drains the offline queue once the user is routable.
+            self._replay_from[user_id] = last_offline_id
+        elif self.pubsub:
             # Subscribe to this user's channel on Redis
             await self._transport.subscribe_user(user_id)
-            # Check Offline Queue
-            await self.check_offline_queue(user_id)
+            # Replay the offline stream in the background, paced by the writer
+            self._spawn(
+                self.check_offline_queue(user_id, last_offline_id),
+                f"offline replay {user_id}",
+            )
 
         logger.info(
             f"User {user_id} connected. Total local connections: {len(self.active_connections)}"
@@ -239,23 +775,65 @@ class ConnectionManager:
             },
         )
 
-    async def check_offline_queue(self, user_id: str):
-        """Deliver messages stored while user was offline"""
+    async def check_offline_queue(self, user_id: str, last_offline_id: Optional[str] = None):
+        """Replay messages stored while the user was offline.
+
+        The stream is read in pages of WS_OFFLINE_REPLAY_PAGE_SIZE after the
+        client's last-acked id (or the server cursor); the next page is only
+        fetched once the socket writer has flushed the previous one.  Entries
+        added during the replay are picked up by later pages; each flushed
+        page advances the cursor and is trimmed from the stream, so an
+        expired cursor can never re-deliver it.
+        """
         if not self.redis_client:
             return
 
-        messages = await self._transport.get_offline_messages(user_id)
-        if not messages:
+        legacy = await self._transport.pop_legacy_offline_messages(user_id)
+        if legacy:
+            await self._deliver_offline_messages(user_id, [(None, m) for m in legacy])
+
+        if last_offline_id and _STREAM_ID_RE.match(last_offline_id):
+            cursor = last_offline_id
+        else:
+            cursor = await self._transport.get_offline_cursor(user_id) or "0-0"
+
+        page_size = settings.WS_OFFLINE_REPLAY_PAGE_SIZE
+        delivered = len(legacy)
+        while user_id in self.active_connections:
+            page = await self._transport.read_offline_page(user_id, cursor, page_size)
+            if not page:
+                break
+            await self._deliver_offline_messages(user_id, page)
+            sender = self._senders.get(user_id)
+            if sender is not None and not await sender.wait_drained():
+                break
+            cursor = page[-1][0]
+            await self._transport.ack_offline(user_id, cursor, trim=True)
+            delivered += len(page)
+            if len(page) < page_size:
+                break
+
+        if not delivered:
             logger.debug(f"No offline messages for {user_id}")
             return
+        logger.info(f"Delivered {delivered} offline messages to {user_id}")
+        self._log_event("offline_delivered", user_id=user_id, count=delivered, cursor=cursor)
 
-        await self._deliver_offline_messages(user_id, messages)
-        await self._transport.clear_offline_messages(user_id)
-        logger.info(f"Delivered {len(messages)} offline messages to {user_id}")
-        self._log_event("offline_delivered", user_id=user_id, count=len(messages))
+    async def ack_offline(self, user_id: str, entry_id: Optional[str]) -> None:
+        """Client acknowledgement: advance the cursor and trim acked entries."""
+        if not self.redis_client or not entry_id or not _STREAM_ID_RE.match(entry_id):
+            return
+        try:
+            await self._transport.ack_offline(user_id, entry_id, trim=True)
+        except RedisError as exc:
+            logger.error("Offline ack failed for %s: %s", user_id, exc)
 
     def disconnect(self, user_id: str):
         """Remove WebSocket connection"""
+        sender = self._senders.pop(user_id, None)
+        if sender is not None:
+            sender.close()
+        self._replay_from.pop(user_id, None)
         if user_id in self.active_connections:
             del self.active_connections[user_id]
             logger.info(f"User {user_id} disconnected.")
@@ -266,6 +844,8 @@ class ConnectionManager:
                 WS_ACTIVE_CONNECTIONS.set(len(self.active_connections))
 
         if self.pubsub:
+            self.presence.mark_offline(user_id)
+        if self.pubsub and not self._transport.pod_routing:
             # Unsubscribe in background
             try:
                 loop = asyncio.get_event_loop()
@@ -274,8 +854,16 @@ class ConnectionManager:
                 # Event loop not running or other runtime errors
                 logger.warning(f"Failed to unsubscribe user {user_id}: {e}")
 
-        for room_users in self.rooms.values():
-            room_users.discard(user_id)
+        for room_id in [r for r, users in self.rooms.items() if user_id in users]:
+            self.leave_room(room_id, user_id)
+
+    @staticmethod
+    def _with_correlation_id(message: dict) -> dict:
+        enriched = dict(message)
+        correlation_id = enriched.get("correlation_id") or get_correlation_id()
+        if correlation_id:
+            enriched["correlation_id"] = correlation_id
+        return enriched
 
     async def send_personal_message(self, user_id: str, message: dict) -> str:
         """Send message to specific user via Redis Pub/Sub.
@@ -284,38 +872,39 @@ class ConnectionManager:
         or "local" (no Redis, sent only to local connection). Emits lightweight logs for observability.
         """
 
-        enriched = dict(message)
-        correlation_id = enriched.get("correlation_id") or get_correlation_id()
-        if correlation_id:
-            enriched["correlation_id"] = correlation_id
+        frame = Frame.encode(self._with_correlation_id(message))
 
         if not self.redis_client:
-            return await self._deliver_local(user_id, enriched)
+            return await self._deliver_local(user_id, frame)
 
-        message_str = json.dumps(enriched)
-        return await self._deliver_via_redis(user_id, enriched, message_str)
+        return await self._deliver_via_redis(user_id, frame)
 
-    async def _deliver_offline_messages(self, user_id: str, messages: list[str]) -> None:
+    async def _deliver_offline_messages(
+        self, user_id: str, entries: List[Tuple[Optional[str], str]]
+    ) -> None:
         websocket = self.active_connections.get(user_id)
         if not websocket:
             return
 
-        for msg_str in messages:
+        for entry_id, msg_str in entries:
             try:
-                await websocket.send_json(json.loads(msg_str))
-            except json.JSONDecodeError as exc:
+                frame = Frame(text=msg_str)
+                if entry_id:
+                    frame = frame.with_offline_id(entry_id)
+                await self._write(user_id, websocket, frame)
+            except ValueError as exc:
                 logger.error("Invalid queued message payload for %s: %s", user_id, exc)
             except RuntimeError as exc:
                 logger.error("Offline queue delivery runtime error for %s: %s", user_id, exc)
             except Exception:
                 logger.exception("Unexpected error while delivering offline queue for %s", user_id)
 
-    async def _deliver_local(self, user_id: str, message: dict) -> str:
+    async def _deliver_local(self, user_id: str, frame: Frame) -> str:
         websocket = self.active_connections.get(user_id)
         if not websocket:
             return "queued"
         try:
-            await websocket.send_json(message)
+            await self._write(user_id, websocket, frame)
             logger.debug(f"WS local delivery to {user_id}")
             self._log_event("local", user_id=user_id)
             return "local"
@@ -328,33 +917,33 @@ class ConnectionManager:
             self._log_event("local_failed", user_id=user_id, error="unexpected_error")
         return "queued"
 
-    async def _deliver_via_redis(self, user_id: str, message: dict, message_str: str) -> str:
+    async def _deliver_via_redis(self, user_id: str, frame: Frame) -> str:
         try:
-            subscriber_count = await self._transport.publish_user_message(user_id, message_str)
+            subscriber_count = await self._transport.publish_user_message(user_id, frame)
             if subscriber_count > 0:
                 self._log_event("delivered", user_id=user_id, channel=f"user:{user_id}")
                 if _METRICS_ENABLED:
                     WS_MESSAGES_SENT.inc()
                 return "delivered"
 
-            await self._transport.queue_offline_message(user_id, message_str)
+            await self._transport.queue_offline_message(user_id, frame.text)
             logger.info(f"WS queued message for offline user {user_id}")
             self._log_event("queued", user_id=user_id, channel=f"user:{user_id}")
             return "queued"
         except RedisError as exc:
             logger.error("Redis publish error for %s: %s", user_id, exc)
             self._log_event("publish_error", user_id=user_id, error=str(exc))
-            return await self._deliver_local_fallback(user_id, message)
+            return await self._deliver_local_fallback(user_id, frame)
         except Exception:
             logger.exception("Unexpected delivery pipeline failure for %s", user_id)
             return "queued"
 
-    async def _deliver_local_fallback(self, user_id: str, message: dict) -> str:
+    async def _deliver_local_fallback(self, user_id: str, frame: Frame) -> str:
         websocket = self.active_connections.get(user_id)
         if not websocket:
             return "queued"
         try:
-            await websocket.send_json(message)
+            await self._write(user_id, websocket, frame)
             self._log_event("local_fallback", user_id=user_id)
             return "local"
         except RuntimeError as exc:
@@ -380,30 +969,88 @@ class ConnectionManager:
         return await self.send_personal_message(user_id, message)
 
     async def broadcast(self, message: dict, exclude: List[str] = None):
-        """Broadcast message to all connected users (Local Implementation for Phase 2)"""
-        exclude = exclude or []
-        disconnected = []
-
-        # Ideally: Publish to 'broadcast' channel
-        for user_id, connection in self.active_connections.items():
-            if user_id not in exclude:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Failed to broadcast to {user_id}: {e}")
-                    disconnected.append(user_id)
-
-        for user_id in disconnected:
+        """Broadcast message to every connected user on every instance.
+
+        With Redis this is one PUBLISH on the ``broadcast`` channel and each
+        instance runs its own local fan-out; without it, only local sockets.
+        """
+        frame = Frame.encode(message)
+        exclude_set = set(exclude or ())
+
+        if self.redis_client:
+            try:
+                await self._transport.publish_broadcast(frame, sorted(exclude_set))
+                self._log_event("broadcast_published", excluded=len(exclude_set))
+                return
+            except RedisError as exc:
+                logger.error("Redis broadcast publish error: %s", exc)
+                self._log_event("broadcast_publish_error", error=str(exc))
+
+        await self._fan_out(self.active_connections.keys(), frame, exclude_set)
+
+    async def _handle_broadcast_message(self, channel: str, header: dict, frame: Frame) -> None:
+        """Fan a ``broadcast`` pub/sub frame out to every local socket."""
+        await self._fan_out(self.active_connections.keys(), frame, set(header.get("exclude") or ()))
+
+    async def _fan_out(self, user_ids: Iterable[str], frame: Frame, exclude: Set[str]) -> int:
+        """Deliver *frame* to the local sockets of *user_ids*; returns the recipient count.
+
+        Sockets with a writer task only get an enqueue.  Sockets without one
+        are written concurrently in chunks of WS_BROADCAST_CHUNK_SIZE, each send
+        capped at WS_SLOW_CONSUMER_TIMEOUT, so a slow client holds up at most
+        its own chunk.
+        """
+        inline: List[Tuple[str, WebSocket]] = []
+        recipients = 0
+        for user_id in list(user_ids):
+            if user_id in exclude:
+                continue
+            websocket = self.active_connections.get(user_id)
+            if websocket is None:
+                continue
+            recipients += 1
+            sender = self._senders.get(user_id)
+            if sender is not None and sender.websocket is websocket:
+                sender.enqueue(frame)
+            else:
+                inline.append((user_id, websocket))
+
+        failed: List[str] = []
+        chunk_size = max(1, settings.WS_BROADCAST_CHUNK_SIZE)
+        for start in range(0, len(inline), chunk_size):
+            chunk = inline[start:start + chunk_size]
+            results = await asyncio.gather(
+                *(self._send_inline(websocket, frame) for _, websocket in chunk),
+                return_exceptions=True,
+            )
+            for (user_id, _), result in zip(chunk, results, strict=True):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to deliver fan-out frame to {user_id}: {result!r}")
+                    failed.append(user_id)
+
+        for user_id in failed:
             self.disconnect(user_id)
+        return recipients
+
+    @staticmethod
+    async def _send_inline(websocket: WebSocket, frame: Frame) -> None:
+        async with asyncio.timeout(settings.WS_SLOW_CONSUMER_TIMEOUT):
+            await websocket.send_json(frame.message)
 
     def join_room(self, room_id: str, user_id: str):
         """Add user to a room.
 
         Signature kept as (room_id, user_id) to match existing tests/callers.
+        The first local member subscribes this instance to ``room:{room_id}``.
         """
-        if room_id not in self.rooms:
-            self.rooms[room_id] = set()
-        self.rooms[room_id].add(user_id)
+        members = self.rooms.setdefault(room_id, set())
+        first_local_member = not members
+        members.add(user_id)
+        if self.redis_client:
+            self._spawn(
+                self._transport.join_room(room_id, user_id, subscribe=first_local_member),
+                f"room join {room_id}",
+            )
         logger.info(f"User {user_id} joined room {room_id}")
 
     def leave_room(self, room_id: str, user_id: str):
@@ -413,38 +1060,90 @@ class ConnectionManager:
         """
         if room_id in self.rooms:
             self.rooms[room_id].discard(user_id)
-            if not self.rooms[room_id]:
+            last_local_member = not self.rooms[room_id]
+            if last_local_member:
                 del self.rooms[room_id]
+            if self.redis_client:
+                self._spawn(
+                    self._transport.leave_room(room_id, user_id, unsubscribe=last_local_member),
+                    f"room leave {room_id}",
+                )
             logger.info(f"User {user_id} left room {room_id}")
 
     async def send_to_room(
         self, room_id: str, message: dict, exclude: List[str] = None
     ):
-        """Send message to all users in a room"""
-        if room_id not in self.rooms:
-            return
+        """Send message to all users in a room.
+
+        With Redis this is a single PUBLISH on ``room:{room_id}``; every instance
+        with local members of the room fans it out to its own sockets.
+        """
+        frame = Frame.encode(self._with_correlation_id(message))
+        exclude_set = set(exclude or ())
+
+        if self.redis_client:
+            try:
+                await self._transport.publish_room_message(room_id, frame, sorted(exclude_set))
+                self._log_event("room_published", room_id=room_id)
+                return
+            except RedisError as exc:
+                logger.error("Redis room publish error for %s: %s", room_id, exc)
+                self._log_event("room_publish_error", room_id=room_id, error=str(exc))
 
-        exclude = exclude or []
-        for user_id in self.rooms[room_id]:
-            if user_id not in exclude:
-                await self.send_personal_message(user_id, message)
+        await self._fan_out_room(room_id, frame, exclude_set)
+
+    async def _handle_room_message(self, channel: str, header: dict, frame: Frame) -> None:
+        """Fan a ``room:{id}`` pub/sub frame out to this instance's members."""
+        room_id = channel.split(":", 1)[1]
+        await self._fan_out_room(room_id, frame, set(header.get("exclude") or ()))
+
+    async def _fan_out_room(self, room_id: str, frame: Frame, exclude: Set[str]) -> None:
+        await self._fan_out(self.rooms.get(room_id, ()), frame, exclude)
+
+    async def emit_to_room(
+        self,
+        room_id: str,
+        event: str,
+        payload: Optional[dict] = None,
+        exclude: Optional[List[str]] = None,
+    ) -> None:
+        """Event emitter counterpart of :meth:`emit_to_user` for rooms."""
+        message = {
+            "type": event,
+            **(payload or {}),
+            "timestamp": datetime.now().isoformat(),
+        }
+        await self.send_to_room(room_id, message, exclude)
 
     async def broadcast_to_room(self, room_id: str, message: dict, exclude: List[str] = None):
         """Backward-compatible alias used by older tests/callers."""
         await self.send_to_room(room_id, message, exclude)
 
-    def is_user_online(self, user_id: str) -> bool:
-        """Check if user is currently connected (Local)"""
-        return user_id in self.active_connections
+    async def is_user_online(self, user_id: str) -> bool:
+        """Check if user is connected to any instance"""
+        return await self.presence.is_online(user_id)
 
-    def get_online_users(self) -> List[str]:
-        """Get list of all online users (Local)"""
-        return list(self.active_connections.keys())
+    async def are_users_online(self, user_ids: Iterable[str]) -> Dict[str, bool]:
+        """Presence for many users in at most one Redis round-trip"""
+        return await self.presence.are_online(user_ids)
+
+    async def get_online_users(self) -> List[str]:
+        """Get list of users connected to any instance (falls back to local)"""
+        return await self.presence.online_users()
 
     def get_room_users(self, room_id: str) -> List[str]:
         """Get list of users in a room (Local)"""
         return list(self.rooms.get(room_id, set()))
 
+    async def get_room_members(self, room_id: str) -> List[str]:
+        """Get room members connected to any instance (falls back to local)."""
+        if self.redis_client:
+            try:
+                return list(await self._transport.get_room_members(room_id))
+            except RedisError as exc:
+                logger.error("Redis room membership lookup failed for %s: %s", room_id, exc)
+        return self.get_room_users(room_id)
+
 
 # Global connection manager instance
 manager = ConnectionManager()
@@ -537,6 +1236,11 @@ async def handle_booking_update(user_id: str, data: dict):
     await manager.send_personal_message(acharya_id, update_message)
 
 
+async def handle_offline_ack(user_id: str, data: dict):
+    """Client confirms offline-stream entries up to ``last_id`` were received."""
+    await manager.ack_offline(user_id, data.get("last_id"))
+
+
 async def handle_ping(user_id: str, data: dict):
     """Respond to client heartbeat ping."""
     await manager.send_personal_message(
@@ -555,6 +1259,7 @@ MESSAGE_HANDLERS = {
     "typing": handle_typing_indicator,
     "booking_update": handle_booking_update,
     "read_receipt": handle_read_receipt,
+    "offline_ack": handle_offline_ack,
     "ping": handle_ping,
 }
 
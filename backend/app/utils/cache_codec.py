@@ -0,0 +1,177 @@
+"""
+Binary value codec for the Redis cache.
+
+Every encoded value is ``header byte + body``:
+
+======  ===========================
+0x01    msgpack
+0x02    msgpack, zlib-compressed
+0x03    msgpack, zstd-compressed
+0x04    JSON, zlib-compressed
+0x05    JSON, zstd-compressed
+======  ===========================
+
+Uncompressed JSON has no header, so plain JSON text (what the cache stored
+before this codec) still decodes.  Bodies of at least ``compress_min_bytes``
+are compressed with zstd when ``zstandard`` is installed, zlib otherwise.
+
+The msgpack codec round-trips ``datetime``, ``date``, ``ObjectId``,
+``Decimal`` and ``UUID`` through ext types.  The JSON codec, used when
+msgpack is not installed, turns them into strings.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Union
+from uuid import UUID
+
+from bson import ObjectId
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+_MSGPACK = 0x01
+_MSGPACK_ZLIB = 0x02
+_MSGPACK_ZSTD = 0x03
+_JSON_ZLIB = 0x04
+_JSON_ZSTD = 0x05
+
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_OBJECTID = 3
+_EXT_DECIMAL = 4
+_EXT_UUID = 5
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):  # before date: datetime is a date subclass
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, ObjectId):
+        return msgpack.ExtType(_EXT_OBJECTID, obj.binary)
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, UUID):
+        return msgpack.ExtType(_EXT_UUID, obj.bytes)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Cannot cache value of type {type(obj).__name__}")
+
+
+_EXT_DECODERS: Dict[int, Callable[[bytes], Any]] = {
+    _EXT_DATETIME: lambda data: datetime.fromisoformat(data.decode()),
+    _EXT_DATE: lambda data: date.fromisoformat(data.decode()),
+    _EXT_OBJECTID: ObjectId,
+    _EXT_DECIMAL: lambda data: Decimal(data.decode()),
+    _EXT_UUID: lambda data: UUID(bytes=data),
+}
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    decoder = _EXT_DECODERS.get(code)
+    return decoder(data) if decoder else msgpack.ExtType(code, data)
+
+
+def _unpack(body: bytes) -> Any:
+    if msgpack is None:
+        raise ValueError("msgpack-encoded cache value but msgpack is not installed")
+    return msgpack.unpackb(body, raw=False, strict_map_key=False, ext_hook=_ext_hook)
+
+
+def _unzstd(body: bytes) -> bytes:
+    if zstandard is None:
+        raise ValueError("zstd-compressed cache value but zstandard is not installed")
+    return _ZSTD_DECOMPRESSOR.decompress(body)
+
+
+class JsonCodec:
+    """JSON bodies; non-JSON types are stored as strings (``default=str``)."""
+
+    name = "json"
+    _plain_header: Optional[int] = None
+    _zlib_header = _JSON_ZLIB
+    _zstd_header = _JSON_ZSTD
+
+    def __init__(self, compress_min_bytes: int = 1024) -> None:
+        self.compress_min_bytes = compress_min_bytes
+
+    def _dump(self, value: Any) -> bytes:
+        return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize *value*; raises ``TypeError`` for values it cannot store."""
+        body = self._dump(value)
+        if len(body) >= self.compress_min_bytes:
+            if zstandard is not None:
+                return bytes((self._zstd_header,)) + _ZSTD_COMPRESSOR.compress(body)
+            return bytes((self._zlib_header,)) + zlib.compress(body)
+        if self._plain_header is None:
+            return body
+        return bytes((self._plain_header,)) + body
+
+
+class MsgpackCodec(JsonCodec):
+    """msgpack bodies with ext types for datetime, date, ObjectId, Decimal, UUID."""
+
+    name = "msgpack"
+    _plain_header = _MSGPACK
+    _zlib_header = _MSGPACK_ZLIB
+    _zstd_header = _MSGPACK_ZSTD
+
+    def _dump(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True, datetime=False, default=_msgpack_default)
+
+
+def get_codec(name: str, compress_min_bytes: int = 1024) -> JsonCodec:
+    """Return the codec called *name* ("msgpack" or "json")."""
+    if name == "msgpack":
+        if msgpack is not None:
+            return MsgpackCodec(compress_min_bytes)
+        logger.warning("msgpack is not installed; caching with the JSON codec")
+    elif name != "json":
+        raise ValueError(f"Unknown cache codec: {name}")
+    return JsonCodec(compress_min_bytes)
+
+
+def decode(data: Union[bytes, str]) -> Any:
+    """Decode a value written by any codec; raises ``ValueError`` if corrupt."""
+    if isinstance(data, str):
+        return json.loads(data)
+    if not data:
+        raise ValueError("empty cache value")
+    header, body = data[0], data[1:]
+    try:
+        if header == _MSGPACK:
+            return _unpack(body)
+        if header == _MSGPACK_ZLIB:
+            return _unpack(zlib.decompress(body))
+        if header == _MSGPACK_ZSTD:
+            return _unpack(_unzstd(body))
+        if header == _JSON_ZLIB:
+            return json.loads(zlib.decompress(body))
+        if header == _JSON_ZSTD:
+            return json.loads(_unzstd(body))
+        return json.loads(data)
+    except zlib.error as exc:
+        raise ValueError(f"corrupt compressed cache value: {exc}") from exc
@@ -0,0 +1,39 @@
+"""
+Compact JSON encode/decode for hot paths (WebSocket frames, Redis payloads).
+
+Uses orjson when installed and falls back to the stdlib ``json`` module with
+compact separators.  Both produce ``str`` so output can go straight to
+``WebSocket.send_text`` or a ``decode_responses=True`` Redis client.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> str:
+        """Serialize *obj* to a compact JSON string."""
+        return orjson.dumps(obj, option=_OPTIONS).decode()
+
+    def loads(data: str | bytes) -> Any:
+        """Parse JSON text; raises ``ValueError`` on malformed input."""
+        return orjson.loads(data)
+
+    BACKEND = "orjson"
+except ImportError:  # pragma: no cover
+    _ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(obj: Any) -> str:
+        """Serialize *obj* to a compact JSON string."""
+        return _ENCODER.encode(obj)
+
+    def loads(data: str | bytes) -> Any:
+        """Parse JSON text; raises ``ValueError`` on malformed input."""
+        return json.loads(data)
+
+    BACKEND = "json"
@@ -3,98 +3,166 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
+from app.core.config import get_settings
 from app.services.async_job_service import async_job_service
-from app.services.panchanga_service import panchanga_service
+from app.services.panchanga_executor import panchanga_executor
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 JOB_KIND = "panchanga.yearly_precompute"
 
 
+def _chunked_dates(start: date, end: date, chunk_days: int) -> List[Tuple[date, ...]]:
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return [tuple(days[i:i + chunk_days]) for i in range(0, len(days), chunk_days)]
+
+
+def _cache_upserts(
+    dates: Tuple[date, ...],
+    panchangas: List[Dict[str, Any]],
+    *,
+    latitude: float,
+    longitude: float,
+    panchanga_type: str,
+    now: datetime,
+    expires_at: datetime,
+) -> List[UpdateOne]:
+    ops = []
+    for current, data in zip(dates, panchangas, strict=True):
+        day = datetime(current.year, current.month, current.day, tzinfo=timezone.utc)
+        ops.append(
+            UpdateOne(
+                {
+                    "date": day,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "sampradaya": panchanga_type,
+                },
+                {
+                    "$set": {
+                        "date": day,
+                        "region": data.get("meta", {}).get("timezone", "Asia/Kolkata"),
+                        "latitude": latitude,
+                        "longitude": longitude,
+                        "sampradaya": panchanga_type,
+                        "panchanga_data": data,
+                        "created_at": now,
+                        "expires_at": expires_at,
+                    }
+                },
+                upsert=True,
+            )
+        )
+    return ops
+
+
+def _written_count(result: Any) -> int:
+    return int(result.upserted_count) + int(result.matched_count)
+
+
 async def _process_yearly_precompute(db: AsyncIOMotorDatabase, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute a year of daily Panchanga in chunks and upsert each chunk with one
+    unordered ``bulk_write``.  The next chunk is computed (in the Panchanga
+    process pool) while the previous chunk is being written.
+    """
     year = int(payload["year"])
     latitude = float(payload.get("latitude", 28.6139))
     longitude = float(payload.get("longitude", 77.2090))
     panchanga_type = str(payload.get("panchanga_type", "lunar"))
 
-    start = date(year, 1, 1)
-    end = date(year, 12, 31)
-    current = start
     now = datetime.now(timezone.utc)
     expires_at = now + timedelta(days=30)
+    chunks = _chunked_dates(
+        date(year, 1, 1), date(year, 12, 31), max(1, settings.PANCHANGA_PRECOMPUTE_CHUNK_DAYS)
+    )
 
+    started = time.perf_counter()
     computed = 0
-    while current <= end:
-        data = panchanga_service.get_daily_panchanga(
-            current,
-            latitude,
-            longitude,
-            panchanga_type,
-        )
-        await db.panchanga_cache.update_one(
-            {
-                "date": datetime(current.year, current.month, current.day, tzinfo=timezone.utc),
-                "latitude": latitude,
-                "longitude": longitude,
-                "sampradaya": panchanga_type,
-            },
-            {
-                "$set": {
-                    "date": datetime(current.year, current.month, current.day, tzinfo=timezone.utc),
-                    "region": data.get("meta", {}).get("timezone", "Asia/Kolkata"),
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "sampradaya": panchanga_type,
-                    "panchanga_data": data,
-                    "created_at": now,
-                    "expires_at": expires_at,
-                }
-            },
-            upsert=True,
-        )
-        computed += 1
-        current += timedelta(days=1)
+    written = 0
+    pending_write = None
+    try:
+        for dates in chunks:
+            panchangas = await panchanga_executor.get_daily_panchanga_many(
+                dates, latitude, longitude, panchanga_type
+            )
+            computed += len(panchangas)
+            if pending_write is not None:
+                written += _written_count(await pending_write)
+            ops = _cache_upserts(
+                dates,
+                panchangas,
+                latitude=latitude,
+                longitude=longitude,
+                panchanga_type=panchanga_type,
+                now=now,
+                expires_at=expires_at,
+            )
+            pending_write = asyncio.ensure_future(db.panchanga_cache.bulk_write(ops, ordered=False))
+        if pending_write is not None:
+            written += _written_count(await pending_write)
+            pending_write = None
+    finally:
+        if pending_write is not None and not pending_write.done():
+            pending_write.cancel()
+    elapsed = max(time.perf_counter() - started, 1e-9)
 
     return {
         "year": year,
         "computed_days": computed,
+        "written_docs": written,
         "latitude": latitude,
         "longitude": longitude,
         "panchanga_type": panchanga_type,
+        "elapsed_seconds": round(elapsed, 3),
+        "days_per_second": round(computed / elapsed, 2),
+        "docs_per_second": round(written / elapsed, 2),
     }
 
 
+async def _run_job(db: AsyncIOMotorDatabase, job: Dict[str, Any]) -> None:
+    job_id = job.get("_id")
+    job_oid = ObjectId(job_id) if not isinstance(job_id, ObjectId) else job_id
+    attempts = int(job.get("attempts", 0)) + 1
+    max_attempts = int(job.get("max_attempts", 5))
+    payload = job.get("payload") or {}
+
+    try:
+        result = await _process_yearly_precompute(db, payload)
+        await async_job_service.mark_completed(db, job_oid, result=result)
+        logger.info(
+            "Panchanga precompute done id=%s days/s=%s docs/s=%s",
+            str(job_oid),
+            result["days_per_second"],
+            result["docs_per_second"],
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Panchanga precompute failed id=%s err=%s", str(job_oid), exc)
+        await async_job_service.mark_failed(
+            db,
+            job_oid,
+            attempts=attempts,
+            max_attempts=max_attempts,
+            error=str(exc),
+        )
+
+
 async def process_precompute_once(db: AsyncIOMotorDatabase, *, batch_size: int = 1) -> int:
+    """Claim up to ``batch_size`` jobs and run them concurrently."""
     jobs = await async_job_service.claim_batch(db, kind=JOB_KIND, batch_size=batch_size)
     if not jobs:
         return 0
 
-    for job in jobs:
-        job_id = job.get("_id")
-        job_oid = ObjectId(job_id) if not isinstance(job_id, ObjectId) else job_id
-        attempts = int(job.get("attempts", 0)) + 1
-        max_attempts = int(job.get("max_attempts", 5))
-        payload = job.get("payload") or {}
-
-        try:
-            result = await _process_yearly_precompute(db, payload)
-            await async_job_service.mark_completed(db, job_oid, result=result)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Panchanga precompute failed id=%s err=%s", str(job_oid), exc)
-            await async_job_service.mark_failed(
-                db,
-                job_oid,
-                attempts=attempts,
-                max_attempts=max_attempts,
-                error=str(exc),
-            )
-
+    await asyncio.gather(*(_run_job(db, job) for job in jobs))
     return len(jobs)
 
 
@@ -102,7 +170,9 @@ async def _worker_loop(db: AsyncIOMotorDatabase, *, poll_interval_seconds: float
     logger.info("Panchanga precompute worker started")
     while True:
         try:
-            processed = await process_precompute_once(db, batch_size=1)
+            processed = await process_precompute_once(
+                db, batch_size=max(1, settings.PANCHANGA_PRECOMPUTE_CONCURRENCY)
+            )
             if processed == 0:
                 await asyncio.sleep(poll_interval_seconds)
         except asyncio.CancelledError:
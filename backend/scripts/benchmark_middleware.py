@@ -0,0 +1,179 @@
+"""HTTP middleware-chain micro-benchmarks.
+
+Run from ``backend/``:  python -m scripts.benchmark_middleware [--quick]
+
+Drives the ASGI stack directly (no sockets, no HTTP client) and reports the
+per-request time of the middleware chain around a trivial endpoint.  The
+"legacy" chain reproduces the pre-ASGI stack: BaseHTTPMiddleware compression
+that joins the body with ``body += chunk`` and gzips it in one go,
+BaseHTTPMiddleware security headers, and an ``@app.middleware("http")``
+layer standing in for request-context handling.  The "asgi" chain is the
+current CompressionMiddleware + SecurityHeadersMiddleware plus a pass-through
+ASGI layer in the same position.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import sys
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.security_headers import SecurityHeadersMiddleware
+
+SMALL = {"success": True, "data": {"id": "665f1c2e9b1d4a0012345678", "status": "confirmed"}}
+LARGE = {
+    "success": True,
+    "data": [
+        {"id": f"665f1c2e9b1d4a00{i:08d}", "name": f"Acharya {i}", "city": "Varanasi", "rating": 4.8}
+        for i in range(600)
+    ],
+}
+EXPORT_ROWS = 2000
+EXPORT_ROW = b'{"booking_id": "665f1c2e9b1d4a0012345678", "amount": 2100, "status": "completed"}\n'
+
+
+async def _small(request):
+    return JSONResponse(SMALL)
+
+
+async def _large(request):
+    return JSONResponse(LARGE)
+
+
+async def _export(request):
+    async def rows():
+        for _ in range(EXPORT_ROWS):
+            yield EXPORT_ROW
+
+    return StreamingResponse(rows(), media_type="application/json")
+
+
+ROUTES = [Route("/small", _small), Route("/large", _large), Route("/export", _export)]
+
+
+class _LegacyCompression(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if "gzip" not in request.headers.get("accept-encoding", ""):
+            return response
+        body = b""
+        async for chunk in response.body_iterator:
+            body += chunk
+        if len(body) < 1024:
+            return Response(body, response.status_code, dict(response.headers))
+        compressed = gzip.compress(body, compresslevel=6)
+        headers = dict(response.headers)
+        headers["content-encoding"] = "gzip"
+        headers["content-length"] = str(len(compressed))
+        return Response(compressed, response.status_code, headers)
+
+
+class _LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        return response
+
+
+class _PassThrough:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+
+def _legacy_app() -> Starlette:
+    app = Starlette(routes=ROUTES)
+    app.add_middleware(_LegacyCompression)
+    app.add_middleware(_LegacySecurityHeaders)
+
+    @app.middleware("http")
+    async def request_context(request, call_next):
+        return await call_next(request)
+
+    return app
+
+
+def _asgi_app() -> Starlette:
+    app = Starlette(routes=ROUTES)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, compression_level=6)
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(_PassThrough)
+    return app
+
+
+def _request(app, path: str) -> Callable[[], Awaitable[int]]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", b"gzip")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def run() -> int:
+        sent = 0
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if requested:  # streaming responses wait here for a disconnect
+                await asyncio.Event().wait()
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            nonlocal sent
+            sent += len(message.get("body", b""))
+
+        await app(dict(scope), receive, send)
+        return sent
+
+    return run
+
+
+async def _per_request_us(func: Callable[[], Awaitable[int]], number: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+async def _main(quick: bool) -> None:
+    scale = 1 if quick else 5
+    legacy, asgi = _legacy_app(), _asgi_app()
+    cases: List[Tuple[str, str, int]] = [
+        ("small JSON (uncompressed)", "/small", 400 * scale),
+        ("600-row list JSON (gzip)", "/large", 40 * scale),
+        (f"{EXPORT_ROWS}-row streamed export (gzip)", "/export", 10 * scale),
+    ]
+    print(f"{'case':<38} {'legacy us/req':>14} {'asgi us/req':>12} {'speed-up':>9}")
+    print("-" * 76)
+    for name, path, number in cases:
+        before = await _per_request_us(_request(legacy, path), number)
+        after = await _per_request_us(_request(asgi, path), number)
+        print(f"{name:<38} {before:>14,.1f} {after:>12,.1f} {before / after:>8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(quick="--quick" in sys.argv[1:]))
@@ -0,0 +1,70 @@
+"""Panchanga micro-benchmarks.
+
+Run from ``backend/``:  python -m scripts.benchmark_panchanga [--quick]
+
+Each case reports the best-of-5 mean time per call.  "legacy" cases reproduce
+the pre-optimisation code path so regressions and wins stay visible.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List, Tuple
+
+import pytz
+from timezonefinder import TimezoneFinder
+
+from app.services import panchanga_service as ps
+from app.services.panchanga_service import panchanga_service
+from app.services.timezone_grid import timezone_resolver
+
+LAT, LON = 12.9716, 77.5946
+TZ_NAME = "Asia/Kolkata"
+DAY = date(2026, 8, 15)
+INSTANT = datetime(2026, 8, 15, 0, 47, 12, tzinfo=timezone.utc)
+
+
+def _legacy_format(dt: datetime, tz_name: str) -> str:
+    return dt.astimezone(pytz.timezone(tz_name)).strftime("%H:%M")
+
+
+def _legacy_local_minutes(dt: datetime, tz_name: str) -> int:
+    local = dt.astimezone(pytz.timezone(tz_name))
+    return local.hour * 60 + local.minute
+
+
+def _cases(quick: bool) -> List[Tuple[str, Callable[[], object], int]]:
+    tf = TimezoneFinder()
+    timezone_resolver.warm_up()
+    panchanga_service.get_daily_panchanga(DAY, LAT, LON)  # warm snapshot + tables
+    cold_days = iter(DAY + timedelta(days=i) for i in range(1, 10_000))
+    scale = 1 if quick else 5
+
+    return [
+        ("tz format  legacy (pytz+astimezone+strftime)", lambda: _legacy_format(INSTANT, TZ_NAME), 2000 * scale),
+        ("tz format  _format_time_in_tz", lambda: panchanga_service._format_time_in_tz(INSTANT, TZ_NAME), 2000 * scale),
+        ("tz minutes legacy", lambda: _legacy_local_minutes(INSTANT, TZ_NAME), 2000 * scale),
+        ("tz minutes _local_minutes", lambda: ps._local_minutes(INSTANT, TZ_NAME), 2000 * scale),
+        ("tz resolve TimezoneFinder.timezone_at", lambda: tf.timezone_at(lat=LAT, lng=LON), 2000 * scale),
+        ("tz resolve timezone_resolver", lambda: timezone_resolver.timezone_at(LAT, LON), 2000 * scale),
+        ("daily panchanga (warm snapshot)", lambda: panchanga_service.get_daily_panchanga(DAY, LAT, LON), 50 * scale),
+        ("daily panchanga (cold date)", lambda: panchanga_service.get_daily_panchanga(next(cold_days), LAT, LON), 10 * scale),
+        ("location elements (warm snapshot)", lambda: panchanga_service.get_location_elements(DAY, LAT, LON, TZ_NAME), 50 * scale),
+        ("month calendar", lambda: panchanga_service.get_month_calendar(2026, 8, LAT, LON), 2 * scale),
+        ("panchanga range, 1 year", lambda: panchanga_service.get_panchanga_range(date(2026, 1, 1), date(2026, 12, 31), LAT, LON), 2 * scale),
+    ]
+
+
+def run(quick: bool = False) -> None:
+    print(f"{'case':<48} {'per call':>12}")
+    print("-" * 61)
+    for name, func, number in _cases(quick):
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        unit, value = ("µs", best * 1e6) if best < 1e-3 else ("ms", best * 1e3)
+        print(f"{name:<48} {value:>9.2f} {unit}")
+
+
+if __name__ == "__main__":
+    run(quick="--quick" in sys.argv[1:])
@@ -0,0 +1,124 @@
+"""WebSocket delivery micro-benchmarks.
+
+Run from ``backend/``:  python -m scripts.benchmark_websocket [--quick]
+
+Measures messages/sec on one core for the serialization work of each delivery
+path, with sockets and Redis replaced by no-op stand-ins.  "legacy" cases
+reproduce the pre-Frame path: json.dumps to publish, json.loads in the
+listener, then send_json (json.dumps again) per recipient.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, List, Tuple
+
+from app.services.websocket_manager import ConnectionManager, Frame
+from app.utils import json_codec
+
+ROOM_SIZE = 50
+MESSAGE = {
+    "type": "new_message",
+    "conversation_id": "665f1c2e9b1d4a0012345678",
+    "sender_id": "665f1c2e9b1d4a0087654321",
+    "content": "Namaste! Confirming the Griha Pravesh muhurta for Sunday 6:45 AM.",
+    "timestamp": datetime(2026, 8, 15, 6, 45).isoformat(),
+    "correlation_id": "bench-0001",
+}
+
+
+class _NullSocket:
+    """Mimics Starlette's WebSocket: send_json encodes with stdlib json."""
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_json(self, data: dict) -> None:
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+    async def send_text(self, data: str) -> None:
+        return None
+
+
+async def _legacy_personal() -> None:
+    raw = json.dumps(MESSAGE)
+    data = json.loads(raw)
+    await _NullSocket().send_json(data)
+
+
+async def _frame_personal() -> None:
+    raw = Frame.encode(MESSAGE).pack()
+    _, frame = Frame.unpack(raw)
+    await _NullSocket().send_text(frame.text)
+
+
+async def _legacy_room() -> None:
+    raw = json.dumps({"room_id": "r1", "exclude": [], "message": MESSAGE})
+    data = json.loads(raw)
+    socket = _NullSocket()
+    for _ in range(ROOM_SIZE):
+        await socket.send_json(data["message"])
+
+
+async def _frame_room() -> None:
+    raw = Frame.encode(MESSAGE).pack(exclude=[])
+    _, frame = Frame.unpack(raw)
+    socket = _NullSocket()
+    for _ in range(ROOM_SIZE):
+        await socket.send_text(frame.text)
+
+
+def _manager_room(mgr: ConnectionManager) -> Callable[[], Awaitable[None]]:
+    async def _run() -> None:
+        await mgr.send_to_room("bench_room", MESSAGE)
+        await asyncio.sleep(0)  # let the writer tasks drain their queues
+
+    return _run
+
+
+async def _build_manager() -> ConnectionManager:
+    mgr = ConnectionManager()
+    for i in range(ROOM_SIZE):
+        user_id = f"bench_{i}"
+        await mgr.connect(user_id, _NullSocket())
+        mgr.join_room("bench_room", user_id)
+    await asyncio.sleep(0)
+    return mgr
+
+
+async def _rate(func: Callable[[], Awaitable[None]], number: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+async def _main(quick: bool) -> None:
+    scale = 1 if quick else 5
+    mgr = await _build_manager()
+    cases: List[Tuple[str, Callable[[], Awaitable[None]], int, int]] = [
+        ("1:1 message legacy (dumps/loads/send_json)", _legacy_personal, 5000 * scale, 1),
+        ("1:1 message Frame (encode once/send_text)", _frame_personal, 5000 * scale, 1),
+        (f"room x{ROOM_SIZE} legacy", _legacy_room, 200 * scale, ROOM_SIZE),
+        (f"room x{ROOM_SIZE} Frame", _frame_room, 200 * scale, ROOM_SIZE),
+        (f"room x{ROOM_SIZE} ConnectionManager (local, writers)", _manager_room(mgr), 200 * scale, ROOM_SIZE),
+    ]
+    print(f"JSON codec: {json_codec.BACKEND}")
+    print(f"{'case':<52} {'deliveries/s':>14}")
+    print("-" * 67)
+    for name, func, number, fan_out in cases:
+        rate = await _rate(func, number) * fan_out
+        print(f"{name:<52} {rate:>14,.0f}")
+    for user_id in list(mgr.active_connections):
+        mgr.disconnect(user_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(quick="--quick" in sys.argv[1:]))
@@ -0,0 +1,348 @@
+"""Unit tests for CacheService: L1 tier, tags, stale-while-revalidate, codec."""
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from redis.exceptions import NoScriptError
+
+from app.core.config import settings
+from app.services.cache_service import _MISSING, CacheService, L1Cache
+from app.utils import cache_codec
+
+
+def _service():
+    service = CacheService()
+    service.l1_cache = L1Cache(max_entries=100, max_bytes=10_000, shards=1)
+    redis_client = AsyncMock()
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    pipe.execute = AsyncMock(return_value=[])
+    redis_client.pipeline = MagicMock(return_value=pipe)
+    service.redis = redis_client
+    return service
+
+
+def test_lru_evicts_least_recently_used_entry():
+    l1 = L1Cache(max_entries=2, max_bytes=1_000, shards=1)
+    l1.set("a", 1, ttl=60, size=1)
+    l1.set("b", 2, ttl=60, size=1)
+    l1.get("a")
+    l1.set("c", 3, ttl=60, size=1)
+
+    assert l1.get("b") is _MISSING
+    assert l1.get("a") == 1 and l1.get("c") == 3
+    assert l1.evictions == 1
+
+
+def test_byte_budget_bounds_the_cache():
+    l1 = L1Cache(max_entries=100, max_bytes=100, shards=1)
+    for i in range(10):
+        l1.set(f"k{i}", i, ttl=60, size=30)
+
+    assert l1.stats()["bytes"] <= 100
+    assert len(l1) == 3
+    assert l1.set("huge", "x", ttl=60, size=101) is False
+    assert l1.get("huge") is _MISSING
+
+
+def test_expired_entries_miss_and_are_swept(monkeypatch):
+    l1 = L1Cache(max_entries=100, max_bytes=1_000, shards=4)
+    l1.set("short", 1, ttl=1, size=1)
+    l1.set("long", 2, ttl=60, size=1)
+    l1.set("other", 3, ttl=1, size=1)
+
+    clock = time.monotonic() + 5
+    monkeypatch.setattr("app.services.cache_service.time.monotonic", lambda: clock)
+
+    assert l1.get("short") is _MISSING
+    assert l1.sweep() == 1
+    assert len(l1) == 1
+    assert l1.stats()["expirations"] == 2
+
+
+def test_delete_matching_uses_glob_patterns():
+    l1 = L1Cache(max_entries=100, max_bytes=1_000, shards=4)
+    for key in ("user:1", "user:1:prefs", "user:2", "booking:1"):
+        l1.set(key, key, ttl=60, size=1)
+
+    assert l1.delete_matching("user:1*") == 2
+    assert l1.get("user:2") == "user:2"
+    assert l1.get("user:1:prefs") is _MISSING
+
+
+async def test_get_or_compute_serves_hot_key_from_l1():
+    service = _service()
+    service.redis.get.return_value = json.dumps({"v": 1}).encode()
+
+    first = await service.get_or_compute("hot", AsyncMock(), use_l1_cache=True, l1_expire=30)
+    second = await service.get_or_compute("hot", AsyncMock(), use_l1_cache=True, l1_expire=30)
+
+    assert first == second == {"v": 1}
+    service.redis.get.assert_awaited_once_with("hot")
+    assert service.l1_cache.hits == 1
+
+
+async def test_writes_invalidate_local_entry_and_notify_other_instances():
+    service = _service()
+    service.l1_cache.set("k", "old", ttl=60, size=3)
+
+    assert await service.set("k", "new") is True
+
+    assert service.l1_cache.get("k") is _MISSING
+    pipe = service.redis.pipeline.return_value
+    channel, raw = pipe.publish.call_args.args
+    assert channel == "cache:invalidate"
+    assert json.loads(raw)["keys"] == ["k"]
+
+
+@pytest.mark.parametrize(
+    "message, remaining",
+    [
+        ({"keys": ["user:1"]}, {"user:2", "booking:1"}),
+        ({"pattern": "user:*"}, {"booking:1"}),
+        ({"all": True}, set()),
+    ],
+)
+def test_invalidation_from_another_instance_drops_l1_entries(message, remaining):
+    service = _service()
+    for key in ("user:1", "user:2", "booking:1"):
+        service.l1_cache.set(key, key, ttl=60, size=1)
+
+    service._apply_invalidation(json.dumps({"origin": "other-pod", **message}))
+
+    cached = {k for k in ("user:1", "user:2", "booking:1") if service.l1_cache.get(k) is not _MISSING}
+    assert cached == remaining
+
+
+def test_own_invalidations_are_ignored():
+    service = _service()
+    service.l1_cache.set("k", "v", ttl=60, size=1)
+
+    service._apply_invalidation(service._invalidation(keys=["k"]))
+
+    assert service.l1_cache.get("k") == "v"
+
+
+class _PubSub:
+    """Fake pubsub: ``fail`` makes listen() raise as if the connection reset."""
+
+    def __init__(self, messages=(), fail=False):
+        self.messages = list(messages)
+        self.fail = fail
+        self.gate = asyncio.Event()
+        self.subscribe = AsyncMock()
+        self.close = AsyncMock()
+
+    async def listen(self):
+        if self.fail:
+            raise ConnectionError("connection reset")
+        await self.gate.wait()
+        for message in self.messages:
+            yield message
+        await asyncio.Event().wait()
+
+
+async def test_invalidation_listener_resubscribes_after_connection_loss(monkeypatch):
+    monkeypatch.setattr("app.services.cache_service._INVALIDATION_RETRY_MIN", 0)
+    service = _service()
+    invalidate_a = {"type": "message", "data": json.dumps({"origin": "other-pod", "keys": ["a"]})}
+    dropped, resubscribed = _PubSub(fail=True), _PubSub([invalidate_a])
+    service.redis.pubsub = MagicMock(side_effect=[dropped, resubscribed])
+    service.l1_cache.set("stale", 0, ttl=60, size=1)
+
+    listener = asyncio.create_task(service._listen_for_invalidations())
+    while not resubscribed.subscribe.await_count:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    # Entries from before the reconnect were cleared; new ones get invalidated.
+    assert service.l1_cache.get("stale") is _MISSING
+    service.l1_cache.set("a", 1, ttl=60, size=1)
+    service.l1_cache.set("b", 2, ttl=60, size=1)
+    resubscribed.gate.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    listener.cancel()
+
+    dropped.close.assert_awaited_once()
+    assert service.l1_cache.get("a") is _MISSING
+    assert service.l1_cache.get("b") == 2
+
+
+async def test_tagged_set_registers_key_under_each_tag():
+    service = _service()
+
+    await service.set("search:q1", {"n": 1}, expire=60, tags=["acharya:3", "acharya:7"])
+
+    pipe = service.redis.pipeline.return_value
+    pipe.set.assert_not_called()
+    args = pipe.eval.call_args.args
+    assert args[1:5] == (3, "search:q1", "cache:ztag:acharya:3", "cache:ztag:acharya:7")
+    assert cache_codec.decode(args[5]) == {"n": 1}
+    assert args[6] == 60
+    assert args[8] == settings.CACHE_TAG_MAX_MEMBERS
+
+
+async def test_tagged_set_runs_loaded_script_by_sha():
+    service = _service()
+    service.redis.script_load.side_effect = lambda source: f"sha:{len(source)}"
+    await service._load_scripts()
+
+    await service.set("search:q1", {"n": 1}, expire=60, tags=["acharya:7"])
+
+    pipe = service.redis.pipeline.return_value
+    pipe.eval.assert_not_called()
+    args = pipe.evalsha.call_args.args
+    assert args[0] == service._script_shas["set_with_tags"]
+    assert args[1:4] == (2, "search:q1", "cache:ztag:acharya:7")
+
+
+async def test_lost_script_cache_is_reloaded_and_retried():
+    service = _service()
+    service._script_shas = {"invalidate_tags": "stale"}
+    service.redis.script_load.return_value = "fresh"
+    service.redis.evalsha.side_effect = [NoScriptError("NOSCRIPT"), [b"search:q1"]]
+
+    assert await service.invalidate_tags("acharya:7") == 1
+
+    assert service.redis.evalsha.await_args.args[:2] == ("fresh", 1)
+
+
+async def test_invalidate_tags_drops_members_everywhere():
+    service = _service()
+    service.l1_cache.set("search:q1", "v", ttl=60, size=1)
+    service.l1_cache.set("search:q2", "v", ttl=60, size=1)
+    service.redis.eval.return_value = [b"search:q1"]
+
+    assert await service.invalidate_tags("acharya:7") == 1
+
+    args = service.redis.eval.await_args.args
+    assert args[1:3] == (1, "cache:ztag:acharya:7")
+    assert service.l1_cache.get("search:q1") is _MISSING
+    assert service.l1_cache.get("search:q2") == "v"
+    channel, raw = service.redis.publish.await_args.args
+    assert json.loads(raw)["keys"] == ["search:q1"]
+    service.redis.scan_iter.assert_not_called()
+
+
+async def test_generation_is_read_through_l1_and_bumped_with_a_broadcast():
+    service = _service()
+    service.redis.get.return_value = b"4"
+
+    assert await service.generation("search:acharyas") == 4
+    assert await service.generation("search:acharyas") == 4
+    service.redis.get.assert_awaited_once_with("cache:gen:search:acharyas")
+
+    pipe = service.redis.pipeline.return_value
+    pipe.execute.return_value = [5, 1]
+    assert await service.bump_generation("search:acharyas") == 5
+    pipe.incr.assert_called_once_with("cache:gen:search:acharyas")
+    _channel, raw = pipe.publish.call_args.args
+    assert json.loads(raw)["keys"] == ["cache:gen:search:acharyas"]
+    assert service.l1_cache.get("cache:gen:search:acharyas") is _MISSING
+
+
+def _envelope(value, soft_in, delta=0.0):
+    return CacheService().codec.encode(
+        {"_swr": 1, "v": value, "soft": time.time() + soft_in, "delta": delta}
+    )
+
+
+async def test_concurrent_misses_share_one_computation():
+    service = CacheService()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"n": calls}
+
+    results = await asyncio.gather(*(service.get_or_compute("k", compute) for _ in range(20)))
+
+    assert calls == 1
+    assert results == [{"n": 1}] * 20
+
+
+async def test_stale_value_is_served_while_one_refresh_runs():
+    service = _service()
+    service.redis.get.return_value = _envelope({"v": "old"}, soft_in=-5)
+    service.redis.set.return_value = True
+    compute = AsyncMock(return_value={"v": "new"})
+
+    first = await service.get_or_compute("k", compute, expire=60)
+    second = await service.get_or_compute("k", compute, expire=60)
+    await asyncio.gather(*service._refreshing.values())
+
+    assert first == second == {"v": "old"}
+    compute.assert_awaited_once()
+    pipe = service.redis.pipeline.return_value
+    key, stored = pipe.set.call_args.args
+    assert key == "k"
+    assert cache_codec.decode(stored)["v"] == {"v": "new"}
+    assert pipe.set.call_args.kwargs["ex"] == 60 + settings.CACHE_STALE_TTL
+
+
+async def test_fresh_value_is_not_refreshed():
+    service = _service()
+    service.redis.get.return_value = _envelope([1, 2], soft_in=300, delta=0.05)
+    compute = AsyncMock()
+
+    assert await service.get_or_compute("k", compute) == [1, 2]
+    assert service._refreshing == {}
+    compute.assert_not_awaited()
+
+
+def test_xfetch_refreshes_slow_values_earlier(monkeypatch):
+    monkeypatch.setattr("app.services.cache_service.random.random", lambda: 0.9)
+    soft_expiry = time.time() + 2
+
+    assert CacheService._refresh_due(soft_expiry, delta=0.01) is False
+    assert CacheService._refresh_due(soft_expiry, delta=5.0) is True
+
+
+async def test_plain_get_unwraps_get_or_compute_entries():
+    service = _service()
+    service.redis.get.return_value = _envelope({"a": 1}, soft_in=60)
+
+    assert await service.get("k") == {"a": 1}
+
+
+async def test_values_round_trip_with_their_types():
+    service = _service()
+    value = {"at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "id": ObjectId()}
+
+    await service.set("k", value)
+    stored = service.redis.pipeline.return_value.set.call_args.args[1]
+    service.redis.get.return_value = stored
+
+    assert await service.get("k") == value
+
+
+async def test_unreadable_value_is_a_miss():
+    service = _service()
+    service.redis.get.return_value = b"\x02not zlib"
+
+    assert await service.get("k") is None
+
+
+async def test_set_many_and_get_many_use_one_round_trip_each():
+    service = _service()
+    service.l1_cache.set("a", "old", ttl=60, size=3)
+
+    assert await service.set_many({"a": 1, "b": [2]}, expire=30) is True
+
+    pipe = service.redis.pipeline.return_value
+    stored = {c.args[0]: c.args[1] for c in pipe.set.call_args_list}
+    assert {c.kwargs["ex"] for c in pipe.set.call_args_list} == {30}
+    assert json.loads(pipe.publish.call_args.args[1])["keys"] == ["a", "b"]
+    pipe.execute.assert_awaited_once()
+    assert service.l1_cache.get("a") is _MISSING
+
+    service.redis.mget.return_value = [stored["a"], None, stored["b"]]
+    assert await service.get_many(["a", "missing", "b"]) == [1, None, [2]]
+    service.redis.mget.assert_awaited_once_with(["a", "missing", "b"])
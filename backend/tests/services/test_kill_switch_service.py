@@ -0,0 +1,104 @@
+"""Unit tests for the in-memory kill-switch snapshot."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.kill_switch_service import (
+    DEFAULT_CONTROLS,
+    KILL_SWITCH_CHANNEL,
+    KillSwitchService,
+)
+
+
+def _service(doc=None, redis_client=None):
+    db = MagicMock()
+    db.global_controls.find_one = AsyncMock(return_value=doc)
+    db.global_controls.update_one = AsyncMock()
+    return KillSwitchService(db, redis_client)
+
+
+async def test_snapshot_defaults_until_loaded():
+    service = _service({"controls": {"chat_enabled": False}})
+
+    assert service.current_controls() == DEFAULT_CONTROLS
+
+    await service.refresh()
+
+    assert service.current_controls()["chat_enabled"] is False
+    assert service.current_controls()["payments_enabled"] is True
+
+
+async def test_reads_do_not_touch_the_database():
+    service = _service({"controls": {"incident_mode": True}})
+    await service.refresh()
+
+    for _ in range(10):
+        assert service.current_controls()["incident_mode"] is True
+
+    service.collection.find_one.assert_awaited_once()
+
+
+async def test_failed_refresh_keeps_last_snapshot():
+    service = _service({"controls": {"chat_enabled": False}})
+    await service.refresh()
+    service.collection.find_one.side_effect = RuntimeError("mongo down")
+
+    await service.refresh()
+
+    assert service.current_controls()["chat_enabled"] is False
+
+
+async def test_set_controls_updates_snapshot_and_notifies_pods():
+    redis_client = AsyncMock()
+    service = _service(redis_client=redis_client)
+
+    await service.set_controls({"payments_enabled": False}, actor_id="admin-1")
+
+    assert service.current_controls()["payments_enabled"] is False
+    redis_client.publish.assert_awaited_once_with(KILL_SWITCH_CHANNEL, "admin-1")
+
+
+async def test_admin_update_goes_through_the_pods_service():
+    from types import SimpleNamespace
+
+    from app.api.v1.reliability_admin import KillSwitchUpdateRequest, update_kill_switches
+
+    redis_client = AsyncMock()
+    service = _service(redis_client=redis_client)
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(kill_switch_service=service)))
+
+    await update_kill_switches(
+        KillSwitchUpdateRequest(chat_enabled=False),
+        request,
+        current_user={"id": "admin-1"},
+        db=MagicMock(),
+        redis=None,
+    )
+
+    assert service.current_controls()["chat_enabled"] is False
+    redis_client.publish.assert_awaited_once_with(KILL_SWITCH_CHANNEL, "admin-1")
+
+
+async def test_change_notification_triggers_reload():
+    notified = asyncio.Event()
+
+    async def get_message(ignore_subscribe_messages, timeout):
+        await notified.wait()
+        notified.clear()
+        return {"type": "message", "channel": KILL_SWITCH_CHANNEL, "data": "admin-1"}
+
+    pubsub = AsyncMock()
+    pubsub.get_message.side_effect = get_message
+    redis_client = MagicMock()
+    redis_client.pubsub.return_value = pubsub
+    service = _service({"controls": {}}, redis_client)
+    await service.start()
+
+    service.collection.find_one.return_value = {"controls": {"chat_enabled": False}}
+    notified.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    await service.stop()
+
+    assert service.current_controls()["chat_enabled"] is False
+    pubsub.subscribe.assert_awaited_once_with(KILL_SWITCH_CHANNEL)
+    pubsub.close.assert_awaited_once()
@@ -0,0 +1,45 @@
+"""Unit tests for the geo-quantized Panchanga cache."""
+import random
+from datetime import date
+
+import pytest
+
+from app.services import panchanga_cache as cache_module
+from app.services.panchanga_cache import PanchangaCache, geohash_cell
+from app.services.panchanga_executor import PanchangaExecutor
+from app.services.panchanga_service import panchanga_service
+
+
+@pytest.fixture
+def local_cache(monkeypatch):
+    monkeypatch.setattr(cache_module, "panchanga_executor", PanchangaExecutor(max_workers=0))
+    return PanchangaCache(precision=5, local_size=128, local_ttl_seconds=60, redis_ttl_seconds=60)
+
+
+def test_geohash_cell_matches_reference_encoding():
+    cell, lat, lon = geohash_cell(57.64911, 10.40744, 11)
+    assert cell == "u4pruydqqvj"
+    assert abs(lat - 57.64911) < 1e-3 and abs(lon - 10.40744) < 1e-3
+
+
+async def test_cached_daily_panchanga_matches_direct_computation_at_cell_centre(local_cache):
+    target = date(2026, 8, 15)
+    _, lat, lon = geohash_cell(12.9716, 77.5946, 5)
+
+    cached = await local_cache.get_daily_panchanga(target, lat, lon, "solar")
+
+    assert cached == panchanga_service.get_daily_panchanga(target, lat, lon, "solar")
+
+
+async def test_city_scale_traffic_is_served_from_a_handful_of_entries(local_cache):
+    rng = random.Random(7)
+    target = date(2026, 8, 15)
+    for _ in range(200):
+        lat = 12.9716 + rng.uniform(-0.02, 0.02)
+        lon = 77.5946 + rng.uniform(-0.02, 0.02)
+        result = await local_cache.get_daily_panchanga(target, lat, lon, "lunar")
+        assert result["meta"]["latitude"] == lat
+
+    # one date entry plus at most four neighbouring geohash cells
+    assert local_cache.stats["misses"] <= 5
+    assert local_cache.hit_rate() > 0.95
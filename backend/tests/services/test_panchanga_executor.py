@@ -0,0 +1,60 @@
+"""Unit tests for the async PanchangaService facade."""
+import asyncio
+import threading
+from datetime import date
+from unittest.mock import patch
+
+from app.services import panchanga_executor as executor_module
+from app.services.panchanga_executor import PanchangaExecutor
+from app.services.panchanga_service import panchanga_service
+
+
+async def test_identical_inflight_requests_share_one_computation():
+    executor = PanchangaExecutor(max_workers=0)
+    release = threading.Event()
+    calls = []
+
+    def slow_invoke(method, args):
+        calls.append((method, args))
+        release.wait(5)
+        return {"method": method}
+
+    with patch.object(executor_module, "_invoke", side_effect=slow_invoke):
+        tasks = [
+            asyncio.create_task(executor.get_daily_panchanga(date(2026, 5, 1), 12.97, 77.59, "lunar"))
+            for _ in range(5)
+        ]
+        other = asyncio.create_task(executor.get_daily_panchanga(date(2026, 5, 1), 12.97, 77.59, "solar"))
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks, other)
+
+    assert len(calls) == 2
+    assert all(r == {"method": "get_daily_panchanga"} for r in results)
+    assert executor._inflight == {}
+
+
+async def test_cancelled_caller_does_not_cancel_shared_computation():
+    executor = PanchangaExecutor(max_workers=0)
+    release = threading.Event()
+
+    def slow_invoke(method, args):
+        release.wait(5)
+        return args
+
+    with patch.object(executor_module, "_invoke", side_effect=slow_invoke):
+        first = asyncio.create_task(executor.get_ekadashi_dates(2026))
+        second = asyncio.create_task(executor.get_ekadashi_dates(2026))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        release.set()
+        assert await second == (2026,)
+
+
+async def test_process_pool_matches_inline_result():
+    executor = PanchangaExecutor(max_workers=1)
+    try:
+        result = await executor.calculate_tithi(date(2026, 3, 3), 19.076, 72.8777)
+    finally:
+        executor.shutdown()
+    assert result == panchanga_service.calculate_tithi(date(2026, 3, 3), 19.076, 72.8777)
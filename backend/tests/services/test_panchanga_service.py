@@ -0,0 +1,61 @@
+"""Unit tests for PanchangaService astronomy helpers."""
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytz
+
+from app.services import panchanga_service as panchanga_module
+from app.services.panchanga_service import PanchangaService, get_ephemeris_snapshot
+
+
+def test_ephemeris_snapshot_is_shared_for_nearby_coordinates():
+    first = get_ephemeris_snapshot(date(2025, 3, 14), 28.61391, 77.20901)
+    second = get_ephemeris_snapshot(date(2025, 3, 14), 28.613912, 77.209008)
+    assert first is second
+
+
+def test_daily_panchanga_evaluates_ephemeris_once():
+    service = PanchangaService()
+    target = date(2031, 7, 9)  # not touched by any other test — guarantees a cold LRU slot
+    real = panchanga_module._sun_moon_longitudes_at
+
+    with patch.object(panchanga_module, "_sun_moon_longitudes_at", side_effect=real) as spy:
+        result = service.get_daily_panchanga(target, 12.9716, 77.5946, "solar")
+        service.get_daily_panchanga(target, 12.9716, 77.5946, "lunar")
+
+    assert spy.call_count == 1
+    assert result["tithi"]["number"] == service.calculate_tithi(target, 12.9716, 77.5946)["number"]
+    assert len(result["hora"]) == 24
+
+
+def test_panchanga_range_matches_single_day_elements():
+    service = PanchangaService()
+    start, end = date(2026, 1, 1), date(2026, 12, 31)
+    year_range = service.get_panchanga_range(start, end, 19.076, 72.8777)
+
+    assert len(year_range) == 365
+    for i in range(len(year_range)):
+        day = year_range.date_at(i)
+        assert year_range.tithi[i] == service.calculate_tithi(day, 19.076, 72.8777)["number"]
+        assert year_range.nakshatra[i] == service.calculate_nakshatra(day, 19.076, 72.8777)["number"]
+        assert year_range.yoga[i] == service.calculate_yoga(day, 19.076, 72.8777)["number"]
+        assert year_range.karana[i] == service.calculate_karana(day, 19.076, 72.8777)["number"]
+
+
+def test_ekadashi_dates_come_from_range_engine():
+    ekadashis = PanchangaService().get_ekadashi_dates(2026)
+    assert 23 <= len(ekadashis) <= 26
+    assert {e["paksha"] for e in ekadashis} == {"Shukla", "Krishna"}
+    assert [e["date"] for e in ekadashis] == sorted(e["date"] for e in ekadashis)
+
+
+def test_local_minutes_matches_astimezone_across_dst_switches():
+    for tz_name in ("Asia/Kolkata", "America/New_York", "Europe/London", "Australia/Sydney"):
+        tz = pytz.timezone(tz_name)
+        instant = datetime(2026, 3, 6, tzinfo=timezone.utc)
+        while instant < datetime(2026, 4, 8, tzinfo=timezone.utc):
+            local = instant.astimezone(tz)
+            assert panchanga_module._local_minutes(instant, tz_name) == (
+                local.date(), local.hour * 60 + local.minute
+            )
+            instant += timedelta(minutes=37, seconds=13)
@@ -0,0 +1,82 @@
+"""Unit tests for the Panchanga transition tables."""
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from app.services.panchanga_service import PanchangaService
+from app.services.panchanga_transitions import (
+    TRANSITION_KINDS,
+    TransitionTableStore,
+    find_transition,
+    transition_store,
+)
+
+
+def test_transition_tables_agree_with_daily_elements():
+    service = PanchangaService()
+    for day in (date(2026, 1, 1), date(2026, 4, 17), date(2026, 9, 30), date(2026, 12, 31)):
+        noon = datetime(day.year, day.month, day.day, 6, 0, tzinfo=timezone.utc)
+        tithi = transition_store.element_at("tithi", noon)
+        nakshatra = transition_store.element_at("nakshatra", noon)
+
+        assert tithi.number == service.calculate_tithi(day, 28.6139, 77.2090)["number"]
+        assert nakshatra.number == service.calculate_nakshatra(day, 28.6139, 77.2090)["number"]
+        assert tithi.start <= noon < tithi.end
+        assert timedelta(hours=19) < tithi.end - tithi.start < timedelta(hours=27)
+
+
+def test_transition_tables_are_contiguous_across_years():
+    late = transition_store.element_at("tithi", datetime(2026, 12, 31, 23, 0, tzinfo=timezone.utc))
+    early = transition_store.element_at("tithi", datetime(2027, 1, 1, 1, 0, tzinfo=timezone.utc))
+    if late.number == early.number:
+        assert late.end == early.end
+    else:
+        assert late.end == early.start
+
+
+def test_transition_store_round_trips_npz(tmp_path):
+    built = TransitionTableStore(str(tmp_path)).tables_for_year(2026)
+    reloaded = TransitionTableStore(str(tmp_path)).tables_for_year(2026)
+
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    for kind in TRANSITION_KINDS:
+        np.testing.assert_array_equal(built[kind].starts, reloaded[kind].starts)
+        np.testing.assert_array_equal(built[kind].numbers, reloaded[kind].numbers)
+
+
+def test_direct_solve_matches_tables():
+    tables = transition_store.tables_for_year(2026)
+    for hours in range(0, 24 * 360, 241):
+        when = datetime(2026, 1, 2, tzinfo=timezone.utc) + timedelta(hours=hours)
+        for kind in TRANSITION_KINDS:
+            expected = tables[kind].element_at(when)
+            solved = find_transition(kind, when)
+            assert solved.number == expected.number
+            assert abs((solved.start - expected.start).total_seconds()) <= 1
+            assert abs((solved.end - expected.end).total_seconds()) <= 1
+
+
+def test_years_outside_the_window_are_solved_without_tables():
+    store = TransitionTableStore(years_around=0)
+    far_year = datetime.now(timezone.utc).year - 40
+    when = datetime(far_year, 5, 10, 6, tzinfo=timezone.utc)
+
+    tithi = store.element_at("tithi", when)
+
+    assert store._years == {}
+    assert tithi.start <= when < tithi.end
+
+
+def test_table_cache_is_bounded(monkeypatch):
+    built = []
+    monkeypatch.setattr(
+        "app.services.panchanga_transitions.build_transition_tables",
+        lambda year: built.append(year) or {},
+    )
+    store = TransitionTableStore(max_years=2)
+
+    for year in (2025, 2026, 2025, 2027):
+        store.tables_for_year(year)
+
+    assert list(store._years) == [2025, 2027]
+    assert built == [2025, 2026, 2027]
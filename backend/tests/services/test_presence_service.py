@@ -0,0 +1,117 @@
+"""Unit tests for cluster-wide WebSocket presence."""
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.services.presence_service import (
+    PRESENCE_KEY,
+    PRESENCE_RELEASE_SCRIPT,
+    PRESENCE_SEEN_KEY,
+    PresenceService,
+)
+
+
+def _redis():
+    client = AsyncMock()
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    pipe.execute = AsyncMock(return_value=[])
+    client.pipeline = MagicMock(return_value=pipe)
+    return client, pipe
+
+
+@pytest.fixture
+def presence():
+    service = PresenceService("pod-a", {"local-1": object()})
+    service.redis_client, service.pipe = _redis()
+    return service
+
+
+async def test_are_online_batches_remote_lookups_into_one_call(presence):
+    now = time.time()
+    presence.redis_client.zmscore.return_value = [now, None, now - 3600]
+
+    result = await presence.are_online(["local-1", "remote", "never", "stale", "remote"])
+
+    assert result == {"local-1": True, "remote": True, "never": False, "stale": False}
+    presence.redis_client.zmscore.assert_awaited_once_with(
+        PRESENCE_SEEN_KEY, ["remote", "never", "stale"]
+    )
+
+
+async def test_repeated_lookups_are_served_from_cache(presence):
+    presence.redis_client.zmscore.return_value = [time.time()]
+
+    assert await presence.is_online("remote") is True
+    assert await presence.is_online("remote") is True
+
+    presence.redis_client.zmscore.assert_awaited_once()
+
+
+async def test_local_change_invalidates_cached_answer(presence):
+    presence.redis_client.zmscore.return_value = [None]
+    assert await presence.is_online("u1") is False
+
+    presence.mark_online("u1")
+    presence.redis_client.zmscore.return_value = [time.time()]
+
+    assert await presence.is_online("u1") is True
+    assert presence.redis_client.zmscore.await_count == 2
+
+
+async def test_lookup_failure_reports_offline_without_caching(presence):
+    presence.redis_client.zmscore.side_effect = RedisError("down")
+
+    assert await presence.are_online(["remote"]) == {"remote": False}
+    assert presence._cache == {}
+
+
+async def test_without_redis_only_local_users_are_online():
+    service = PresenceService("pod-a", {"local-1": object()})
+
+    assert await service.are_online(["local-1", "remote"]) == {"local-1": True, "remote": False}
+    assert await service.online_users() == ["local-1"]
+
+
+async def test_flush_writes_deltas_and_heartbeat_in_one_pipeline(presence):
+    presence.mark_online("new")
+    presence.mark_online("left")
+    presence.mark_offline("left")
+
+    registered = await presence.flush()
+
+    assert registered == ["new"]
+    pipe = presence.pipe
+    pipe.hset.assert_called_once_with(PRESENCE_KEY, mapping={"new": "pod-a"})
+    pipe.eval.assert_called_once_with(
+        PRESENCE_RELEASE_SCRIPT, 2, PRESENCE_KEY, PRESENCE_SEEN_KEY, "left", "pod-a"
+    )
+    stamped = {}
+    for call in pipe.zadd.call_args_list:
+        stamped.update(call.args[1])
+    assert set(stamped) == {"new", "local-1"}
+    pipe.zremrangebyscore.assert_called_once()
+    pipe.execute.assert_awaited_once()
+
+
+async def test_flush_skips_redis_when_idle_between_heartbeats(presence):
+    await presence.flush()
+    presence.pipe.execute.reset_mock()
+
+    assert await presence.flush() == []
+    presence.pipe.execute.assert_not_called()
+
+
+async def test_failed_flush_keeps_changes_for_retry(presence):
+    presence.pipe.execute.side_effect = RedisError("down")
+    presence.mark_online("u1")
+    presence.mark_offline("u2")
+
+    with pytest.raises(RedisError):
+        await presence.flush()
+
+    assert presence._joins == {"u1"}
+    assert presence._leaves == {"u2"}
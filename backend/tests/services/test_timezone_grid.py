@@ -0,0 +1,56 @@
+"""Unit tests for the precomputed timezone grid."""
+import random
+
+import numpy as np
+from timezonefinder import TimezoneFinder
+
+from app.services.timezone_grid import BORDER, TimezoneResolver, build_timezone_grid
+
+# India/Nepal/Bangladesh corner — several zone borders in a small area
+_BOUNDS = (24.0, 30.0, 80.0, 92.0)
+
+
+def test_grid_agrees_with_timezonefinder_and_marks_borders():
+    tf = TimezoneFinder()
+    resolver = TimezoneResolver(None, _BOUNDS, 0.1)
+    rng = random.Random(11)
+
+    for _ in range(2000):
+        lat, lon = rng.uniform(24.0, 30.0), rng.uniform(80.0, 92.0)
+        assert resolver.timezone_at(lat, lon) == tf.timezone_at(lat=lat, lng=lon)
+
+    cells = resolver.grid().cells
+    assert (cells == BORDER).any()
+    assert (cells == BORDER).mean() < 0.1
+    assert 0 < resolver.fallbacks < 2000
+
+
+def test_points_outside_grid_fall_back_to_timezonefinder():
+    resolver = TimezoneResolver(None, _BOUNDS, 0.5)
+    assert resolver.grid().timezone_at(51.5, -0.12) is None
+    assert resolver.timezone_at(51.5, -0.12) == "Europe/London"
+
+
+def test_persisted_grid_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "tz_grid.npy")
+    built = TimezoneResolver(path, _BOUNDS, 0.5).grid()
+    loaded = TimezoneResolver(path, _BOUNDS, 0.5).grid()
+
+    assert isinstance(loaded.cells, np.memmap)
+    np.testing.assert_array_equal(built.cells, loaded.cells)
+    assert loaded.names == built.names
+
+    rebuilt = TimezoneResolver(path, _BOUNDS, 0.25).grid()  # different step → stale file ignored
+    assert rebuilt.cells.shape == (24, 48)
+
+
+def test_build_timezone_grid_keeps_only_cells_with_agreeing_corners():
+    class StripeFinder:
+        def timezone_at(self, lat, lng):
+            return "Zone/West" if lng < 1.0 else "Zone/East"
+
+    grid = build_timezone_grid(StripeFinder(), (0.0, 2.0, 0.0, 2.0), 0.5)
+    assert grid.timezone_at(1.0, 0.2) == "Zone/West"
+    assert grid.timezone_at(1.0, 0.7) is None  # corner at lng 1.0 is East
+    assert grid.timezone_at(1.0, 1.2) == "Zone/East"
+    assert grid.cells.shape == (4, 4)
@@ -0,0 +1,72 @@
+"""Unit tests for AdvancedRateLimiter's single-script sliding window."""
+from unittest.mock import AsyncMock, MagicMock
+
+from app.middleware.advanced_rate_limit import (
+    _SLIDING_WINDOW_LUA,
+    BURST_WINDOW,
+    AdvancedRateLimiter,
+)
+
+
+def _limiter(reply):
+    redis_client = MagicMock()
+    script = AsyncMock(return_value=reply)
+    redis_client.register_script.return_value = script
+    return AdvancedRateLimiter(redis_client), script
+
+
+async def test_allowed_request_is_one_script_call():
+    limiter, script = _limiter([1, 7, 1_700_000_060_000, 0])
+
+    allowed, meta = await limiter.check_rate_limit("rate_limit:ip:1:/x", 10, 60, burst_limit=3)
+
+    assert allowed is True
+    assert meta == {"limit": 10, "remaining": 7, "reset": 1_700_000_060}
+    limiter.redis.register_script.assert_called_once_with(_SLIDING_WINDOW_LUA)
+    script.assert_awaited_once()
+    kwargs = script.await_args.kwargs
+    assert kwargs["keys"] == ["rate_limit:ip:1:/x"]
+    now_ms, window_ms, limit, burst, burst_window_ms, member = kwargs["args"]
+    assert (window_ms, limit, burst, burst_window_ms) == (60_000, 10, 3, BURST_WINDOW * 1000)
+    assert member.startswith(f"{now_ms}:")
+
+
+async def test_requests_in_the_same_millisecond_get_distinct_members():
+    limiter, script = _limiter([1, 5, 0, 0])
+
+    await limiter.check_rate_limit("k", 10, 60)
+    await limiter.check_rate_limit("k", 10, 60)
+
+    members = [call.kwargs["args"][5] for call in script.await_args_list]
+    assert members[0] != members[1]
+
+
+async def test_limit_exceeded_reports_retry_after(monkeypatch):
+    monkeypatch.setattr("app.middleware.advanced_rate_limit.time.time", lambda: 1_000.2)
+    limiter, _ = _limiter([0, 0, 1_042_500, 0])
+
+    allowed, meta = await limiter.check_rate_limit("k", 10, 60)
+
+    assert allowed is False
+    assert meta["reset"] == 1_043
+    assert meta["retry_after"] == 43
+    assert "burst_exceeded" not in meta
+
+
+async def test_burst_exceeded_is_flagged():
+    limiter, _ = _limiter([0, 0, 5_000, 1])
+
+    allowed, meta = await limiter.check_rate_limit("k", 10, 60, burst_limit=2)
+
+    assert allowed is False
+    assert meta["burst_exceeded"] is True
+
+
+async def test_redis_failure_fails_open():
+    limiter, script = _limiter(None)
+    script.side_effect = ConnectionError("down")
+
+    allowed, meta = await limiter.check_rate_limit("k", 10, 60)
+
+    assert allowed is True
+    assert meta["remaining"] == 10
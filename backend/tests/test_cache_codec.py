@@ -0,0 +1,68 @@
+"""Unit tests for the Redis cache value codec."""
+import json
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from bson import ObjectId
+
+from app.utils import cache_codec
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        datetime(2026, 3, 1, 12, 30, 15, 123456),
+        datetime(2026, 3, 1, 12, 30, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        date(2026, 3, 1),
+        ObjectId(),
+        Decimal("1999.95"),
+        uuid4(),
+        {"nested": [1, "two", None, {"3": 3.5}], "raw": b"\x00\xff"},
+    ],
+)
+def test_msgpack_round_trips_types(value):
+    codec = cache_codec.MsgpackCodec()
+
+    assert cache_codec.decode(codec.encode(value)) == value
+
+
+def test_json_codec_stringifies_non_json_types():
+    codec = cache_codec.JsonCodec()
+    oid = ObjectId()
+
+    assert cache_codec.decode(codec.encode({"id": oid})) == {"id": str(oid)}
+
+
+@pytest.mark.parametrize("codec", [cache_codec.JsonCodec(64), cache_codec.MsgpackCodec(64)])
+def test_large_values_are_compressed(codec):
+    value = {"text": "panchanga " * 200}
+
+    encoded = codec.encode(value)
+
+    assert len(encoded) < 200
+    assert encoded[0] in (0x02, 0x03, 0x04, 0x05)
+    assert cache_codec.decode(encoded) == value
+
+
+def test_plain_json_written_before_the_codec_still_decodes():
+    legacy = json.dumps({"a": [1, 2]})
+
+    assert cache_codec.decode(legacy) == {"a": [1, 2]}
+    assert cache_codec.decode(legacy.encode()) == {"a": [1, 2]}
+
+
+def test_unsupported_types_are_rejected():
+    with pytest.raises(TypeError):
+        cache_codec.MsgpackCodec().encode({"x": object()})
+
+
+def test_corrupt_compressed_value_raises_value_error():
+    with pytest.raises(ValueError):
+        cache_codec.decode(b"\x02garbage")
+
+
+def test_unknown_codec_name_is_rejected():
+    with pytest.raises(ValueError):
+        cache_codec.get_codec("pickle")
@@ -0,0 +1,123 @@
+"""Tests for the streaming ASGI compression and security-header middleware."""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import ENCODERS, CompressionMiddleware, choose_encoding
+from app.middleware.security_headers import SecurityHeadersMiddleware
+
+BIG = {"items": [{"id": i, "name": f"Acharya {i}"} for i in range(500)]}
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.get("/big")
+    def big():
+        return BIG
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("x" * 5000)
+
+    @app.get("/export")
+    def export():
+        def rows():
+            for i in range(200):
+                yield f'{{"row": {i}, "pad": "{"x" * 50}"}}\n'.encode()
+
+        return StreamingResponse(rows(), media_type="application/json")
+
+    return TestClient(app)
+
+
+def test_large_json_is_gzipped_with_length_and_vary():
+    response = _app().get("/big", headers={"accept-encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == BIG
+
+
+def test_small_and_non_json_responses_are_left_alone():
+    client = _app()
+
+    assert "content-encoding" not in client.get("/small", headers={"accept-encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/text", headers={"accept-encoding": "gzip"}).headers
+
+
+def test_security_headers_are_added():
+    response = _app().get("/small")
+
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "connect-src" in response.headers["content-security-policy"]
+
+
+async def test_streamed_response_is_compressed_chunk_by_chunk():
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        for i in range(50):
+            await send({"type": "http.response.body", "body": b"x" * 100, "more_body": True})
+            # Everything past the size sniff is forwarded before the next chunk is produced
+            if i >= 10:
+                assert sent[-1]["more_body"] is True
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(app, minimum_size=1024)(scope, None, send)
+
+    start, *bodies = sent
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert all(k != b"content-length" for k, _ in start["headers"])
+    assert len(bodies) == 41
+    assert gzip.decompress(b"".join(m["body"] for m in bodies)) == b"x" * 5000
+
+
+def test_streaming_endpoint_round_trips():
+    response = _app().get("/export", headers={"accept-encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == 200
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("*", next(iter(ENCODERS))),
+        ("br, gzip", "br" if "br" in ENCODERS else "gzip"),
+        ("br;q=0, gzip", "gzip"),
+    ],
+)
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.skipif("br" not in ENCODERS, reason="brotli not installed")
+def test_brotli_is_preferred_when_accepted():
+    response = _app().get("/big", headers={"accept-encoding": "gzip, deflate, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == BIG
@@ -79,3 +79,72 @@ class TestPanchangaAsyncJobs:
             assert body.get("data", {}).get("status") == "completed"
         finally:
             fastapi_app.dependency_overrides = {}
+
+
+class TestPanchangaPrecomputeWorker:
+    """Chunked bulk upserts and concurrent job execution."""
+
+    @pytest.mark.asyncio
+    async def test_yearly_precompute_writes_chunks_with_unordered_bulk_write(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from app.workers import panchanga_precompute_worker as worker
+
+        writes = []
+
+        class FakeCollection:
+            async def bulk_write(self, ops, ordered=True):
+                writes.append((len(ops), ordered))
+                return SimpleNamespace(upserted_count=len(ops), matched_count=0)
+
+        async def fake_many(dates, latitude, longitude, panchanga_type="lunar"):
+            return [{"meta": {"timezone": "Asia/Kolkata"}, "date": d.isoformat()} for d in dates]
+
+        monkeypatch.setattr(worker.settings, "PANCHANGA_PRECOMPUTE_CHUNK_DAYS", 100)
+        monkeypatch.setattr(worker.panchanga_executor, "get_daily_panchanga_many", fake_many)
+
+        result = await worker._process_yearly_precompute(
+            SimpleNamespace(panchanga_cache=FakeCollection()),
+            {"year": 2028, "latitude": 19.076, "longitude": 72.8777},
+        )
+
+        assert writes == [(100, False), (100, False), (100, False), (66, False)]
+        assert result["computed_days"] == 366
+        assert result["written_docs"] == 366
+        assert result["days_per_second"] > 0
+        assert result["docs_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_process_precompute_once_runs_claimed_jobs_concurrently(self, monkeypatch):
+        import asyncio
+
+        from bson import ObjectId
+
+        from app.workers import panchanga_precompute_worker as worker
+
+        jobs = [{"_id": ObjectId(), "payload": {"year": 2027}} for _ in range(3)]
+        running = {"now": 0, "peak": 0}
+        completed = []
+
+        async def fake_claim_batch(_db, *, kind, batch_size=5):
+            return jobs[:batch_size]
+
+        async def fake_process(_db, _payload):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return {"days_per_second": 1.0, "docs_per_second": 1.0}
+
+        async def fake_mark_completed(_db, job_id, *, result):
+            completed.append(job_id)
+
+        monkeypatch.setattr(worker.async_job_service, "claim_batch", fake_claim_batch)
+        monkeypatch.setattr(worker.async_job_service, "mark_completed", fake_mark_completed)
+        monkeypatch.setattr(worker, "_process_yearly_precompute", fake_process)
+
+        processed = await worker.process_precompute_once(object(), batch_size=3)
+
+        assert processed == 3
+        assert running["peak"] == 3
+        assert sorted(completed) == sorted(job["_id"] for job in jobs)
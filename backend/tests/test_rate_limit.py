@@ -0,0 +1,209 @@
+"""Unit tests for RateLimitMiddleware: GCRA, token leasing and in-memory fallback."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.rate_limit_config import get_lease_fraction
+from app.middleware.rate_limit import _GCRA_LUA, RateLimitMiddleware
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr("app.middleware.rate_limit.time.monotonic", clock)
+    monkeypatch.setattr("app.middleware.rate_limit.time.time", clock)
+    return clock
+
+
+async def test_memory_fallback_allows_burst_then_paces(clock):
+    limiter = RateLimitMiddleware()
+
+    results = [await limiter.check_rate_limit("k", limit=5, window=60) for _ in range(6)]
+    assert results == [True] * 5 + [False]
+
+    clock.now += 11.9
+    assert await limiter.check_rate_limit("k", limit=5, window=60) is False
+    clock.now += 0.1
+    assert await limiter.check_rate_limit("k", limit=5, window=60) is True
+
+
+async def test_memory_fallback_stores_one_value_per_key(clock):
+    limiter = RateLimitMiddleware()
+
+    for _ in range(50):
+        await limiter.check_rate_limit("k", limit=100, window=60)
+
+    assert limiter._memory_tats == {"k": pytest.approx(1_030.0)}
+
+
+async def test_memory_fallback_is_bounded(clock):
+    limiter = RateLimitMiddleware()
+    limiter._memory_max_keys = 3
+
+    for i in range(10):
+        await limiter.check_rate_limit(f"k{i}", limit=5, window=60)
+
+    assert list(limiter._memory_tats) == ["k7", "k8", "k9"]
+
+
+async def test_idle_keys_are_swept(clock):
+    limiter = RateLimitMiddleware()
+    await limiter.check_rate_limit("idle", limit=5, window=60)
+    clock.now += 31
+    await limiter.check_rate_limit("active", limit=5, window=60)
+
+    assert list(limiter._memory_tats) == ["active"]
+
+
+async def test_redis_gcra_is_one_evalsha_with_tat_args(clock):
+    limiter = RateLimitMiddleware(algorithm="gcra")
+    limiter.redis_client = AsyncMock()
+    limiter.redis_client.evalsha.return_value = 1
+    limiter._lua_sha = "sha"
+
+    assert await limiter.check_rate_limit("k", limit=60, window=60) is True
+
+    limiter.redis_client.evalsha.assert_awaited_once_with(
+        "sha", 1, "k:gcra", "1000000", "1000", "59000", "1"
+    )
+
+
+async def test_redis_error_falls_back_to_memory(clock):
+    limiter = RateLimitMiddleware()
+    limiter.redis_client = AsyncMock()
+    limiter.redis_client.eval.side_effect = ConnectionError("down")
+
+    assert await limiter.check_rate_limit("k", limit=1, window=60) is True
+    assert await limiter.check_rate_limit("k", limit=1, window=60) is False
+    assert limiter.redis_client.eval.await_args.args[0] == _GCRA_LUA
+
+
+async def test_algorithms_use_separate_redis_keys(clock):
+    keys = {}
+    for algorithm in ("gcra", "sliding_window"):
+        limiter = RateLimitMiddleware(algorithm=algorithm)
+        limiter.redis_client = AsyncMock()
+        limiter.redis_client.evalsha.return_value = 1
+        limiter._lua_sha = "sha"
+        await limiter.check_rate_limit("rate:v2:k", limit=60, window=60)
+        keys[algorithm] = limiter.redis_client.evalsha.await_args.args[2]
+
+    assert keys == {"gcra": "rate:v2:k:gcra", "sliding_window": "rate:v2:k"}
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        RateLimitMiddleware(algorithm="leaky")
+
+
+def _gcra_redis(granted):
+    """Redis mock whose GCRA script grants min(wanted, remaining) tokens."""
+    remaining = {"n": granted}
+
+    async def evalsha(sha, numkeys, key, now, interval, tolerance, wanted):
+        take = min(int(wanted), remaining["n"])
+        remaining["n"] -= take
+        return take
+
+    client = AsyncMock()
+    client.evalsha.side_effect = evalsha
+    return client
+
+
+async def test_leased_bucket_spends_tokens_locally(clock):
+    limiter = RateLimitMiddleware(algorithm="gcra")
+    limiter.redis_client = _gcra_redis(granted=100)
+    limiter._lua_sha = "sha"
+
+    for _ in range(5):
+        assert await limiter.check_rate_limit("k", limit=100, window=60, lease_fraction=0.1)
+
+    limiter.redis_client.evalsha.assert_awaited_once()
+    assert limiter.redis_client.evalsha.await_args.args[-1] == "10"
+    assert limiter._leases["k:gcra"].tokens == 5
+
+
+async def test_lease_is_refilled_in_the_background(clock):
+    limiter = RateLimitMiddleware(algorithm="gcra")
+    limiter.redis_client = _gcra_redis(granted=100)
+    limiter._lua_sha = "sha"
+
+    for _ in range(6):
+        await limiter.check_rate_limit("k", limit=100, window=60, lease_fraction=0.1)
+    await asyncio.gather(*limiter._refills.values())
+
+    assert limiter.redis_client.evalsha.await_count == 2
+    assert limiter._leases["k:gcra"].tokens == 14
+
+
+async def test_exhausted_bucket_rejects_leased_route(clock):
+    limiter = RateLimitMiddleware(algorithm="gcra")
+    limiter.redis_client = _gcra_redis(granted=3)
+    limiter._lua_sha = "sha"
+
+    results = [
+        await limiter.check_rate_limit("k", limit=100, window=60, lease_fraction=0.1)
+        for _ in range(4)
+    ]
+    await asyncio.gather(*limiter._refills.values())
+
+    assert results == [True, True, True, False]
+
+
+async def test_sliding_window_mode_ignores_leasing(clock):
+    limiter = RateLimitMiddleware(algorithm="sliding_window")
+    limiter.redis_client = AsyncMock()
+    limiter.redis_client.evalsha.return_value = 1
+    limiter._lua_sha = "sha"
+
+    for _ in range(3):
+        await limiter.check_rate_limit("k", limit=100, window=60, lease_fraction=0.1)
+
+    assert limiter.redis_client.evalsha.await_count == 3
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/api/v1/panchanga/today", 0.1),
+        ("POST", "/api/v1/panchanga/today", None),
+        ("GET", "/api/v1/auth/me", None),
+        ("GET", "/api/v1/payments/history", None),
+    ],
+)
+def test_lease_fraction_by_route_group(method, path, expected):
+    assert get_lease_fraction(method, path) == expected
+
+
+async def test_refill_landing_during_foreground_take_keeps_both_batches(clock):
+    limiter = RateLimitMiddleware(algorithm="gcra")
+    limiter.redis_client = _gcra_redis(granted=100)
+    limiter._lua_sha = "sha"
+    take = limiter.redis_client.evalsha.side_effect
+    granted = []
+
+    async def yielding_evalsha(*args):
+        # Yield so a queued background refill can complete mid-take.
+        await asyncio.sleep(0)
+        granted.append(await take(*args))
+        return granted[-1]
+
+    limiter.redis_client.evalsha.side_effect = yielding_evalsha
+
+    results = [
+        await limiter.check_rate_limit("k", limit=100, window=60, lease_fraction=0.1)
+        for _ in range(120)
+    ]
+    await asyncio.gather(*limiter._refills.values())
+
+    assert sum(granted) == 100
+    assert sum(results) == 100
@@ -0,0 +1,165 @@
+"""Unit tests for the verified-token and revocation caches."""
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import security as security_module
+from app.core.security import SecurityManager, get_current_user
+from app.core.token_cache import (
+    TOKEN_REVOKED_CHANNEL,
+    RevocationCache,
+    VerifiedTokenCache,
+    revoked_tokens,
+    verified_tokens,
+)
+from app.db.redis import blacklist_token
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    verified_tokens.clear()
+    revoked_tokens.clear()
+    yield
+    verified_tokens.clear()
+    revoked_tokens.clear()
+
+
+def _request(**state):
+    return SimpleNamespace(state=SimpleNamespace(**state))
+
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_token_is_verified_once(monkeypatch):
+    token = SecurityManager.create_access_token("user-1", "grihasta")
+    calls = []
+    original = SecurityManager.verify_token
+    monkeypatch.setattr(
+        SecurityManager, "verify_token", staticmethod(lambda t: calls.append(t) or original(t))
+    )
+
+    first = SecurityManager.verify_token_cached(token)
+    second = SecurityManager.verify_token_cached(token)
+
+    assert first["sub"] == second["sub"] == "user-1"
+    assert len(calls) == 1
+
+
+def test_invalid_token_is_not_cached():
+    with pytest.raises(HTTPException):
+        SecurityManager.verify_token_cached("not-a-jwt")
+    assert verified_tokens.get("not-a-jwt") is None
+
+
+def test_entry_ends_at_token_expiry():
+    cache = VerifiedTokenCache(max_size=10)
+    cache.put("live", {"sub": "a", "exp": time.time() + 60})
+    cache.put("dead", {"sub": "b", "exp": time.time() - 1})
+    cache.put("no-exp", {"sub": "c"})
+
+    assert cache.get("live")["sub"] == "a"
+    assert cache.get("dead") is None
+    assert cache.get("no-exp") is None
+
+
+def test_cache_is_bounded_lru():
+    cache = VerifiedTokenCache(max_size=2)
+    exp = time.time() + 60
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    cache.get("a")
+    cache.put("c", {"exp": exp})
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+async def test_negative_answer_is_reused_within_ttl():
+    redis = AsyncMock()
+    redis.exists.return_value = 0
+    cache = RevocationCache(ttl=60, max_size=10)
+
+    assert await cache.is_revoked(redis, "jti-1") is False
+    assert await cache.is_revoked(redis, "jti-1") is False
+
+    redis.exists.assert_awaited_once_with("blacklist:jti-1")
+
+
+async def test_zero_ttl_always_asks_redis():
+    redis = AsyncMock()
+    redis.exists.return_value = 0
+    cache = RevocationCache(ttl=0, max_size=10)
+
+    await cache.is_revoked(redis, "jti-1")
+    await cache.is_revoked(redis, "jti-1")
+
+    assert redis.exists.await_count == 2
+
+
+async def test_revocation_overrides_negative_answer():
+    redis = AsyncMock()
+    redis.exists.return_value = 0
+    cache = RevocationCache(ttl=60, max_size=10)
+    await cache.is_revoked(redis, "jti-1")
+
+    cache.mark_revoked("jti-1", 60)
+
+    assert await cache.is_revoked(redis, "jti-1") is True
+    redis.exists.assert_awaited_once()
+
+
+async def test_blacklist_token_revokes_locally_and_notifies_pods():
+    redis = AsyncMock()
+    redis.exists.return_value = 0
+    await revoked_tokens.is_revoked(redis, "jti-1")
+
+    await blacklist_token(redis, "jti-1", 3600)
+
+    redis.setex.assert_awaited_once_with("blacklist:jti-1", 3600, "1")
+    redis.publish.assert_awaited_once_with(TOKEN_REVOKED_CHANNEL, "jti-1")
+    assert await revoked_tokens.is_revoked(redis, "jti-1") is True
+
+
+async def test_get_current_user_reuses_middleware_claims(monkeypatch):
+    token = SecurityManager.create_access_token("user-1", "acharya")
+    claims = SecurityManager.verify_token(token)
+    monkeypatch.setattr(
+        security_module.SecurityManager,
+        "verify_token_cached",
+        staticmethod(lambda t: pytest.fail("token verified twice")),
+    )
+
+    user = await get_current_user(
+        _request(auth_token=token, token_claims=claims), _credentials(token), None
+    )
+
+    assert user["id"] == "user-1"
+    assert user["role"] == "acharya"
+
+
+async def test_get_current_user_rejects_revoked_token():
+    token = SecurityManager.create_access_token("user-1", "grihasta")
+    jti = SecurityManager.verify_token_cached(token)["jti"]
+    revoked_tokens.mark_revoked(jti, 60)
+
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(_request(), _credentials(token), AsyncMock())
+
+    assert exc.value.status_code == 401
+
+
+async def test_get_current_user_rejects_expired_cached_token():
+    token = SecurityManager.create_access_token(
+        "user-1", "grihasta", expires_delta=timedelta(seconds=-1)
+    )
+
+    with pytest.raises(HTTPException):
+        await get_current_user(_request(), _credentials(token), None)
@@ -77,3 +77,29 @@ class TestUserSearch:
         """Test search with query parameter"""
         response = await async_client.get("/api/v1/users/search?q=test")
         assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+class TestAcharyaSearchCacheInvalidation:
+    """Both profile endpoints retire cached Acharya search pages."""
+
+    @pytest.mark.parametrize("endpoint", ["update_profile", "update_acharya_profile"])
+    async def test_acharya_edit_invalidates_search_cache(self, endpoint):
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app.api.v1 import users
+        from app.models.database import UserRole
+        from app.schemas.requests import ProfileUpdateRequest
+
+        db = MagicMock()
+        db.acharya_profiles.update_one = AsyncMock(return_value=MagicMock(matched_count=1))
+        user = {"id": "a1", "role": UserRole.ACHARYA.value}
+
+        with patch.object(users.cache, "invalidate_tags", new_callable=AsyncMock) as invalidate, \
+             patch.object(users.cache, "bump_generation", new_callable=AsyncMock) as bump:
+            await getattr(users, endpoint)(
+                ProfileUpdateRequest(languages=["Sanskrit"]), current_user=user, db=db
+            )
+
+        invalidate.assert_awaited_once_with("acharya:a1")
+        bump.assert_awaited_once_with(users.ACHARYA_SEARCH_GENERATION)
@@ -12,6 +12,26 @@ from bson import ObjectId
 FAKE_USER_ID = str(ObjectId())
 
 
+async def _stall(_message):
+    await asyncio.sleep(3600)
+
+
+class _GaugeStub:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+def _sent(ws):
+    """Messages a managed socket's writer sent, decoded from send_text frames."""
+    return [json.loads(c.args[0]) for c in ws.send_text.call_args_list]
+
+
 # ---------------------------------------------------------------------------
 # ConnectionManager Unit Tests
 # ---------------------------------------------------------------------------
@@ -66,8 +86,9 @@ class TestConnectionManager:
 
         payload = {"type": "new_message", "data": {"content": "Hello"}}
         await mgr.send_personal_message(FAKE_USER_ID, payload)
+        await asyncio.sleep(0)  # let the connection's writer task run
 
-        fake_ws.send_json.assert_any_call(payload)
+        assert payload in _sent(fake_ws)
 
     @pytest.mark.asyncio
     async def test_send_personal_message_to_offline_user(self):
@@ -89,19 +110,20 @@ class TestConnectionManager:
         fake_ws = AsyncMock()
         await mgr.connect(FAKE_USER_ID, fake_ws)
 
-        assert mgr.is_user_online(FAKE_USER_ID) is True
+        assert await mgr.is_user_online(FAKE_USER_ID) is True
 
     @pytest.mark.asyncio
     async def test_is_user_online_false(self):
         from app.services.websocket_manager import ConnectionManager
         mgr = ConnectionManager()
 
-        assert mgr.is_user_online("offline_user") is False
+        assert await mgr.is_user_online("offline_user") is False
 
-    def test_get_online_users_returns_list(self):
+    @pytest.mark.asyncio
+    async def test_get_online_users_returns_list(self):
         from app.services.websocket_manager import ConnectionManager
         mgr = ConnectionManager()
-        result = mgr.get_online_users()
+        result = await mgr.get_online_users()
         assert isinstance(result, list)
 
     @pytest.mark.asyncio
@@ -142,9 +164,457 @@ class TestConnectionManager:
 
         payload = {"type": "group_message", "content": "Hello room"}
         await mgr.broadcast_to_room("group_room", payload)
+        await asyncio.sleep(0)
+
+        assert _sent(ws_a)[-1] == payload
+        assert _sent(ws_b)[-1] == payload
+
+
+class TestFrame:
+    """Messages are serialized once and routed without re-encoding."""
+
+    def test_pack_unpack_keeps_text_and_coalesce_key(self):
+        from app.services.websocket_manager import Frame
+        frame = Frame.encode({"type": "typing_indicator", "conversation_id": "c1", "is_typing": True})
+
+        header, copy = Frame.unpack(frame.pack(user_id="u1"))
+
+        assert header == {"user_id": "u1"}
+        assert copy.text == frame.text
+        assert copy.coalesce_key == ("typing_indicator", "c1", None)
+
+    def test_with_offline_id_splices_without_decoding(self):
+        from app.services.websocket_manager import Frame
+
+        assert json.loads(Frame(text='{"n":1}').with_offline_id("5-0").text) == {"n": 1, "offline_id": "5-0"}
+        assert json.loads(Frame(text="{}").with_offline_id("5-0").text) == {"offline_id": "5-0"}
+
+    def test_unpack_rejects_headerless_payload(self):
+        from app.services.websocket_manager import Frame
+        with pytest.raises(ValueError):
+            Frame.unpack('{"type": "new_message"}')
+
+
+class TestConnectionSender:
+    """Per-connection bounded send queue and slow-consumer eviction."""
+
+    @pytest.mark.asyncio
+    async def test_stalled_socket_does_not_block_producer(self):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        stalled = AsyncMock()
+        stalled.send_text.side_effect = _stall
+        healthy = AsyncMock()
+        await mgr.connect("slow", stalled)
+        await mgr.connect("fast", healthy)
+
+        await asyncio.wait_for(mgr.send_personal_message("slow", {"n": 1}), timeout=1)
+        await mgr.send_personal_message("fast", {"n": 2})
+        await asyncio.sleep(0)
+
+        assert {"n": 2} in _sent(healthy)
+        mgr.disconnect("slow")
+
+    @pytest.mark.asyncio
+    async def test_typing_events_coalesce_while_queued(self):
+        from app.services.websocket_manager import ConnectionSender
+        ws = AsyncMock()
+        sender = ConnectionSender("u1", ws, MagicMock())
+
+        for is_typing in (True, False, True):
+            sender.enqueue({"type": "typing_indicator", "conversation_id": "c1", "is_typing": is_typing})
+        sender.enqueue({"type": "new_message", "content": "hi"})
+        assert len(sender) == 2
+        await asyncio.sleep(0)
+
+        assert _sent(ws) == [
+            {"type": "typing_indicator", "conversation_id": "c1", "is_typing": True},
+            {"type": "new_message", "content": "hi"},
+        ]
+        sender.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_sheds_droppable_events_first(self):
+        from app.services.websocket_manager import ConnectionSender
+        sender = ConnectionSender("u1", AsyncMock(), MagicMock(), max_size=2)
+
+        sender.enqueue({"type": "new_message", "n": 1})
+        sender.enqueue({"type": "pong"})
+        assert sender.enqueue({"type": "new_message", "n": 2}) is True
+
+        assert [e[1].message for e in sender._queue] == [
+            {"type": "new_message", "n": 1},
+            {"type": "new_message", "n": 2},
+        ]
+        sender.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_evicts_with_pending_backlog(self):
+        from app.services.websocket_manager import ConnectionSender
+        on_evict = MagicMock()
+        sender = ConnectionSender("u1", AsyncMock(), on_evict, max_size=1, overflow_policy="disconnect")
+
+        sender.enqueue({"type": "new_message", "n": 1})
+        assert sender.enqueue({"type": "new_message", "n": 2}) is False
+
+        on_evict.assert_called_once()
+        user_id, reason, pending = on_evict.call_args.args
+        assert (user_id, reason) == ("u1", "queue_full")
+        assert [frame.message for frame in pending] == [
+            {"type": "new_message", "n": 1},
+            {"type": "new_message", "n": 2},
+        ]
+        assert sender.enqueue({"type": "new_message", "n": 3}) is False
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_evicts_instead_of_dropping_regular_messages(self):
+        from app.services.websocket_manager import ConnectionSender
+        on_evict = MagicMock()
+        sender = ConnectionSender("u1", AsyncMock(), on_evict, max_size=2)
+
+        sender.enqueue({"type": "new_message", "n": 1})
+        sender.enqueue({"type": "new_message", "n": 2})
+        assert sender.enqueue({"type": "new_message", "n": 3}) is False
+
+        user_id, reason, pending = on_evict.call_args.args
+        assert (user_id, reason) == ("u1", "queue_full")
+        assert [frame.message["n"] for frame in pending] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_keeps_queue_depth_gauge_balanced(self):
+        from app.services.websocket_manager import ConnectionSender
+        depth = _GaugeStub()
+        on_evict = MagicMock()
+        stalled = AsyncMock()
+        stalled.send_text.side_effect = _stall
+
+        with patch("app.services.websocket_manager._METRICS_ENABLED", True), \
+             patch("app.services.websocket_manager.WS_SEND_QUEUE_DEPTH", depth), \
+             patch("app.services.websocket_manager.WS_SLOW_CONSUMER_EVICTIONS", MagicMock()):
+            sender = ConnectionSender("u1", stalled, on_evict, slow_timeout=0.01)
+            sender.enqueue({"type": "new_message", "n": 1})
+            sender.enqueue({"type": "new_message", "n": 2})
+            await asyncio.sleep(0.05)
+
+        assert depth.value == 0
+        _user_id, reason, pending = on_evict.call_args.args
+        assert reason == "send_timeout"
+        assert [frame.message["n"] for frame in pending] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_evicts_connection(self):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        stalled = AsyncMock()
+        stalled.send_text.side_effect = _stall
+
+        with patch("app.services.websocket_manager.settings.WS_SLOW_CONSUMER_TIMEOUT", 0.01):
+            await mgr.connect("slow", stalled)
+        await asyncio.sleep(0.05)
+
+        assert "slow" not in mgr.active_connections
+        stalled.close.assert_awaited()
+
+
+class TestBroadcast:
+    """Broadcast: one PUBLISH cluster-wide, concurrent local fan-out per pod."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_publishes_once_with_exclude_list(self):
+        from app.services.websocket_manager import ConnectionManager, Frame
+        mgr = ConnectionManager()
+        mgr.redis_client = AsyncMock()
+        ws = AsyncMock()
+        mgr.active_connections["u1"] = ws
+
+        await mgr.broadcast({"type": "announcement"}, exclude=["u2", "u2"])
+
+        mgr.redis_client.publish.assert_awaited_once()
+        channel, raw = mgr.redis_client.publish.await_args.args
+        header, frame = Frame.unpack(raw)
+        assert channel == "broadcast"
+        assert header == {"exclude": ["u2"]}
+        assert json.loads(frame.text) == {"type": "announcement"}
+        ws.send_json.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_local_fan_out_is_concurrent_and_drops_stalled_sockets(self):
+        from app.services.websocket_manager import ConnectionManager, Frame
+        mgr = ConnectionManager()
+        stalled = AsyncMock()
+        stalled.send_json.side_effect = _stall
+        sockets = {f"u{i}": AsyncMock() for i in range(5)}
+        mgr.active_connections.update(sockets)
+        mgr.active_connections["stalled"] = stalled
+
+        with patch("app.services.websocket_manager.settings.WS_SLOW_CONSUMER_TIMEOUT", 0.05), \
+             patch("app.services.websocket_manager.settings.WS_BROADCAST_CHUNK_SIZE", 2):
+            await asyncio.wait_for(
+                mgr._handle_broadcast_message(
+                    "broadcast", {"exclude": ["u0"]}, Frame.encode({"type": "announcement"})
+                ),
+                timeout=1,
+            )
+
+        sockets["u0"].send_json.assert_not_called()
+        for user_id in ("u1", "u4"):
+            sockets[user_id].send_json.assert_called_once_with({"type": "announcement"})
+        assert "stalled" not in mgr.active_connections
+
+    @pytest.mark.asyncio
+    async def test_broadcast_without_redis_reaches_managed_sockets(self):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        ws_a, ws_b = AsyncMock(), AsyncMock()
+        await mgr.connect("a", ws_a)
+        await mgr.connect("b", ws_b)
+
+        await mgr.broadcast({"type": "announcement"}, exclude=["b"])
+        await asyncio.sleep(0)
+
+        assert _sent(ws_a)[-1] == {"type": "announcement"}
+        assert {"type": "announcement"} not in _sent(ws_b)
+
 
-        ws_a.send_json.assert_called_with(payload)
-        ws_b.send_json.assert_called_with(payload)
+class TestRoomFanOut:
+    """Room messages: one PUBLISH per room, local fan-out on each instance."""
+
+    @pytest.mark.asyncio
+    async def test_send_to_room_publishes_once_and_fans_out_locally(self):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        mgr.redis_client = AsyncMock()
+        mgr._transport.join_room = AsyncMock()
+
+        sockets = {}
+        for i in range(500):
+            user_id = f"member_{i}"
+            sockets[user_id] = AsyncMock()
+            mgr.active_connections[user_id] = sockets[user_id]
+            mgr.join_room("group_500", user_id)
+
+        await mgr.send_to_room("group_500", {"type": "group_message"}, exclude=["member_0"])
+
+        mgr.redis_client.publish.assert_awaited_once()
+        channel, raw = mgr.redis_client.publish.await_args.args
+        assert channel == "room:group_500"
+
+        await mgr._transport._process_pubsub_message(
+            {"type": "message", "channel": channel, "data": raw},
+            mgr._handle_user_message,
+            mgr._handle_room_message,
+        )
+        sockets["member_0"].send_json.assert_not_called()
+        for user_id in ("member_1", "member_499"):
+            sockets[user_id].send_json.assert_called_once_with({"type": "group_message"})
+
+    @pytest.mark.asyncio
+    async def test_room_subscription_follows_first_and_last_local_member(self):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        mgr.redis_client = AsyncMock()
+        mgr._transport.join_room = AsyncMock()
+        mgr._transport.leave_room = AsyncMock()
+
+        mgr.join_room("room_x", "a")
+        mgr.join_room("room_x", "b")
+        mgr.disconnect("a")
+        mgr.leave_room("room_x", "b")
+        await asyncio.sleep(0)
+
+        assert [c.kwargs["subscribe"] for c in mgr._transport.join_room.await_args_list] == [True, False]
+        assert [c.kwargs["unsubscribe"] for c in mgr._transport.leave_room.await_args_list] == [False, True]
+        assert "room_x" not in mgr.rooms
+
+    @pytest.mark.asyncio
+    async def test_emit_to_room_without_redis_delivers_locally(self):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        ws = AsyncMock()
+        mgr.active_connections["u1"] = ws
+        mgr.join_room("conv_1", "u1")
+
+        await mgr.emit_to_room("conv_1", "member_muted", {"user_id": "u2"})
+
+        sent = ws.send_json.call_args.args[0]
+        assert sent["type"] == "member_muted"
+        assert sent["user_id"] == "u2"
+
+
+class TestPodRouting:
+    """Pod mode: one channel per instance, user → pod presence map."""
+
+    def _pod_manager(self):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        mgr._transport.mode = "pod"
+        mgr._transport.pod_id = "pod-a"
+        mgr.redis_client = AsyncMock()
+        mgr.pubsub = AsyncMock()
+        return mgr
+
+    @pytest.mark.asyncio
+    async def test_connect_and_disconnect_issue_no_redis_commands(self):
+        mgr = self._pod_manager()
+
+        await mgr.connect("u1", AsyncMock())
+        await mgr.connect("u2", AsyncMock())
+        mgr.disconnect("u2")
+
+        mgr.pubsub.subscribe.assert_not_called()
+        mgr.pubsub.unsubscribe.assert_not_called()
+        mgr.redis_client.lrange.assert_not_called()
+        assert mgr.presence._joins == {"u1"}
+        assert mgr.presence._leaves == {"u2"}
+
+    @pytest.mark.asyncio
+    async def test_send_routes_to_owning_pod_channel(self):
+        from app.services.websocket_manager import Frame
+        mgr = self._pod_manager()
+        mgr.redis_client.hget.return_value = "pod-b"
+        mgr.redis_client.publish.return_value = 1
+
+        status = await mgr.send_personal_message("u9", {"type": "new_message"})
+
+        assert status == "delivered"
+        channel, raw = mgr.redis_client.publish.await_args.args
+        assert channel == "ws:pod:pod-b"
+        header, frame = Frame.unpack(raw)
+        assert header == {"user_id": "u9"}
+        assert json.loads(frame.text) == {"type": "new_message"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_queued_without_publish(self):
+        mgr = self._pod_manager()
+        mgr.redis_client.hget.return_value = None
+        mgr._transport.queue_offline_message = AsyncMock()
+
+        status = await mgr.send_personal_message("u9", {"type": "new_message"})
+
+        assert status == "queued"
+        mgr.redis_client.publish.assert_not_called()
+        mgr._transport.queue_offline_message.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pod_message_for_departed_user_is_queued(self):
+        from app.services.websocket_manager import Frame
+        mgr = self._pod_manager()
+        ws = AsyncMock()
+        mgr.active_connections["here"] = ws
+        mgr._transport.queue_offline_message = AsyncMock()
+
+        await mgr._handle_pod_message("ws:pod:pod-a", {"user_id": "here"}, Frame.encode({"n": 1}))
+        await mgr._handle_pod_message("ws:pod:pod-a", {"user_id": "gone"}, Frame.encode({"n": 2}))
+
+        ws.send_json.assert_called_once_with({"n": 1})
+        user_id, raw = mgr._transport.queue_offline_message.await_args.args
+        assert user_id == "gone"
+        assert json.loads(raw) == {"n": 2}
+
+
+class TestOfflineReplay:
+    """Offline stream: paged replay after a cursor, acked entries trimmed."""
+
+    def _manager_with_stream(self, entries):
+        from app.services.websocket_manager import ConnectionManager
+        mgr = ConnectionManager()
+        mgr.redis_client = AsyncMock()
+        transport = mgr._transport
+        transport.pop_legacy_offline_messages = AsyncMock(return_value=[])
+        transport.get_offline_cursor = AsyncMock(return_value=None)
+        transport.ack_offline = AsyncMock()
+
+        async def _read(_user_id, after_id, count):
+            newer = [e for e in entries if tuple(map(int, e[0].split("-"))) > tuple(map(int, after_id.split("-")))]
+            return newer[:count]
+
+        transport.read_offline_page = AsyncMock(side_effect=_read)
+        return mgr
+
+    @pytest.mark.asyncio
+    async def test_replays_in_pages_and_advances_cursor(self):
+        entries = [(f"{i}-0", json.dumps({"n": i})) for i in range(1, 6)]
+        mgr = self._manager_with_stream(entries)
+        ws = AsyncMock()
+        mgr.active_connections["u1"] = ws
+
+        with patch("app.services.websocket_manager.settings.WS_OFFLINE_REPLAY_PAGE_SIZE", 2):
+            await mgr.check_offline_queue("u1")
+
+        sent = [c.args[0] for c in ws.send_json.call_args_list]
+        assert [m["n"] for m in sent] == [1, 2, 3, 4, 5]
+        assert sent[0]["offline_id"] == "1-0"
+        assert mgr._transport.read_offline_page.await_count == 3
+        cursors = [c.args[1] for c in mgr._transport.ack_offline.await_args_list]
+        assert cursors == ["2-0", "4-0", "5-0"]
+        assert all(c.kwargs["trim"] is True for c in mgr._transport.ack_offline.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_expired_cursor_does_not_redeliver_flushed_entries(self):
+        entries = [(f"{i}-0", json.dumps({"n": i})) for i in range(1, 4)]
+        mgr = self._manager_with_stream(entries)
+
+        async def _ack(_user_id, entry_id, *, trim):
+            if trim:
+                acked = tuple(map(int, entry_id.split("-")))
+                entries[:] = [e for e in entries if tuple(map(int, e[0].split("-"))) > acked]
+
+        mgr._transport.ack_offline.side_effect = _ack
+        ws = AsyncMock()
+        mgr.active_connections["u1"] = ws
+        await mgr.check_offline_queue("u1")
+
+        # The cursor key has expired: replay restarts from 0-0.
+        entries.append(("4-0", json.dumps({"n": 4})))
+        ws.reset_mock()
+        await mgr.check_offline_queue("u1")
+
+        ws.send_json.assert_called_once_with({"n": 4, "offline_id": "4-0"})
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_client_acked_id(self):
+        entries = [(f"{i}-0", json.dumps({"n": i})) for i in range(1, 4)]
+        mgr = self._manager_with_stream(entries)
+        ws = AsyncMock()
+        mgr.active_connections["u1"] = ws
+
+        await mgr.check_offline_queue("u1", last_offline_id="2-0")
+
+        ws.send_json.assert_called_once_with({"n": 3, "offline_id": "3-0"})
+        mgr._transport.get_offline_cursor.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_client_ack_trims_stream(self):
+        from app.services.websocket_manager import process_websocket_message
+        from app.services import websocket_manager as wm
+
+        with patch.object(wm.manager._transport, "redis_client", AsyncMock()), \
+             patch.object(wm.manager._transport, "ack_offline", new_callable=AsyncMock) as ack:
+            await process_websocket_message("u1", {"type": "offline_ack", "last_id": "17-3"})
+            await process_websocket_message("u1", {"type": "offline_ack", "last_id": "bogus"})
+
+        ack.assert_awaited_once_with("u1", "17-3", trim=True)
+
+    @pytest.mark.asyncio
+    async def test_queue_offline_message_is_one_capped_pipeline(self):
+        from app.services.websocket_manager import RedisRealtimeTransport
+        transport = RedisRealtimeTransport()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        transport.redis_client = MagicMock()
+        transport.redis_client.pipeline.return_value = pipe
+
+        await transport.queue_offline_message("u1", '{"n": 1}')
+
+        key, fields = pipe.xadd.call_args.args
+        assert key == "offline_stream:u1"
+        assert fields == {"m": '{"n": 1}'}
+        assert pipe.xadd.call_args.kwargs["approximate"] is True
+        expired = [c.args[0] for c in pipe.expire.call_args_list]
+        assert expired == ["offline_stream:u1", "offline_cursor:u1"]
+        pipe.execute.assert_awaited_once()
 
 
 # ---------------------------------------------------------------------------